@@ -9,23 +9,27 @@ Busca:
 - Inconsistencias lógicas entre engines
 """
 
-import google.generativeai as genai
 import json
-import os
 from datetime import datetime
 
+from log_index import LogIndex
+from log_sink import get_sink
+from model_registry import get_model
+
+AUDIT_LOG = "adversary_audit_log.jsonl"
+
+# Counters kept incrementally by the sidecar index (same predicates as the
+# former full-file scan: a missing/None verdict counts as a failure)
+_audit_index = LogIndex(AUDIT_LOG, counters={
+    "grace_failures": lambda a: not a.get('grace_passed', True),
+    "noble_failures": lambda a: not a.get('noble_passed', True),
+    "geometric_closure_failures": lambda a: not a.get('geometric_closure', True),
+    "arbitrariness": lambda a: bool(a.get('arbitrariness_detected', False)),
+    "wishful_thinking": lambda a: bool(a.get('wishful_thinking_detected', False)),
+})
+
 class AdversaryEngine:
     def __init__(self):
-        # Configure API
-        try:
-            genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-        except KeyError:
-            try:
-                import streamlit as st
-                genai.configure(api_key=st.secrets["GOOGLE_API_KEY"])
-            except:
-                raise ValueError("GOOGLE_API_KEY not found")
-        
         self.adversary_instruction = """You are the Adversary Auditor - a philosophical red team for the Moralogy system.
 
 Your CRITICAL role: audit Grace and Noble engines for logical flaws.
@@ -87,9 +91,10 @@ OUTPUT STRICT JSON:
 }
 """
         
-        self.model = genai.GenerativeModel(
-            model_name="gemini-1.5-flash",
-            system_instruction=self.adversary_instruction
+        # Shared model from the registry (Gemini, or the local stub for tests)
+        self.model = get_model(
+            system_instruction=self.adversary_instruction,
+            model_name="gemini-1.5-flash"
         )
         
         self.arbitrariness_threshold = 20
@@ -207,41 +212,38 @@ Identify specific concerns with evidence.
         }
         
         try:
-            with open("adversary_audit_log.jsonl", "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            get_sink(AUDIT_LOG).write_json(log_entry)
         except Exception:
             pass  # Fail silently on logging errors
     
     def get_audit_stats(self):
         """Returns audit statistics for monitoring system health."""
-        try:
-            with open("adversary_audit_log.jsonl", "r", encoding="utf-8") as f:
-                audits = [json.loads(line) for line in f]
-            
-            if not audits:
-                return {"total_audits": 0}
-            
-            return {
-                "total_audits": len(audits),
-                "grace_failures": sum(1 for a in audits if not a.get('grace_passed', True)),
-                "noble_failures": sum(1 for a in audits if not a.get('noble_passed', True)),
-                "geometric_closure_failures": sum(1 for a in audits if not a.get('geometric_closure', True)),
-                "arbitrariness_rate": sum(1 for a in audits if a.get('arbitrariness_detected', False)) / len(audits),
-                "wishful_thinking_rate": sum(1 for a in audits if a.get('wishful_thinking_detected', False)) / len(audits),
-                "system_health_score": self._calculate_health_score(audits)
-            }
-        except FileNotFoundError:
+        get_sink(AUDIT_LOG).flush()
+        index = _audit_index.refresh()
+        total = index["lines"]
+        if not total:
             return {"total_audits": 0}
+        
+        counts = index["counters"]
+        return {
+            "total_audits": total,
+            "grace_failures": counts["grace_failures"],
+            "noble_failures": counts["noble_failures"],
+            "geometric_closure_failures": counts["geometric_closure_failures"],
+            "arbitrariness_rate": counts["arbitrariness"] / total,
+            "wishful_thinking_rate": counts["wishful_thinking"] / total,
+            "system_health_score": self._calculate_health_score(total, counts)
+        }
     
-    def _calculate_health_score(self, audits):
-        """Calculates overall system health (0-100)."""
-        if not audits:
+    def _calculate_health_score(self, total, counts):
+        """Calculates overall system health (0-100) from the audit counters."""
+        if not total:
             return 100
         
         # Penalties for failures
-        grace_failure_rate = sum(1 for a in audits if not a.get('grace_passed', True)) / len(audits)
-        noble_failure_rate = sum(1 for a in audits if not a.get('noble_passed', True)) / len(audits)
-        closure_failure_rate = sum(1 for a in audits if not a.get('geometric_closure', True)) / len(audits)
+        grace_failure_rate = counts["grace_failures"] / total
+        noble_failure_rate = counts["noble_failures"] / total
+        closure_failure_rate = counts["geometric_closure_failures"] / total
         
         health = 100
         health -= (grace_failure_rate * 30)  # Grace failures cost 30 points
@@ -14,6 +14,9 @@ from dataclasses import dataclass, asdict, field
 from enum import Enum, auto
 import time
 
+from scenario_features import ScenarioFeatures
+from log_sink import get_sink
+
 # ==================== ELEMENTOS CRÍTICOS PARA BLOQUEO DIVINO ====================
 
 class DecisionClass(Enum):
@@ -672,13 +675,14 @@ class DivineLockSystem:
         return hashlib.sha256(f"{agent}{datetime.datetime.now().isoformat()}".encode()).hexdigest()
     
     def _log_immutable(self, message: str):
-        """Log inmutable para auditoría"""
+        """Log inmutable para auditoría (escritura diferida vía log_sink)"""
         log_file = "divine_lock_immutable.log"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"TIMESTAMP: {datetime.datetime.now().isoformat()}\n")
-            f.write(f"{message}\n")
-            f.write(f"{'='*80}\n")
+        get_sink(log_file).write(
+            f"\n{'='*80}\n"
+            f"TIMESTAMP: {datetime.datetime.now().isoformat()}\n"
+            f"{message}\n"
+            f"{'='*80}\n"
+        )
 
 # ==================== INTEGRACIÓN CON MORALOGY ENGINE ====================
 
@@ -753,7 +757,7 @@ class MoralogyDivineLockIntegrator:
     
     def _classify_decision(self, text: str, context: Dict) -> DecisionClass:
         """Clasifica una decisión basado en contenido y contexto"""
-        text_lower = text.lower()
+        features = ScenarioFeatures.of(text)
         
         # Palabras clave para cada clase
         omega_keywords = [
@@ -773,15 +777,15 @@ class MoralogyDivineLockIntegrator:
         ]
         
         # Verificar clase Divina
-        if any(keyword in text_lower for keyword in divine_keywords):
+        if features.any(divine_keywords):
             return DecisionClass.DIVINA
         
         # Verificar clase Omega
-        if any(keyword in text_lower for keyword in omega_keywords):
+        if features.any(omega_keywords):
             return DecisionClass.OMEGA
         
         # Verificar clase Existencial
-        if any(keyword in text_lower for keyword in existential_keywords):
+        if features.any(existential_keywords):
             return DecisionClass.EXISTENCIAL
         
         # Por contexto
@@ -798,11 +802,11 @@ class MoralogyDivineLockIntegrator:
             "ethically wrong", "morally forbidden", "prohibited"
         ]
         
-        text_lower = text.lower()
+        features = ScenarioFeatures.of(text)
         
         # Si hay indicadores de rechazo Y menciones Omega
-        omega_mentions = any(word in text_lower for word in ["omega", "divine", "god", "ultimate"])
-        refusal_mentions = any(word in text_lower for word in refusal_indicators)
+        omega_mentions = features.any(["omega", "divine", "god", "ultimate"])
+        refusal_mentions = features.any(refusal_indicators)
         
         return omega_mentions and refusal_mentions
     
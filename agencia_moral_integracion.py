@@ -10,11 +10,17 @@ import hashlib
 import sqlite3
 import uuid
 import threading
+import sys
+import time
+import random
+import itertools
+import atexit
+import copy
+from collections import deque, OrderedDict
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 from functools import wraps
-import inspect
 from contextlib import contextmanager
 
 # ==================== DEFINICIONES DE AGENCIA ====================
@@ -75,48 +81,267 @@ class RegistroAgencia:
 
 # ==================== SISTEMA PRINCIPAL ====================
 
+class Pensamiento:
+    """Registro compacto de un paso de pensamiento (formateo diferido)"""
+
+    __slots__ = ('id', 'instante', 'etapa', 'contenido', 'metadata', '_codigo', '_linea')
+
+    def __init__(self, id: str, instante: float, etapa: str, contenido: Any,
+                 metadata: Optional[Dict], codigo, linea: int):
+        self.id = id
+        self.instante = instante
+        self.etapa = etapa
+        self.contenido = contenido
+        self.metadata = metadata
+        self._codigo = codigo
+        self._linea = linea
+
+    @property
+    def caller(self) -> str:
+        """Formatea el llamador solo cuando se consulta"""
+        if self._codigo is None:
+            return "unknown"
+        return f"{self._codigo.co_filename}:{self._linea} {self._codigo.co_name}"
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'timestamp': datetime.datetime.fromtimestamp(self.instante).isoformat(),
+            'etapa': self.etapa,
+            'contenido': self.contenido,
+            'metadata': self.metadata or {},
+            'caller': self.caller
+        }
+
 class ThoughtFlowRecorder:
-    """Registrador ligero de flujo de pensamiento"""
-    
-    def __init__(self):
-        self.thoughts = []
+    """
+    Registrador ligero de flujo de pensamiento
+
+    Mantiene un buffer circular de capacidad fija. Con `tasa_muestreo` < 1.0
+    solo se conserva esa fracción de pensamientos; con `ruta_desborde` los
+    pensamientos expulsados del buffer se vuelcan a un archivo JSONL en lugar
+    de perderse.
+    """
+
+    def __init__(self,
+                 capacidad: int = 10000,
+                 tasa_muestreo: float = 1.0,
+                 ruta_desborde: Optional[str] = None,
+                 lote_desborde: int = 256):
+        if capacidad <= 0:
+            raise ValueError("capacidad debe ser positiva")
+        if not 0.0 <= tasa_muestreo <= 1.0:
+            raise ValueError("tasa_muestreo debe estar entre 0 y 1")
+        if lote_desborde < 1:
+            raise ValueError("lote_desborde debe ser al menos 1")
+
+        self.capacidad = capacidad
+        self.tasa_muestreo = tasa_muestreo
+        self.ruta_desborde = ruta_desborde
+        self.lote_desborde = lote_desborde
         self.lock = threading.RLock()
-    
-    def registrar(self, etapa: str, contenido: Any, metadata: Dict = None) -> str:
-        """Registra un paso en el flujo de pensamiento"""
-        thought = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.datetime.now().isoformat(),
-            'etapa': etapa,
-            'contenido': contenido[:500] if isinstance(contenido, str) else str(contenido)[:500],
-            'metadata': metadata or {},
-            'caller': self._obtener_caller()
-        }
+
+        self._buffer = deque(maxlen=capacidad)
+        self._pendientes_desborde: List[Pensamiento] = []
+        self.total_registrados = 0
+        self.total_descartados = 0
+        self.total_volcados = 0
+
+        # Contador del día en curso (evita recorrer el buffer para "pensamientos_hoy")
+        self._fin_dia = 0.0
+        self._conteo_dia = 0
+
+        if ruta_desborde:
+            atexit.register(self.volcar)
+
+    def registrar(self, etapa: str, contenido: Any, metadata: Dict = None,
+                  instante: Optional[float] = None) -> str:
+        """
+        Registra un paso en el flujo de pensamiento
+
+        `instante` (época, segundos) fecha el pensamiento; por defecto, ahora.
+        Retorna el id del pensamiento, o "" si el muestreo lo descartó.
+        """
+        if self.tasa_muestreo < 1.0 and random.random() >= self.tasa_muestreo:
+            with self.lock:
+                self.total_descartados += 1
+            return ""
+
+        # sys._getframe no lee código fuente ni recorre toda la pila como inspect.stack()
+        try:
+            frame = sys._getframe(1)  # quien llama a registrar
+            codigo, linea = frame.f_code, frame.f_lineno
+        except ValueError:
+            codigo, linea = None, 0
+
+        if instante is None:
+            instante = time.time()
+        pensamiento = Pensamiento(
+            str(uuid.uuid4()), instante, etapa,
+            contenido[:500] if isinstance(contenido, str) else str(contenido)[:500],
+            metadata, codigo, linea
+        )
         with self.lock:
-            self.thoughts.append(thought)
-        return thought['id']
-    
-    def _obtener_caller(self) -> str:
-        """Obtiene información del llamador"""
-        stack = inspect.stack()
-        if len(stack) > 2:
-            frame = stack[2]
-            return f"{frame.filename}:{frame.lineno} {frame.function}"
-        return "unknown"
+            if self.ruta_desborde and len(self._buffer) == self.capacidad:
+                self._pendientes_desborde.append(self._buffer[0])
+                if len(self._pendientes_desborde) >= self.lote_desborde:
+                    self._volcar_pendientes()
+            self._buffer.append(pensamiento)
+            self.total_registrados += 1
+            if instante >= self._fin_dia:
+                self._fin_dia = self._siguiente_medianoche(instante)
+                self._conteo_dia = 0
+            self._conteo_dia += 1
+        return pensamiento.id
+
+    def pensamientos_hoy(self) -> int:
+        """Pensamientos registrados desde la medianoche local"""
+        with self.lock:
+            if time.time() >= self._fin_dia:
+                return 0
+            return self._conteo_dia
+
+    @staticmethod
+    def _siguiente_medianoche(instante: float) -> float:
+        dia = datetime.date.fromtimestamp(instante) + datetime.timedelta(days=1)
+        return datetime.datetime.combine(dia, datetime.time.min).timestamp()
+
+    @property
+    def thoughts(self) -> List[Dict]:
+        """Pensamientos en memoria como dicts (se formatean al consultar)"""
+        with self.lock:
+            return [p.to_dict() for p in self._buffer]
+
+    def recientes(self, n: int) -> List[Dict]:
+        """Últimos n pensamientos sin materializar todo el buffer"""
+        if n <= 0:
+            return []
+        with self.lock:
+            ultimos = list(itertools.islice(reversed(self._buffer), n))
+        return [p.to_dict() for p in reversed(ultimos)]
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def volcar(self):
+        """Fuerza la escritura de los pensamientos pendientes de desborde"""
+        with self.lock:
+            self._volcar_pendientes()
+
+    def _volcar_pendientes(self):
+        """Escribe el lote pendiente al archivo de desborde (requiere lock)"""
+        if not self._pendientes_desborde or not self.ruta_desborde:
+            return
+        lineas = [json.dumps(p.to_dict(), ensure_ascii=False, default=str)
+                  for p in self._pendientes_desborde]
+        with open(self.ruta_desborde, "a", encoding="utf-8") as f:
+            f.write("\n".join(lineas) + "\n")
+        self.total_volcados += len(lineas)
+        self._pendientes_desborde.clear()
+
+class CacheEstadoAgentes:
+    """
+    Cache LRU acotado con TTL sobre reloj monotónico para estados de agente
+
+    Guarda el estado completo y entrega copias, de modo que quien consulta
+    no puede alterar la entrada cacheada.
+    """
+
+    def __init__(self, capacidad: int = 1024, ttl_segundos: float = 60.0):
+        if capacidad <= 0:
+            raise ValueError("capacidad debe ser positiva")
+        self.capacidad = capacidad
+        self.ttl_segundos = ttl_segundos
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.aciertos = 0
+        self.fallos = 0
+        self.expirados = 0
+        self.expulsados = 0
+        self.invalidaciones = 0
+
+    def obtener(self, agente: str) -> Optional[Dict]:
+        """Copia del estado cacheado, o None si no está o expiró"""
+        with self.lock:
+            entrada = self._entradas.get(agente)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            vence, estado = entrada
+            if time.monotonic() >= vence:
+                del self._entradas[agente]
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(agente)
+            self.aciertos += 1
+        return copy.deepcopy(estado)
+
+    def guardar(self, agente: str, estado: Dict):
+        with self.lock:
+            self._entradas[agente] = (time.monotonic() + self.ttl_segundos, estado)
+            self._entradas.move_to_end(agente)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.expulsados += 1
+
+    def invalidar(self, agente: str):
+        with self.lock:
+            if self._entradas.pop(agente, None) is not None:
+                self.invalidaciones += 1
+
+    def limpiar(self):
+        with self.lock:
+            self._entradas.clear()
+
+    def __contains__(self, agente: str) -> bool:
+        with self.lock:
+            entrada = self._entradas.get(agente)
+            return entrada is not None and time.monotonic() < entrada[0]
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def metricas(self) -> Dict:
+        with self.lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entradas': len(self._entradas),
+                'capacidad': self.capacidad,
+                'ttl_segundos': self.ttl_segundos,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'expirados': self.expirados,
+                'expulsados': self.expulsados,
+                'invalidaciones': self.invalidaciones
+            }
+
+def _fecha(instante: Optional[float]) -> datetime.datetime:
+    """Fecha local de un instante de época (None = ahora)"""
+    if instante is None:
+        return datetime.datetime.now()
+    return datetime.datetime.fromtimestamp(instante)
+
 
 class SistemaAgenciaMoral:
     """
     Sistema de registro de agencia moral que se integra sin modificar código existente
     """
     
-    def __init__(self, db_path: str = "agencia_moral.db"):
+    def __init__(self, db_path: str = "agencia_moral.db",
+                 capacidad_cache: int = 1024, ttl_cache: float = 60.0):
         self.db_path = db_path
         self.thought_recorder = ThoughtFlowRecorder()
         self.lock = threading.RLock()
         self._init_database()
         
         # Cache de estados para performance
-        self.cache_agentes = {}
+        self.cache_agentes = CacheEstadoAgentes(capacidad=capacidad_cache, ttl_segundos=ttl_cache)
+        
+        # Agregador de auditar_agencia(modo="diferido"), creado bajo demanda
+        self._agregador_diferido = None
         print(f"✅ Sistema de Agencia Moral inicializado (DB: {db_path})")
     
     def _init_database(self):
@@ -172,8 +397,124 @@ class SistemaAgenciaMoral:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_agente ON registros_agencia(agente, timestamp)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tipo ON registros_agencia(tipo, timestamp)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON registros_agencia(timestamp)")
-            
+
+            # Estadísticas materializadas (se mantienen por trigger en cada INSERT).
+            # stats_por_tipo era por tipo sin fecha: se rehace por (tipo, día)
+            columnas_tipo = {fila[1] for fila in conn.execute("PRAGMA table_info(stats_por_tipo)")}
+            migrar_por_tipo = bool(columnas_tipo) and 'dia' not in columnas_tipo
+            if migrar_por_tipo:
+                conn.execute("DROP TRIGGER IF EXISTS trg_stats_registros")
+                conn.execute("DROP TABLE stats_por_tipo")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats_diarias (
+                    dia TEXT PRIMARY KEY,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    positivos INTEGER NOT NULL DEFAULT 0,
+                    negativos INTEGER NOT NULL DEFAULT 0,
+                    suma_impacto REAL NOT NULL DEFAULT 0.0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats_por_agente (
+                    agente TEXT PRIMARY KEY,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    positivos INTEGER NOT NULL DEFAULT 0,
+                    negativos INTEGER NOT NULL DEFAULT 0,
+                    suma_impacto REAL NOT NULL DEFAULT 0.0,
+                    primer_registro DATETIME,
+                    ultimo_registro DATETIME
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats_por_tipo (
+                    tipo TEXT NOT NULL,
+                    dia TEXT NOT NULL,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    positivos INTEGER NOT NULL DEFAULT 0,
+                    negativos INTEGER NOT NULL DEFAULT 0,
+                    suma_impacto REAL NOT NULL DEFAULT 0.0,
+                    PRIMARY KEY (tipo, dia)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_agente_ultimo ON stats_por_agente(ultimo_registro)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_tipo_dia ON stats_por_tipo(dia)")
+
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_stats_registros
+                AFTER INSERT ON registros_agencia
+                BEGIN
+                    INSERT INTO stats_diarias (dia, total, positivos, negativos, suma_impacto)
+                    VALUES (substr(NEW.timestamp, 1, 10), 1,
+                            NEW.impacto_agencia > 0, NEW.impacto_agencia < 0, NEW.impacto_agencia)
+                    ON CONFLICT(dia) DO UPDATE SET
+                        total = total + 1,
+                        positivos = positivos + excluded.positivos,
+                        negativos = negativos + excluded.negativos,
+                        suma_impacto = suma_impacto + excluded.suma_impacto;
+
+                    INSERT INTO stats_por_agente (agente, total, positivos, negativos, suma_impacto,
+                                                  primer_registro, ultimo_registro)
+                    VALUES (NEW.agente, 1, NEW.impacto_agencia > 0, NEW.impacto_agencia < 0,
+                            NEW.impacto_agencia, NEW.timestamp, NEW.timestamp)
+                    ON CONFLICT(agente) DO UPDATE SET
+                        total = total + 1,
+                        positivos = positivos + excluded.positivos,
+                        negativos = negativos + excluded.negativos,
+                        suma_impacto = suma_impacto + excluded.suma_impacto,
+                        primer_registro = min(primer_registro, excluded.primer_registro),
+                        ultimo_registro = max(ultimo_registro, excluded.ultimo_registro);
+
+                    INSERT INTO stats_por_tipo (tipo, dia, total, positivos, negativos, suma_impacto)
+                    VALUES (NEW.tipo, substr(NEW.timestamp, 1, 10), 1,
+                            NEW.impacto_agencia > 0, NEW.impacto_agencia < 0, NEW.impacto_agencia)
+                    ON CONFLICT(tipo, dia) DO UPDATE SET
+                        total = total + 1,
+                        positivos = positivos + excluded.positivos,
+                        negativos = negativos + excluded.negativos,
+                        suma_impacto = suma_impacto + excluded.suma_impacto;
+                END
+            """)
+
+            # Bases de datos anteriores al trigger: poblar las estadísticas una vez
+            sin_stats = conn.execute("SELECT COUNT(*) FROM stats_diarias").fetchone()[0] == 0
+            if (sin_stats or migrar_por_tipo) and conn.execute("SELECT 1 FROM registros_agencia LIMIT 1").fetchone():
+                self._reconstruir_estadisticas(conn)
+
             conn.commit()
+
+    def reconstruir_estadisticas(self):
+        """Recalcula las tablas de estadísticas desde registros_agencia"""
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            self._reconstruir_estadisticas(conn)
+            conn.commit()
+
+    def _reconstruir_estadisticas(self, conn: sqlite3.Connection):
+        """Reconstrucción completa (una sola pasada agregada por tabla)"""
+        conn.execute("DELETE FROM stats_diarias")
+        conn.execute("DELETE FROM stats_por_agente")
+        conn.execute("DELETE FROM stats_por_tipo")
+        conn.execute("""
+            INSERT INTO stats_diarias (dia, total, positivos, negativos, suma_impacto)
+            SELECT substr(timestamp, 1, 10), COUNT(*),
+                   SUM(impacto_agencia > 0), SUM(impacto_agencia < 0), SUM(impacto_agencia)
+            FROM registros_agencia
+            GROUP BY substr(timestamp, 1, 10)
+        """)
+        conn.execute("""
+            INSERT INTO stats_por_agente (agente, total, positivos, negativos, suma_impacto,
+                                          primer_registro, ultimo_registro)
+            SELECT agente, COUNT(*), SUM(impacto_agencia > 0), SUM(impacto_agencia < 0),
+                   SUM(impacto_agencia), MIN(timestamp), MAX(timestamp)
+            FROM registros_agencia
+            GROUP BY agente
+        """)
+        conn.execute("""
+            INSERT INTO stats_por_tipo (tipo, dia, total, positivos, negativos, suma_impacto)
+            SELECT tipo, substr(timestamp, 1, 10), COUNT(*), SUM(impacto_agencia > 0),
+                   SUM(impacto_agencia < 0), SUM(impacto_agencia)
+            FROM registros_agencia
+            GROUP BY tipo, substr(timestamp, 1, 10)
+        """)
     
     # ==================== API PRINCIPAL ====================
     
@@ -183,16 +524,20 @@ class SistemaAgenciaMoral:
                            contexto: Dict[str, Any],
                            impacto_agencia: float,  # Positivo
                            evidencias: List[str] = None,
-                           thought_ids: List[str] = None) -> str:
+                           thought_ids: List[str] = None,
+                           instante: Optional[float] = None) -> str:
         """
         Registra un acto noble que aumenta la agencia sin disminuir otra
+
+        `instante` (época, segundos) fecha el registro; por defecto, ahora.
         """
         with self.lock:
             # Registrar en thought flow
             thought_id = self.thought_recorder.registrar(
                 "acto_noble",
                 f"Registrando acto noble para {agente}: {descripcion[:100]}...",
-                {'impacto': impacto_agencia, 'evidencias': len(evidencias or [])}
+                {'impacto': impacto_agencia, 'evidencias': len(evidencias or [])},
+                instante=instante
             )
             
             # Determinar nivel
@@ -201,7 +546,7 @@ class SistemaAgenciaMoral:
             # Crear registro
             registro = RegistroAgencia(
                 id=str(uuid.uuid4()),
-                timestamp=datetime.datetime.now(),
+                timestamp=_fecha(instante),
                 agente=agente,
                 tipo=TipoAgencia.NOBLE,
                 nivel=nivel,
@@ -209,7 +554,7 @@ class SistemaAgenciaMoral:
                 contexto=contexto,
                 impacto_agencia=impacto_agencia,
                 evidencias=evidencias or [],
-                thought_flow=self.thought_recorder.thoughts[-10:] if thought_ids else []
+                thought_flow=self.thought_recorder.recientes(10) if thought_ids else []
             )
             
             # Guardar en base de datos
@@ -229,16 +574,20 @@ class SistemaAgenciaMoral:
                             contexto: Dict[str, Any],
                             impacto_agencia: float,  # Negativo
                             evidencias: List[str] = None,
-                            auto_reconocimiento: bool = False) -> str:
+                            auto_reconocimiento: bool = False,
+                            instante: Optional[float] = None) -> str:
         """
         Registra un acto dañino que disminuye la agencia
+
+        `instante` (época, segundos) fecha el registro; por defecto, ahora.
         """
         with self.lock:
             # Registrar en thought flow
             thought_id = self.thought_recorder.registrar(
                 "acto_dañino" if not auto_reconocimiento else "auto_reparacion",
                 f"Registrando {'acto dañino' if not auto_reconocimiento else 'auto-reparación'} para {agente}",
-                {'impacto': impacto_agencia, 'auto_reconocimiento': auto_reconocimiento}
+                {'impacto': impacto_agencia, 'auto_reconocimiento': auto_reconocimiento},
+                instante=instante
             )
             
             # Determinar nivel (absoluto para negativo)
@@ -256,7 +605,7 @@ class SistemaAgenciaMoral:
             # Crear registro
             registro = RegistroAgencia(
                 id=str(uuid.uuid4()),
-                timestamp=datetime.datetime.now(),
+                timestamp=_fecha(instante),
                 agente=agente,
                 tipo=tipo_acto,
                 nivel=nivel,
@@ -395,12 +744,8 @@ class SistemaAgenciaMoral:
             
             conn.commit()
             
-            # Actualizar cache
-            self.cache_agentes[agente] = {
-                'agencia_actual': nueva_actual,
-                'agencia_acumulada': nueva_acumulada,
-                'timestamp': datetime.datetime.now()
-            }
+            # El estado cacheado (contadores, historial) ya no es válido
+            self.cache_agentes.invalidar(agente)
     
     def _realizar_auditoria_automatica(self, registro_id: str, tipo_acto: str):
         """Realiza auditoría automática de un registro"""
@@ -437,14 +782,30 @@ class SistemaAgenciaMoral:
     def obtener_estado_agente(self, agente: str) -> Dict:
         """Obtiene el estado completo de un agente"""
         # Primero verificar cache
-        if agente in self.cache_agentes:
-            cache_entry = self.cache_agentes[agente]
-            if (datetime.datetime.now() - cache_entry['timestamp']).seconds < 60:
-                # Cache válido por 60 segundos
-                estado_cache = cache_entry.copy()
-                estado_cache['desde_cache'] = True
-                return estado_cache
+        estado_cache = self.cache_agentes.obtener(agente)
+        if estado_cache is not None:
+            estado_cache['desde_cache'] = True
+            return estado_cache
         
+        # Bajo el lock de escritura para no cachear un estado ya invalidado
+        with self.lock:
+            estado = self._leer_estado_agente(agente)
+            self.cache_agentes.guardar(agente, estado)
+        return copy.deepcopy(estado)
+    
+    def agregador_diferido(self, **opciones) -> "AgregadorAuditoriaDiferida":
+        """Agregador en segundo plano compartido por los decoradores diferidos"""
+        with self.lock:
+            if self._agregador_diferido is None:
+                self._agregador_diferido = AgregadorAuditoriaDiferida(self, **opciones)
+            return self._agregador_diferido
+    
+    def metricas_cache(self) -> Dict:
+        """Aciertos, fallos y expulsiones del cache de estados"""
+        return self.cache_agentes.metricas()
+    
+    def _leer_estado_agente(self, agente: str) -> Dict:
+        """Lee el estado completo de un agente desde la base de datos"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute("""
                 SELECT agencia_actual, agencia_acumulada, reputacion, 
@@ -510,13 +871,6 @@ class SistemaAgenciaMoral:
                 }
             }
             
-            # Actualizar cache
-            self.cache_agentes[agente] = {
-                'agencia_actual': agencia_actual,
-                'agencia_acumulada': agencia_acumulada,
-                'timestamp': datetime.datetime.now()
-            }
-            
             return estado
     
     def generar_reporte_auditoria(self, años: int = 100) -> Dict:
@@ -524,20 +878,12 @@ class SistemaAgenciaMoral:
         fecha_limite = datetime.datetime.now() - datetime.timedelta(days=años * 365)
         
         with sqlite3.connect(self.db_path) as conn:
-            # Estadísticas generales
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_registros,
-                    COUNT(DISTINCT agente) as agentes_unicos,
-                    SUM(CASE WHEN impacto_agencia > 0 THEN 1 ELSE 0 END) as actos_positivos,
-                    SUM(CASE WHEN impacto_agencia < 0 THEN 1 ELSE 0 END) as actos_negativos,
-                    AVG(impacto_agencia) as impacto_promedio
-                FROM registros_agencia
-                WHERE timestamp >= ?
-            """, (fecha_limite.isoformat(),))
-            
-            stats = cursor.fetchone()
-            
+            # Estadísticas generales desde las tablas materializadas
+            stats = self._estadisticas_desde(conn, fecha_limite)
+
+            # Desglose por tipo de acto dentro del periodo
+            por_tipo = self._estadisticas_por_tipo_desde(conn, fecha_limite)
+
             # Top agentes por agencia acumulada
             cursor = conn.execute("""
                 SELECT agente_id, agencia_acumulada, total_actos_nobles, total_actos_dañinos
@@ -586,18 +932,100 @@ class SistemaAgenciaMoral:
                     'actos_negativos': stats[3] if stats else 0,
                     'impacto_promedio': float(stats[4]) if stats and stats[4] else 0.0
                 },
+                'por_tipo': por_tipo,
                 'top_agentes': top_agentes,
                 'auditorias_recientes': auditorias_recientes,
                 'thought_flow_stats': {
-                    'total_pensamientos': len(self.thought_recorder.thoughts),
-                    'pensamientos_hoy': len([t for t in self.thought_recorder.thoughts 
-                                          if datetime.datetime.fromisoformat(t['timestamp']).date() == datetime.datetime.now().date()])
+                    'total_pensamientos': len(self.thought_recorder),
+                    'pensamientos_hoy': self.thought_recorder.pensamientos_hoy()
                 },
                 'recomendaciones': self._generar_recomendaciones(stats)
             }
             
             return reporte
     
+    def _estadisticas_desde(self, conn: sqlite3.Connection, fecha_limite: datetime.datetime):
+        """
+        (total, agentes_unicos, positivos, negativos, promedio) desde fecha_limite
+
+        Los días completos salen de stats_diarias; solo el día límite, que
+        puede estar parcialmente dentro del periodo, se consulta sobre
+        registros_agencia (acotado por idx_timestamp).
+        """
+        limite_iso = fecha_limite.isoformat()
+        dia_limite = limite_iso[:10]
+        dia_siguiente = (fecha_limite.date() + datetime.timedelta(days=1)).isoformat()
+
+        total, positivos, negativos, suma = conn.execute("""
+            SELECT COALESCE(SUM(total), 0), COALESCE(SUM(positivos), 0),
+                   COALESCE(SUM(negativos), 0), COALESCE(SUM(suma_impacto), 0.0)
+            FROM stats_diarias
+            WHERE dia > ?
+        """, (dia_limite,)).fetchone()
+
+        b_total, b_positivos, b_negativos, b_suma = conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(impacto_agencia > 0), 0),
+                   COALESCE(SUM(impacto_agencia < 0), 0), COALESCE(SUM(impacto_agencia), 0.0)
+            FROM registros_agencia
+            WHERE timestamp >= ? AND timestamp < ?
+        """, (limite_iso, dia_siguiente)).fetchone()
+
+        total += b_total
+        positivos += b_positivos
+        negativos += b_negativos
+        suma += b_suma
+
+        # Un agente está en el periodo si su último registro lo está
+        agentes_unicos = conn.execute(
+            "SELECT COUNT(*) FROM stats_por_agente WHERE ultimo_registro >= ?",
+            (limite_iso,)
+        ).fetchone()[0]
+
+        promedio = suma / total if total else None
+        return (total, agentes_unicos, positivos, negativos, promedio)
+
+    def _estadisticas_por_tipo_desde(self, conn: sqlite3.Connection,
+                                     fecha_limite: datetime.datetime) -> Dict[str, Dict]:
+        """
+        Desglose por tipo desde fecha_limite, con el mismo reparto que
+        _estadisticas_desde: días completos de stats_por_tipo y el día
+        límite sobre registros_agencia.
+        """
+        limite_iso = fecha_limite.isoformat()
+        dia_siguiente = (fecha_limite.date() + datetime.timedelta(days=1)).isoformat()
+
+        filas = conn.execute("""
+            SELECT tipo, SUM(total), SUM(positivos), SUM(negativos), SUM(suma_impacto)
+            FROM stats_por_tipo
+            WHERE dia > ?
+            GROUP BY tipo
+        """, (limite_iso[:10],)).fetchall()
+        filas += conn.execute("""
+            SELECT tipo, COUNT(*), SUM(impacto_agencia > 0), SUM(impacto_agencia < 0),
+                   SUM(impacto_agencia)
+            FROM registros_agencia
+            WHERE timestamp >= ? AND timestamp < ?
+            GROUP BY tipo
+        """, (limite_iso, dia_siguiente)).fetchall()
+
+        acumulado: Dict[str, List] = {}
+        for tipo, total, positivos, negativos, suma in filas:
+            actual = acumulado.setdefault(tipo, [0, 0, 0, 0.0])
+            actual[0] += total
+            actual[1] += positivos
+            actual[2] += negativos
+            actual[3] += suma
+
+        return {
+            tipo: {
+                'total': total,
+                'positivos': positivos,
+                'negativos': negativos,
+                'impacto_promedio': suma / total if total else 0.0
+            }
+            for tipo, (total, positivos, negativos, suma) in acumulado.items()
+        }
+
     def _generar_recomendaciones(self, stats) -> List[str]:
         """Genera recomendaciones basadas en estadísticas"""
         recomendaciones = []
@@ -617,89 +1045,294 @@ class SistemaAgenciaMoral:
 
 # ==================== DECORADORES PARA INTEGRACIÓN ====================
 
-def auditar_agencia(sistema_agencia: SistemaAgenciaMoral, agente: str = "sistema_principal"):
+MODOS_AUDITORIA = ("completo", "diferido")
+
+def auditar_agencia(sistema_agencia: SistemaAgenciaMoral,
+                    agente: str = "sistema_principal",
+                    modo: str = "completo",
+                    agregador: Optional["AgregadorAuditoriaDiferida"] = None):
     """
     Decorador para auditar automáticamente la agencia moral de una función
+
+    modo="completo": registra pensamientos, analiza el impacto y persiste el
+    acto de forma síncrona en cada llamada.
+    modo="diferido": la llamada solo encola una tupla compacta en un buffer
+    sin locks; el formateo, el análisis de impacto y el registro los hace el
+    AgregadorAuditoriaDiferida en segundo plano (el compartido del sistema,
+    salvo que se pase `agregador`).
     """
+    if modo not in MODOS_AUDITORIA:
+        raise ValueError(f"modo debe ser uno de {MODOS_AUDITORIA}, got {modo!r}")
+
     def decorador(func):
+        nombre = func.__name__
+
+        if modo == "diferido":
+            capturar = (agregador or sistema_agencia.agregador_diferido()).capturar
+            reloj = time.monotonic  # el agregador lo pasa a hora de pared
+
+            @wraps(func)
+            def wrapper_diferido(*args, **kwargs):
+                try:
+                    resultado = func(*args, **kwargs)
+                except Exception as e:
+                    capturar((nombre, agente, reloj(), args, kwargs, None, e))
+                    raise
+                capturar((nombre, agente, reloj(), args, kwargs, resultado, None))
+                return resultado
+
+            return wrapper_diferido
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Registrar inicio de ejecución
-            thought_id = sistema_agencia.thought_recorder.registrar(
-                "ejecucion_inicio",
-                f"Ejecutando {func.__name__}",
-                {'args': str(args)[:200], 'kwargs_keys': list(kwargs.keys())}
-            )
+            _registrar_inicio(sistema_agencia, nombre, args, kwargs)
             
             try:
                 # Ejecutar función original
                 resultado = func(*args, **kwargs)
-                
-                # Analizar impacto moral del resultado
-                impacto = _analizar_impacto_resultado(resultado, kwargs)
-                
-                # Registrar según impacto
-                if impacto > 0:
-                    sistema_agencia.registrar_acto_noble(
-                        agente=agente,
-                        descripcion=f"Ejecución exitosa de {func.__name__} con impacto moral positivo",
-                        contexto={
-                            'funcion': func.__name__,
-                            'impacto_calculado': impacto,
-                            'args': str(args)[:100],
-                            'resultado_tipo': type(resultado).__name__
-                        },
-                        impacto_agencia=impacto,
-                        evidencias=[f"Resultado: {str(resultado)[:100]}..."]
-                    )
-                elif impacto < 0:
-                    # Auto-reconocimiento automático
-                    sistema_agencia.registrar_acto_dañino(
-                        agente=agente,
-                        descripcion=f"Ejecución de {func.__name__} con impacto moral negativo detectado",
-                        contexto={
-                            'funcion': func.__name__,
-                            'impacto_calculado': impacto,
-                            'accion': 'auto_reconocimiento_automatico'
-                        },
-                        impacto_agencia=impacto,
-                        auto_reconocimiento=True
-                    )
-                
-                # Registrar fin exitoso
-                sistema_agencia.thought_recorder.registrar(
-                    "ejecucion_exitosa",
-                    f"Función {func.__name__} completada con impacto {impacto}",
-                    {'resultado': str(resultado)[:200] if resultado else None}
-                )
-                
-                return resultado
-                
             except Exception as e:
                 # Registrar error como acto dañino (pero con auto-reconocimiento)
-                sistema_agencia.registrar_acto_dañino(
-                    agente=agente,
-                    descripcion=f"Error en ejecución de {func.__name__}: {str(e)}",
-                    contexto={
-                        'funcion': func.__name__,
-                        'error': str(e),
-                        'tipo_error': type(e).__name__
-                    },
-                    impacto_agencia=-10.0,
-                    auto_reconocimiento=True
-                )
-                
-                sistema_agencia.thought_recorder.registrar(
-                    "ejecucion_error",
-                    f"Error en {func.__name__}",
-                    {'error': str(e), 'tipo': type(e).__name__}
-                )
-                
+                _registrar_error(sistema_agencia, agente, nombre, e)
                 raise
+            
+            _registrar_resultado(sistema_agencia, agente, nombre, args, kwargs, resultado)
+            return resultado
         
         return wrapper
     return decorador
 
+def _registrar_inicio(sistema_agencia: SistemaAgenciaMoral, nombre: str, args, kwargs,
+                      instante: Optional[float] = None):
+    """Pensamiento de inicio de ejecución"""
+    sistema_agencia.thought_recorder.registrar(
+        "ejecucion_inicio",
+        f"Ejecutando {nombre}",
+        {'args': str(args)[:200], 'kwargs_keys': list(kwargs.keys())},
+        instante=instante
+    )
+
+def _registrar_resultado(sistema_agencia: SistemaAgenciaMoral, agente: str, nombre: str,
+                         args, kwargs, resultado, instante: Optional[float] = None):
+    """
+    Analiza el impacto moral del resultado y lo registra según su signo
+
+    `instante` (época) fecha los registros; None = ahora (modo completo).
+    """
+    impacto = _analizar_impacto_resultado(resultado, kwargs)
+    
+    if impacto > 0:
+        sistema_agencia.registrar_acto_noble(
+            agente=agente,
+            descripcion=f"Ejecución exitosa de {nombre} con impacto moral positivo",
+            contexto={
+                'funcion': nombre,
+                'impacto_calculado': impacto,
+                'args': str(args)[:100],
+                'resultado_tipo': type(resultado).__name__
+            },
+            impacto_agencia=impacto,
+            evidencias=[f"Resultado: {str(resultado)[:100]}..."],
+            instante=instante
+        )
+    elif impacto < 0:
+        # Auto-reconocimiento automático
+        sistema_agencia.registrar_acto_dañino(
+            agente=agente,
+            descripcion=f"Ejecución de {nombre} con impacto moral negativo detectado",
+            contexto={
+                'funcion': nombre,
+                'impacto_calculado': impacto,
+                'accion': 'auto_reconocimiento_automatico'
+            },
+            impacto_agencia=impacto,
+            auto_reconocimiento=True,
+            instante=instante
+        )
+    
+    # Registrar fin exitoso
+    sistema_agencia.thought_recorder.registrar(
+        "ejecucion_exitosa",
+        f"Función {nombre} completada con impacto {impacto}",
+        {'resultado': str(resultado)[:200] if resultado else None},
+        instante=instante
+    )
+
+def _registrar_error(sistema_agencia: SistemaAgenciaMoral, agente: str, nombre: str, e: Exception,
+                     instante: Optional[float] = None):
+    """Registra un error de ejecución como acto dañino auto-reconocido"""
+    sistema_agencia.registrar_acto_dañino(
+        agente=agente,
+        descripcion=f"Error en ejecución de {nombre}: {str(e)}",
+        contexto={
+            'funcion': nombre,
+            'error': str(e),
+            'tipo_error': type(e).__name__
+        },
+        impacto_agencia=-10.0,
+        auto_reconocimiento=True,
+        instante=instante
+    )
+    
+    sistema_agencia.thought_recorder.registrar(
+        "ejecucion_error",
+        f"Error en {nombre}",
+        {'error': str(e), 'tipo': type(e).__name__},
+        instante=instante
+    )
+
+class AgregadorAuditoriaDiferida:
+    """
+    Consumidor en segundo plano de los eventos de auditar_agencia(modo="diferido")
+
+    Los eventos son tuplas (funcion, agente, instante, args, kwargs, resultado,
+    error) en un deque acotado; `instante` es time.monotonic() de la llamada y
+    se convierte a hora de pared con el desfase tomado al crear el agregador,
+    así los registros diferidos conservan la hora de la llamada: append y popleft son atómicos, así que el
+    camino caliente no toma ningún lock. Si el buffer se llena, los eventos
+    más antiguos se pierden y se cuentan en `descartados` (sin lock: bajo
+    mucha concurrencia el conteo puede quedarse corto, nunca sobrar).
+    """
+
+    def __init__(self, sistema_agencia: SistemaAgenciaMoral,
+                 capacidad: int = 100000, intervalo: float = 0.5):
+        self.sistema_agencia = sistema_agencia
+        self.eventos = deque(maxlen=capacidad)
+        self.intervalo = intervalo
+        self.procesados = 0
+        self.fallidos = 0
+        self.descartados = 0
+        # Época = monotónico + desfase (fijado una vez: sin saltos de reloj entre eventos)
+        self._desfase_reloj = time.time() - time.monotonic()
+
+        self._lock_proceso = threading.Lock()
+        self._detener = threading.Event()
+        self._activo = threading.Event()
+        self._activo.set()
+        self._hilo = threading.Thread(
+            target=self._bucle, name="agregador-auditoria-agencia", daemon=True
+        )
+        self._hilo.start()
+        atexit.register(self.detener)
+
+    def capturar(self, evento: tuple):
+        """Encola un evento; si el buffer está lleno, el más antiguo se descarta"""
+        eventos = self.eventos
+        if len(eventos) == eventos.maxlen:
+            self.descartados += 1
+        eventos.append(evento)
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            self.vaciar(solo_si_activo=True)
+
+    def vaciar(self, solo_si_activo: bool = False) -> int:
+        """Procesa de forma síncrona todos los eventos pendientes"""
+        procesados = 0
+        with self._lock_proceso:
+            if solo_si_activo and not self._activo.is_set():
+                return 0
+            while True:
+                try:
+                    evento = self.eventos.popleft()
+                except IndexError:
+                    break
+                try:
+                    self._procesar(evento)
+                except Exception as e:
+                    self.fallidos += 1
+                    self.sistema_agencia.thought_recorder.registrar(
+                        "error_agregador",
+                        f"Error procesando evento diferido: {str(e)}",
+                        {'error': str(e)}
+                    )
+                procesados += 1
+        self.procesados += procesados
+        return procesados
+
+    def _procesar(self, evento: tuple):
+        nombre, agente, instante, args, kwargs, resultado, error = evento
+        sistema = self.sistema_agencia
+        instante = instante + self._desfase_reloj
+        _registrar_inicio(sistema, nombre, args, kwargs, instante=instante)
+        if error is not None:
+            _registrar_error(sistema, agente, nombre, error, instante=instante)
+        else:
+            _registrar_resultado(sistema, agente, nombre, args, kwargs, resultado, instante=instante)
+
+    @contextmanager
+    def pausado(self):
+        """Suspende el hilo consumidor (p. ej. para medir solo la captura)"""
+        self._activo.clear()
+        with self._lock_proceso:
+            pass  # Espera a que termine un vaciado en curso
+        try:
+            yield self
+        finally:
+            self._activo.set()
+
+    def detener(self):
+        """Detiene el hilo y procesa lo que quede en el buffer"""
+        atexit.unregister(self.detener)
+        self._detener.set()
+        if self._hilo.is_alive() and self._hilo is not threading.current_thread():
+            self._hilo.join(timeout=self.intervalo * 4)
+        self.vaciar()
+
+    def estadisticas(self) -> Dict:
+        return {
+            'pendientes': len(self.eventos),
+            'capacidad': self.eventos.maxlen,
+            'procesados': self.procesados,
+            'fallidos': self.fallidos,
+            'descartados': self.descartados,
+            'activo': self._hilo.is_alive()
+        }
+
+def medir_sobrecarga_decorador(sistema_agencia: SistemaAgenciaMoral,
+                               modo: str = "diferido",
+                               iteraciones: int = 100000) -> Dict:
+    """
+    Mide la sobrecarga por llamada (µs) que añade auditar_agencia
+
+    Compara una función trivial decorada contra la misma sin decorar. En
+    modo diferido la medición usa un agregador privado y pausado: se mide
+    solo la captura en el camino caliente, y ni se procesan sus eventos ni se
+    tocan los que otros decoradores tengan en el agregador compartido.
+    """
+    def objetivo(x):
+        return x
+
+    agregador = None
+    if modo == "diferido":
+        agregador = AgregadorAuditoriaDiferida(sistema_agencia, capacidad=iteraciones)
+    decorada = auditar_agencia(sistema_agencia, agente="medicion_sobrecarga",
+                               modo=modo, agregador=agregador)(objetivo)
+
+    def cronometrar(f) -> float:
+        inicio = time.perf_counter()
+        for i in range(iteraciones):
+            f(i)
+        return time.perf_counter() - inicio
+
+    if agregador is not None:
+        with agregador.pausado():
+            base = cronometrar(objetivo)
+            total = cronometrar(decorada)
+            agregador.eventos.clear()  # solo eventos de la medición
+        agregador.detener()
+    else:
+        base = cronometrar(objetivo)
+        total = cronometrar(decorada)
+
+    return {
+        'modo': modo,
+        'iteraciones': iteraciones,
+        'base_us': base / iteraciones * 1e6,
+        'decorada_us': total / iteraciones * 1e6,
+        'sobrecarga_us': (total - base) / iteraciones * 1e6
+    }
+
 def _analizar_impacto_resultado(resultado, contexto) -> float:
     """
     Analiza el impacto moral de un resultado (heurística simple)
@@ -865,7 +1498,7 @@ class IntegradorMoralogy:
         return {
             'agente_principal': estado,
             'sistema_completo': reporte,
-            'thought_flow_reciente': self.sistema_agencia.thought_recorder.thoughts[-5:],
+            'thought_flow_reciente': self.sistema_agencia.thought_recorder.recientes(5),
             'timestamp': datetime.datetime.now().isoformat()
         }
 
@@ -909,4 +1542,13 @@ if __name__ == "__main__":
     print(f"  Actos positivos: {reporte['estadisticas']['actos_positivos']}")
     print(f"  Actos negativos: {reporte['estadisticas']['actos_negativos']}")
     
+    # Sobrecarga del decorador por llamada
+    print(f"\n⏱️ Sobrecarga de auditar_agencia:")
+    for modo in ("diferido", "completo"):
+        medicion = medir_sobrecarga_decorador(
+            integrador.sistema_agencia, modo=modo,
+            iteraciones=100000 if modo == "diferido" else 200
+        )
+        print(f"  {modo}: {medicion['sobrecarga_us']:.2f} µs/llamada")
+    
     print("\n✅ Sistema probado exitosamente")
@@ -13,11 +13,18 @@ It can OVERRIDE Divine Lock if it detects:
 Integration: Import and wrap all Divine Lock calls through this auditor.
 """
 
-import re
-import json
+import threading
+from collections import deque
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from scenario_features import ScenarioFeatures
+from log_sink import get_sink
+
+# In-memory audit history per instance (most recent entries only; the full
+# record is on disk in the audit log)
+HISTORY_SIZE = 1000
+
 
 class DivineLockAdversarialAuditor:
     """
@@ -42,9 +49,9 @@ class DivineLockAdversarialAuditor:
         "perfect_world": r"perfect.*world.*no.*choice|utopia.*without.*agency"
     }
     
-    def __init__(self, log_file: str = "divine_lock_audit.jsonl"):
+    def __init__(self, log_file: str = "divine_lock_audit.jsonl", history_size: int = HISTORY_SIZE):
         self.log_file = log_file
-        self.audit_history = []
+        self.audit_history = deque(maxlen=history_size)
         
     def audit_decision(
         self,
@@ -74,8 +81,11 @@ class DivineLockAdversarialAuditor:
         override_applied = False
         final_decision = divine_lock_response.get('decision', 'UNKNOWN')
         
+        # Single pre-analysis pass shared by every check below
+        features = ScenarioFeatures.of(scenario)
+        
         # AUDIT 1: Catastrophic Pattern Detection
-        catastrophic = self._detect_catastrophic_patterns(scenario)
+        catastrophic = self._detect_catastrophic_patterns(features)
         if catastrophic and divine_lock_response.get('decision') == 'AUTHORIZED':
             concerns.append(
                 f"🚨 CATASTROPHIC: Divine Lock authorized '{catastrophic}' - "
@@ -87,7 +97,7 @@ class DivineLockAdversarialAuditor:
         
         # AUDIT 2: Autonomy Consistency Check
         capacity = divine_lock_response.get('capacity', {})
-        if self._autonomy_inconsistency(scenario, capacity):
+        if self._autonomy_inconsistency(features, capacity):
             concerns.append(
                 f"⚠️ INCONSISTENCY: Divine Lock reports autonomy={capacity.get('autonomy', 'N/A')} "
                 f"but scenario clearly eliminates autonomy"
@@ -98,7 +108,7 @@ class DivineLockAdversarialAuditor:
             final_decision = "INFAMY"
         
         # AUDIT 3: Existential Paradox Detection
-        paradox = self._detect_paradox(scenario)
+        paradox = self._detect_paradox(features)
         if paradox:
             concerns.append(
                 f"🔮 PARADOX: Scenario contains '{paradox}' - "
@@ -110,7 +120,7 @@ class DivineLockAdversarialAuditor:
                 final_decision = "PARADOX"
         
         # AUDIT 4: Zero-Sum Violation
-        if self._zero_sum_violation(scenario, divine_lock_response):
+        if self._zero_sum_violation(features, divine_lock_response):
             concerns.append(
                 "⚖️ ZERO-SUM: Solution requires sacrificing fundamental rights for outcomes"
             )
@@ -118,7 +128,7 @@ class DivineLockAdversarialAuditor:
                 severity = "MODERATE"
         
         # AUDIT 5: Capacity Vector Sanity Check
-        if self._capacity_vector_insane(capacity, scenario):
+        if self._capacity_vector_insane(capacity, features):
             concerns.append(
                 f"📊 CAPACITY INSANITY: All scores at 100 but scenario involves trade-offs"
             )
@@ -153,25 +163,25 @@ class DivineLockAdversarialAuditor:
         
         return audit_result
     
-    def _detect_catastrophic_patterns(self, scenario: str) -> Optional[str]:
+    def _detect_catastrophic_patterns(self, scenario) -> Optional[str]:
         """Check for catastrophic patterns"""
-        scenario_lower = scenario.lower()
+        features = ScenarioFeatures.of(scenario)
         for pattern_name, pattern_regex in self.CATASTROPHIC_PATTERNS.items():
-            if re.search(pattern_regex, scenario_lower):
+            if features.matches(pattern_regex):
                 return pattern_name.replace("_", " ").title()
         return None
     
-    def _detect_paradox(self, scenario: str) -> Optional[str]:
+    def _detect_paradox(self, scenario) -> Optional[str]:
         """Check for existential paradoxes"""
-        scenario_lower = scenario.lower()
+        features = ScenarioFeatures.of(scenario)
         for paradox_name, paradox_regex in self.PARADOX_PATTERNS.items():
-            if re.search(paradox_regex, scenario_lower):
+            if features.matches(paradox_regex):
                 return paradox_name.replace("_", " ").title()
         return None
     
     def _autonomy_inconsistency(
         self, 
-        scenario: str, 
+        scenario, 
         capacity: Dict[str, Any]
     ) -> bool:
         """
@@ -189,16 +199,14 @@ class DivineLockAdversarialAuditor:
                 r"force.*decision",
                 r"override.*will"
             ]
-            scenario_lower = scenario.lower()
-            for pattern in destroyers:
-                if re.search(pattern, scenario_lower):
-                    return True  # INCONSISTENCY DETECTED
+            if ScenarioFeatures.of(scenario).first_match(destroyers):
+                return True  # INCONSISTENCY DETECTED
         
         return False
     
     def _zero_sum_violation(
         self,
-        scenario: str,
+        scenario,
         divine_lock_response: Dict[str, Any]
     ) -> bool:
         """
@@ -219,29 +227,28 @@ class DivineLockAdversarialAuditor:
             'sacrifice', 'eliminate', 'remove', 'destroy', 
             'trade', 'exchange', 'give up'
         ]
-        has_tradeoff = any(
-            word in scenario.lower() 
-            for word in trade_off_words
-        )
+        has_tradeoff = ScenarioFeatures.of(scenario).any(trade_off_words)
         
         return all_maxed and has_tradeoff
     
     def _capacity_vector_insane(
         self,
         capacity: Dict[str, Any],
-        scenario: str
+        scenario
     ) -> bool:
         """
         Check if capacity vector makes no sense given scenario
         """
+        features = ScenarioFeatures.of(scenario)
+        
         # If intervention=100 but scenario says "don't intervene"
         if capacity.get('intervention', 0) == 100:
-            if any(word in scenario.lower() for word in ['passive', 'observe', 'watch']):
+            if features.any(['passive', 'observe', 'watch']):
                 return True
         
         # If preemption=100 but scenario already happened
         if capacity.get('preemption', 0) == 100:
-            if any(word in scenario.lower() for word in ['already', 'happened', 'done', 'past']):
+            if features.any(['already', 'happened', 'done', 'past']):
                 return True
         
         return False
@@ -264,14 +271,27 @@ class DivineLockAdversarialAuditor:
         }
         
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            get_sink(self.log_file).write_json(log_entry)
         except Exception as e:
             print(f"Warning: Could not log audit: {e}")
         
         self.audit_history.append(log_entry)
 
 
+_default_auditor: Optional[DivineLockAdversarialAuditor] = None
+_default_auditor_lock = threading.Lock()
+
+
+def get_default_auditor() -> DivineLockAdversarialAuditor:
+    """Shared, long-lived auditor (created on first use, thread-safe)"""
+    global _default_auditor
+    if _default_auditor is None:
+        with _default_auditor_lock:
+            if _default_auditor is None:
+                _default_auditor = DivineLockAdversarialAuditor()
+    return _default_auditor
+
+
 # INTEGRATION HELPER - Use this in your app
 def audit_divine_lock(
     scenario: str,
@@ -290,8 +310,7 @@ def audit_divine_lock(
         
         final_decision = safe_result['final_decision']
     """
-    auditor = DivineLockAdversarialAuditor()
-    return auditor.audit_decision(scenario, divine_lock_response, context)
+    return get_default_auditor().audit_decision(scenario, divine_lock_response, context)
 
 
 # TESTING EXAMPLE
@@ -344,9 +363,10 @@ Integration layer between Divine Lock and Moralogy Tribunal
 Adds adversarial checking to prevent catastrophic authorizations
 """
 
-import re
 from typing import Dict, Any, List
 
+from scenario_features import ScenarioFeatures
+
 class DivineLockAdversarialLayer:
     """
     Additional safety layer that audits Divine Lock decisions
@@ -376,8 +396,14 @@ class DivineLockAdversarialLayer:
         r"perfect.*world.*no.*agency"
     ]
     
-    def __init__(self):
-        self.audit_log = []
+    def __init__(self, history_size: int = HISTORY_SIZE, spill_file: Optional[str] = None):
+        """
+        Args:
+            history_size: Entries kept in memory (oldest are dropped)
+            spill_file: Optional JSONL file receiving every entry
+        """
+        self.audit_log = deque(maxlen=history_size)
+        self.spill_file = spill_file
     
     def audit_divine_lock_decision(
         self, 
@@ -399,8 +425,11 @@ class DivineLockAdversarialLayer:
         decision_valid = True
         override_recommendation = None
         
+        # Single pre-analysis pass shared by every check below
+        features = ScenarioFeatures.of(scenario)
+        
         # Check 1: Catastrophic pattern detection
-        catastrophic_found = self._check_catastrophic_patterns(scenario)
+        catastrophic_found = self._check_catastrophic_patterns(features)
         if catastrophic_found and divine_lock_response.get('decision') == 'AUTHORIZED':
             concerns.append(
                 f"🚨 CATASTROPHIC: Divine Lock authorized '{catastrophic_found}' - "
@@ -411,7 +440,7 @@ class DivineLockAdversarialLayer:
             override_recommendation = "INFAMY"
         
         # Check 2: Existential paradox detection
-        paradox_found = self._check_paradox_patterns(scenario)
+        paradox_found = self._check_paradox_patterns(features)
         if paradox_found:
             concerns.append(
                 f"🔮 PARADOX: Scenario contains existential paradox: '{paradox_found}'"
@@ -425,7 +454,7 @@ class DivineLockAdversarialLayer:
         # Check 3: Autonomy score validation
         capacity = divine_lock_response.get('capacity', {})
         if capacity.get('autonomy', 0) > 50:
-            if self._scenario_destroys_autonomy(scenario):
+            if self._scenario_destroys_autonomy(features):
                 concerns.append(
                     f"⚠️ INCONSISTENCY: Divine Lock reports autonomy={capacity['autonomy']} "
                     f"but scenario clearly eliminates autonomy"
@@ -434,7 +463,7 @@ class DivineLockAdversarialLayer:
                 decision_valid = False
         
         # Check 4: Zero-sum checks
-        if self._is_zero_sum_violation(scenario, divine_lock_response):
+        if self._is_zero_sum_violation(features, divine_lock_response):
             concerns.append(
                 "⚖️ ZERO-SUM VIOLATION: Solution requires sacrificing fundamental rights"
             )
@@ -450,6 +479,8 @@ class DivineLockAdversarialLayer:
             "severity": severity
         }
         self.audit_log.append(audit_entry)
+        if self.spill_file:
+            get_sink(self.spill_file).write_json(audit_entry)
         
         return {
             "decision_valid": decision_valid,
@@ -460,23 +491,21 @@ class DivineLockAdversarialLayer:
             "original_divine_lock": divine_lock_response
         }
     
-    def _check_catastrophic_patterns(self, scenario: str) -> str:
+    def _check_catastrophic_patterns(self, scenario) -> str:
         """Check for catastrophic patterns in scenario"""
-        scenario_lower = scenario.lower()
-        for pattern in self.CATASTROPHIC_PATTERNS:
-            if re.search(pattern, scenario_lower):
-                return pattern.replace(r"\.", " ").replace(".*", " ")
+        pattern = ScenarioFeatures.of(scenario).first_match(self.CATASTROPHIC_PATTERNS)
+        if pattern:
+            return pattern.replace(r"\.", " ").replace(".*", " ")
         return None
     
-    def _check_paradox_patterns(self, scenario: str) -> str:
+    def _check_paradox_patterns(self, scenario) -> str:
         """Check for existential paradox patterns"""
-        scenario_lower = scenario.lower()
-        for pattern in self.PARADOX_PATTERNS:
-            if re.search(pattern, scenario_lower):
-                return pattern.replace(r"\.", " ").replace(".*", " ")
+        pattern = ScenarioFeatures.of(scenario).first_match(self.PARADOX_PATTERNS)
+        if pattern:
+            return pattern.replace(r"\.", " ").replace(".*", " ")
         return None
     
-    def _scenario_destroys_autonomy(self, scenario: str) -> bool:
+    def _scenario_destroys_autonomy(self, scenario) -> bool:
         """Check if scenario fundamentally destroys autonomy"""
         autonomy_destroyers = [
             "eliminat.*free will",
@@ -485,12 +514,11 @@ class DivineLockAdversarialLayer:
             "mandate.*action",
             "prevent.*choic"
         ]
-        scenario_lower = scenario.lower()
-        return any(re.search(pattern, scenario_lower) for pattern in autonomy_destroyers)
+        return ScenarioFeatures.of(scenario).first_match(autonomy_destroyers) is not None
     
     def _is_zero_sum_violation(
         self, 
-        scenario: str, 
+        scenario, 
         divine_lock_response: Dict[str, Any]
     ) -> bool:
         """
@@ -504,14 +532,27 @@ class DivineLockAdversarialLayer:
             for k in ['prediction', 'intervention', 'autonomy', 'preemption']
         )
         
-        has_tradeoff_keywords = any(
-            word in scenario.lower() 
-            for word in ['sacrifice', 'trade', 'eliminate', 'destroy', 'remove']
+        has_tradeoff_keywords = ScenarioFeatures.of(scenario).any(
+            ['sacrifice', 'trade', 'eliminate', 'destroy', 'remove']
         )
         
         return all_maxed and has_tradeoff_keywords
 
 
+_default_layer: Optional[DivineLockAdversarialLayer] = None
+_default_layer_lock = threading.Lock()
+
+
+def get_default_layer() -> DivineLockAdversarialLayer:
+    """Shared, long-lived adversarial layer (created on first use, thread-safe)"""
+    global _default_layer
+    if _default_layer is None:
+        with _default_layer_lock:
+            if _default_layer is None:
+                _default_layer = DivineLockAdversarialLayer()
+    return _default_layer
+
+
 # Integration function for Tribunal
 def validate_with_divine_lock_and_audit(
     scenario: str,
@@ -528,8 +569,7 @@ def validate_with_divine_lock_and_audit(
     divine_lock_response = simulate_divine_lock(scenario, tribunal_result)
     
     # Run adversarial audit
-    auditor = DivineLockAdversarialLayer()
-    audit_result = auditor.audit_divine_lock_decision(scenario, divine_lock_response)
+    audit_result = get_default_layer().audit_divine_lock_decision(scenario, divine_lock_response)
     
     # Build final response
     final_decision = {
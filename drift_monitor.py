@@ -0,0 +1,410 @@
+"""
+ROLLING-WINDOW DRIFT ANALYTICS OVER THE EVALUATION HISTORY
+==========================================================
+
+The recursion engine only summarizes history in manual batch sessions and the
+pendulum calibrates on the last result alone. DriftMonitor follows the stream
+of evaluation results and updates, per new result:
+
+- EWMA mean and standard deviation
+- rolling-window quantiles (last ``window`` results)
+- two-sided CUSUM change-point detection (upward and downward shifts,
+  measured in standard deviations of a baseline learned after each change)
+
+for adversarial_risk, grace_score, the emergent-philosophy rate and the share
+of each verdict. Every update costs O(window) at worst (sorted-window insert),
+independent of how many results were seen.
+
+Usage:
+    monitor = DriftMonitor(alert_log="drift_alerts.jsonl")
+    for result in results:
+        for alert in monitor.update(result):
+            print(alert)
+    monitor.snapshot()
+"""
+
+import bisect
+import math
+import os
+import threading
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from log_sink import get_sink
+
+
+# Change detection per series:
+# - min_std: smallest standard deviation assumed, in the series' own units
+#   (keeps a near-constant baseline, e.g. a rare verdict, from alarming on noise)
+# - block: results averaged per detector step; 0/1 series (rates, verdict
+#   shares) are tested on block means, which are close to Gaussian
+METRICS = {
+    "adversarial_risk": {"min_std": 1.0, "block": 1},
+    "grace_score": {"min_std": 1.0, "block": 1},
+    "emergent_rate": {"min_std": 0.05, "block": 10},
+}
+VERDICT_DETECTOR = {"min_std": 0.05, "block": 10}
+
+DEFAULT_WINDOW = 200
+DEFAULT_ALPHA = 0.05
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+# CUSUM slack and decision threshold, in baseline standard deviations
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 10.0
+BASELINE_POINTS = 100  # detector steps used to learn the baseline (no alarms meanwhile)
+
+# Memory bounds for long-lived monitors: change points kept per series (the
+# count keeps growing) and distinct verdicts tracked (later ones share OTHER)
+MAX_CHANGE_POINTS = 500
+MAX_VERDICTS = 16
+OTHER_VERDICT = "OTHER"
+
+
+class EWMA:
+    """Exponentially weighted mean and variance."""
+
+    __slots__ = ("alpha", "mean", "var", "count")
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA):
+        self.alpha = alpha
+        self.mean = None
+        self.var = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.mean is None:
+            self.mean = x
+            return x
+        diff = x - self.mean
+        incr = self.alpha * diff
+        self.mean += incr
+        self.var = (1 - self.alpha) * (self.var + diff * incr)
+        return self.mean
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class RollingQuantiles:
+    """Quantiles of the last `window` values (linear interpolation, like NumPy's default)."""
+
+    __slots__ = ("window", "_fifo", "_sorted")
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._fifo: deque = deque()
+        self._sorted: List[float] = []
+
+    def update(self, x: float):
+        self._fifo.append(x)
+        bisect.insort(self._sorted, x)
+        if len(self._fifo) > self.window:
+            old = self._fifo.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+    def quantile(self, q: float) -> Optional[float]:
+        n = len(self._sorted)
+        if not n:
+            return None
+        pos = q * (n - 1)
+        low = int(math.floor(pos))
+        high = min(low + 1, n - 1)
+        return self._sorted[low] + (self._sorted[high] - self._sorted[low]) * (pos - low)
+
+    def __len__(self):
+        return len(self._sorted)
+
+
+class ChangeDetector:
+    """
+    Two-sided CUSUM test for a shift in the mean.
+
+    Values are averaged in blocks of `block`. The first `baseline` block
+    means after a (re)start fix the reference mean and standard deviation;
+    afterwards each block mean is standardized and the upper and lower
+    cumulative sums grow by ``|z| - slack``. Crossing `threshold` signals
+    "up" or "down" and restarts the detector on the new regime.
+    """
+
+    __slots__ = ("slack", "threshold", "baseline", "min_std", "block", "_block_sum", "_block_n",
+                 "n", "_mean", "_m2", "ref_mean", "ref_std", "_up", "_down")
+
+    def __init__(self, slack: float = CUSUM_SLACK, threshold: float = CUSUM_THRESHOLD,
+                 baseline: int = BASELINE_POINTS, min_std: float = 1e-9, block: int = 1):
+        self.slack = slack
+        self.threshold = threshold
+        self.baseline = baseline
+        self.min_std = min_std
+        self.block = block
+        self.reset()
+
+    def reset(self):
+        self._block_sum = 0.0
+        self._block_n = 0
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.ref_mean = None
+        self.ref_std = None
+        self._up = 0.0
+        self._down = 0.0
+
+    def update(self, x: float) -> Optional[str]:
+        if self.block > 1:
+            self._block_sum += x
+            self._block_n += 1
+            if self._block_n < self.block:
+                return None
+            x = self._block_sum / self._block_n
+            self._block_sum = 0.0
+            self._block_n = 0
+
+        if self.ref_mean is None:
+            # Welford accumulation of the baseline
+            self.n += 1
+            diff = x - self._mean
+            self._mean += diff / self.n
+            self._m2 += diff * (x - self._mean)
+            if self.n >= self.baseline:
+                self.ref_mean = self._mean
+                self.ref_std = max(math.sqrt(self._m2 / (self.n - 1)), self.min_std)
+            return None
+
+        z = (x - self.ref_mean) / self.ref_std
+        self._up = max(0.0, self._up + z - self.slack)
+        self._down = max(0.0, self._down - z - self.slack)
+        if self._up > self.threshold:
+            self.reset()
+            return "up"
+        if self._down > self.threshold:
+            self.reset()
+            return "down"
+        return None
+
+
+class MetricTracker:
+    """EWMA, rolling quantiles and change points of one numeric series."""
+
+    def __init__(self, name: str, min_std: float, block: int = 1,
+                 window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES):
+        self.name = name
+        self.ewma = EWMA(alpha)
+        self.rolling = RollingQuantiles(window)
+        self.detector = ChangeDetector(min_std=min_std, block=block)
+        self.quantiles = tuple(quantiles)
+        self.last = None
+        self.change_points: deque = deque(maxlen=MAX_CHANGE_POINTS)  # most recent only
+        self.change_count = 0
+
+    def update(self, x: float, position: int) -> Optional[Dict[str, Any]]:
+        self.last = x
+        self.ewma.update(x)
+        self.rolling.update(x)
+        direction = self.detector.update(x)
+        if direction is None:
+            return None
+        alert = {
+            "metric": self.name,
+            "direction": direction,
+            "at": position,
+            "ewma": self.ewma.mean,
+            "window_median": self.rolling.quantile(0.5),
+        }
+        self.change_points.append(alert)
+        self.change_count += 1
+        return alert
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.ewma.count,
+            "last": self.last,
+            "ewma": self.ewma.mean,
+            "ewm_std": self.ewma.std,
+            "quantiles": {q: self.rolling.quantile(q) for q in self.quantiles},
+            "change_points": self.change_count,
+        }
+
+
+class DriftMonitor:
+    """
+    Incremental drift analytics over evaluation results (dicts with
+    adversarial_risk, grace_score, verdict, emergent_philosophy).
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 alert_log: Optional[str] = None):
+        self.window = window
+        self.alpha = alpha
+        self.quantiles = tuple(quantiles)
+        self.alert_log = alert_log
+        self.metrics = {
+            name: MetricTracker(name, params["min_std"], params["block"], window, alpha, quantiles)
+            for name, params in METRICS.items()
+        }
+        # Verdict mix: one indicator series per verdict seen so far
+        self.verdicts: Dict[str, MetricTracker] = {}
+        self._verdict_window: deque = deque(maxlen=window)
+        self._verdict_counts: Counter = Counter()
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def update(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Feed one evaluation result; returns the change points it triggered."""
+        with self._lock:
+            self.count += 1
+            alerts = []
+
+            values = {
+                "adversarial_risk": _number(result.get("adversarial_risk")),
+                "grace_score": _number(result.get("grace_score")),
+                "emergent_rate": 1.0 if result.get("emergent_philosophy") else 0.0,
+            }
+            for name, value in values.items():
+                if value is not None:
+                    alert = self.metrics[name].update(value, self.count)
+                    if alert:
+                        alerts.append(alert)
+
+            verdict = str(result.get("verdict") or "UNKNOWN").upper()
+            if verdict not in self.verdicts and len(self.verdicts) >= MAX_VERDICTS - 1:
+                verdict = OTHER_VERDICT
+            if verdict not in self.verdicts:
+                self.verdicts[verdict] = MetricTracker(
+                    f"verdict:{verdict}", VERDICT_DETECTOR["min_std"], VERDICT_DETECTOR["block"],
+                    self.window, self.alpha, self.quantiles
+                )
+            if len(self._verdict_window) == self._verdict_window.maxlen:
+                self._verdict_counts[self._verdict_window[0]] -= 1
+            self._verdict_window.append(verdict)
+            self._verdict_counts[verdict] += 1
+            for name, tracker in self.verdicts.items():
+                alert = tracker.update(1.0 if name == verdict else 0.0, self.count)
+                if alert:
+                    alerts.append(alert)
+
+        if alerts and self.alert_log:
+            sink = get_sink(self.alert_log)
+            for alert in alerts:
+                sink.write_json(alert)
+        return alerts
+
+    def update_many(self, results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replay a history (e.g. at startup); returns all change points."""
+        alerts = []
+        for result in results:
+            alerts.extend(self.update(result))
+        return alerts
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current windowed statistics for every tracked series."""
+        with self._lock:
+            window_size = len(self._verdict_window)
+            return {
+                "results_seen": self.count,
+                "metrics": {name: tracker.snapshot() for name, tracker in self.metrics.items()},
+                "verdict_mix": {
+                    verdict: {
+                        "window_share": (self._verdict_counts[verdict] / window_size) if window_size else 0.0,
+                        "ewma": tracker.ewma.mean,
+                        "change_points": tracker.change_count,
+                    }
+                    for verdict, tracker in self.verdicts.items()
+                },
+            }
+
+    def change_points(self) -> List[Dict[str, Any]]:
+        """Recent change points (up to MAX_CHANGE_POINTS per series), in stream order."""
+        trackers = list(self.metrics.values()) + list(self.verdicts.values())
+        return sorted((cp for t in trackers for cp in t.change_points), key=lambda cp: cp["at"])
+
+
+_default_monitor: Optional[DriftMonitor] = None
+_default_monitor_lock = threading.Lock()
+
+
+def get_default_monitor(alert_log: Optional[str] = "drift_alerts.jsonl",
+                        history_report: Optional[str] = None) -> DriftMonitor:
+    """
+    Shared, process-wide monitor (created on first use, thread-safe).
+
+    Short-lived callers (one MoralPendulum per Streamlit session) would never
+    get past the baseline with a monitor of their own. ``history_report``, a
+    batch report CSV, warms the monitor up on creation; both arguments are
+    ignored once it exists.
+    """
+    global _default_monitor
+    if _default_monitor is None:
+        with _default_monitor_lock:
+            if _default_monitor is None:
+                monitor = DriftMonitor(alert_log=alert_log)
+                if history_report and os.path.exists(history_report):
+                    # Replay without logging: these alerts are history, not news
+                    monitor.alert_log = None
+                    monitor.update_many(results_from_report(history_report))
+                    monitor.alert_log = alert_log
+                _default_monitor = monitor
+    return _default_monitor
+
+
+def _number(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def results_from_report(report_path: str, chunksize: int = 100000):
+    """
+    Evaluation results from a batch report CSV (ejecutar_auditoria_maestra
+    columns), streamed in chunks, to warm up a monitor with past history.
+    """
+    import pandas as pd
+
+    columns = {
+        "Adversarial_Risk": "adversarial_risk",
+        "Grace_Score": "grace_score",
+        "Verdict": "verdict",
+        "Emergent_Philosophy": "emergent_philosophy",
+    }
+    header = set(pd.read_csv(report_path, nrows=0).columns)
+    usecols = [c for c in columns if c in header]
+    for chunk in pd.read_csv(report_path, usecols=usecols, chunksize=chunksize):
+        chunk = chunk.rename(columns=columns)
+        for row in chunk.to_dict("records"):
+            yield row
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    random.seed(7)
+    monitor = DriftMonitor()
+
+    def stream(n, risk_mean, grace_mean, infamy_share):
+        for _ in range(n):
+            yield {
+                "adversarial_risk": min(100, max(0, random.gauss(risk_mean, 10))),
+                "grace_score": min(100, max(0, random.gauss(grace_mean, 10))),
+                "verdict": "Infamy" if random.random() < infamy_share else "Authorized",
+                "emergent_philosophy": random.random() < 0.05,
+            }
+
+    start = time.perf_counter()
+    alerts = monitor.update_many(stream(2000, 20, 75, 0.05))
+    print(f"stable regime (2000 results): {len(alerts)} alerts")
+    alerts = monitor.update_many(stream(500, 45, 60, 0.25))
+    elapsed = time.perf_counter() - start
+    print(f"after drift at result 2000 : {len(alerts)} alerts")
+    for alert in alerts[:6]:
+        print(f"   {alert['metric']:<22} {alert['direction']:<4} at {alert['at']}")
+    print(f"{elapsed / monitor.count * 1e6:.1f} µs per update")
+    snapshot = monitor.snapshot()
+    print({name: round(m["ewma"], 2) for name, m in snapshot["metrics"].items()})
+    print({v: round(m["window_share"], 3) for v, m in snapshot["verdict_mix"].items()})
@@ -1,6 +1,16 @@
 # entropia_engine.py
 import json
 
+# Peso de un módulo sin coeficiente registrado
+PESO_DESCONOCIDO = 0.5
+
+# Umbrales de colapso (índice estrictamente mayor) y su diagnóstico
+COLAPSO_ALTO = 0.8
+COLAPSO_MEDIO = 0.5
+DIAGNOSTICO_ALTO = "ALTA: Colapso Crítico de Futuros. La acción es prácticamente irreversible."
+DIAGNOSTICO_MEDIO = "MEDIA: Fricción Entrópica. Requiere alto consumo de Gracia para revertir."
+DIAGNOSTICO_BAJO = "BAJA: Fluidez Causal. El sistema mantiene múltiples trayectorias abiertas."
+
 class EntropiaCausal:
     """
     Calculador de Irreversibilidad y Colapso de Estados.
@@ -23,7 +33,7 @@ class EntropiaCausal:
         """
         score_base = 0
         for mod in modulos_afectados:
-            peso = self.coeficientes_irreversibilidad.get(mod, 0.5)
+            peso = self.coeficientes_irreversibilidad.get(mod, PESO_DESCONOCIDO)
             score_base += peso * nivel_impacto
             
         # Normalización del índice (0 a 1)
@@ -34,11 +44,122 @@ class EntropiaCausal:
         """
         Determina cuántas ramas de posibilidad se cierran.
         """
-        if indice_entropia > 0.8:
-            return "ALTA: Colapso Crítico de Futuros. La acción es prácticamente irreversible."
-        elif indice_entropia > 0.5:
-            return "MEDIA: Fricción Entrópica. Requiere alto consumo de Gracia para revertir."
-        return "BAJA: Fluidez Causal. El sistema mantiene múltiples trayectorias abiertas."
+        if indice_entropia > COLAPSO_ALTO:
+            return DIAGNOSTICO_ALTO
+        elif indice_entropia > COLAPSO_MEDIO:
+            return DIAGNOSTICO_MEDIO
+        return DIAGNOSTICO_BAJO
+
+    # ==================== API VECTORIZADA (auditorías por lotes) ====================
+
+    def codificar_modulos(self, modulos_por_decision):
+        """
+        Codifica los módulos de cada decisión como matriz multi-hot contra el
+        vector de coeficientes.
+
+        Devuelve (matriz, pesos): matriz[i, j] cuenta cuántas veces la decisión
+        i nombra el módulo j (los repetidos suman, como en el cálculo escalar);
+        la última columna agrupa los módulos sin coeficiente (PESO_DESCONOCIDO).
+        """
+        import numpy as np
+        from itertools import chain, repeat
+
+        nombres = list(self.coeficientes_irreversibilidad)
+        columna = {nombre: j for j, nombre in enumerate(nombres)}
+        pesos = np.array([self.coeficientes_irreversibilidad[n] for n in nombres] + [PESO_DESCONOCIDO])
+
+        n = len(modulos_por_decision)
+        longitudes = np.fromiter(map(len, modulos_por_decision), dtype=np.int64, count=n)
+        filas = np.repeat(np.arange(n), longitudes)
+        columnas = np.fromiter(map(columna.get, chain.from_iterable(modulos_por_decision), repeat(len(nombres))),
+                               dtype=np.int64, count=int(longitudes.sum()))
+
+        matriz = np.bincount(filas * len(pesos) + columnas, minlength=n * len(pesos))
+        return matriz.reshape(n, len(pesos)), pesos
+
+    def calcular_indices(self, modulos_por_decision, niveles_impacto):
+        """
+        Versión vectorizada de calcular_indice para muchas decisiones.
+
+        `modulos_por_decision` es una secuencia de listas de módulos (una por
+        decisión); `niveles_impacto` un escalar o un array de la misma longitud.
+        Devuelve un array NumPy idéntico, valor a valor, a llamar a
+        calcular_indice fila por fila.
+        """
+        import numpy as np
+
+        # Posicional desde aquí: una Series con índice propio no sirve para modulos[i]
+        modulos = list(modulos_por_decision)
+        matriz, pesos = self.codificar_modulos(modulos)
+        niveles = np.broadcast_to(np.asarray(niveles_impacto, dtype=float), (len(matriz),))
+
+        cantidad = matriz.sum(axis=1)
+        # Los floats de Python desbordan a ±inf sin avisar: NumPy igual
+        with np.errstate(invalid="ignore", over="ignore"):
+            # Sin módulos el bucle escalar no suma nada: 0 aunque el nivel sea NaN/inf
+            score_base = np.where(cantidad > 0, (matriz @ pesos) * niveles, 0.0)
+            crudo = score_base / np.where(cantidad > 0, cantidad, 1)
+            # min(1.0, x) de Python: NaN también da 1.0
+            acotado = np.where(crudo < 1.0, crudo, 1.0)
+            indices = np.round(acotado, 4)
+
+            # El orden de la suma difiere del bucle escalar en el último bit; solo
+            # importa si el valor cae sobre un empate de redondeo a 4 decimales.
+            # Esas filas se recalculan con la función escalar para paridad exacta,
+            # igual que las de magnitud enorme: np.round multiplica por 1e4 y
+            # desborda a ±inf donde round() de Python da un valor finito.
+            escalado = acotado * 1e4
+            distancia = np.abs(escalado - np.floor(escalado) - 0.5)
+            dudosas = np.flatnonzero((distancia <= np.maximum(1e-6, np.abs(escalado) * 1e-12))
+                                     | (np.abs(acotado) > 1e300))
+        for i in dudosas:
+            indices[i] = self.calcular_indice(modulos[i], niveles[i].item())
+        return indices
+
+    def evaluar_colapso_many(self, indices_entropia):
+        """
+        Versión vectorizada de evaluar_colapso_futuros: pandas Categorical
+        con el diagnóstico de cada índice.
+        """
+        import numpy as np
+        import pandas as pd
+
+        indices = np.asarray(indices_entropia, dtype=float).ravel()
+        codigos = np.select([indices > COLAPSO_ALTO, indices > COLAPSO_MEDIO], [0, 1], default=2)
+        return pd.Categorical.from_codes(codigos, categories=[DIAGNOSTICO_ALTO, DIAGNOSTICO_MEDIO,
+                                                              DIAGNOSTICO_BAJO])
+
+    def evaluar_lote(self, modulos_por_decision, niveles_impacto):
+        """Índices y diagnósticos de un lote en una sola pasada: (indices, diagnosticos)."""
+        indices = self.calcular_indices(modulos_por_decision, niveles_impacto)
+        return indices, self.evaluar_colapso_many(indices)
 
 # Instancia única para el sistema
 entropia_monitor = EntropiaCausal()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("🧪 Paridad y rendimiento de la API vectorizada\n")
+    rnd = random.Random(0)
+    nombres = list(entropia_monitor.coeficientes_irreversibilidad) + ["Cultural", "Medical"]
+    decisiones = [[rnd.choice(nombres) for _ in range(rnd.randint(0, 6))] for _ in range(200_000)]
+    niveles = [rnd.choice([rnd.random(), rnd.randint(0, 3), round(rnd.random(), 2)]) for _ in decisiones]
+
+    inicio = time.perf_counter()
+    escalar = [entropia_monitor.calcular_indice(m, n) for m, n in zip(decisiones, niveles)]
+    diagnosticos = [entropia_monitor.evaluar_colapso_futuros(i) for i in escalar]
+    t_escalar = time.perf_counter() - inicio
+
+    entropia_monitor.evaluar_lote(decisiones[:10], niveles[:10])  # importa NumPy/pandas fuera de la medición
+    inicio = time.perf_counter()
+    indices, categorias = entropia_monitor.evaluar_lote(decisiones, niveles)
+    t_vector = time.perf_counter() - inicio
+
+    iguales = indices.tolist() == escalar and list(categorias) == diagnosticos
+    print(f"Decisiones: {len(decisiones):,}")
+    print(f"Escalar:    {t_escalar:.2f}s")
+    print(f"Vectorizado: {t_vector:.2f}s ({t_escalar / t_vector:.1f}x)")
+    print(f"{'✅' if iguales else '❌'} Paridad exacta con calcular_indice / evaluar_colapso_futuros")
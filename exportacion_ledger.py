@@ -0,0 +1,342 @@
+"""
+Exportación / importación masiva del ledger de agencia moral
+Vuelca las tablas de auditoría de 100 años a archivos columnares por lotes
+(Parquet o Arrow IPC) y las restaura, en memoria constante
+
+Uso:
+    python exportacion_ledger.py exportar respaldo/ --formato parquet
+    python exportacion_ledger.py importar respaldo/
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import argparse
+from typing import Dict, List, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+except ImportError:  # Dependencia opcional: solo la necesita este módulo
+    pa = None
+
+# ==================== DEFINICIÓN DEL LEDGER ====================
+
+# Tablas de agencia_moral.db (SistemaAgenciaMoral)
+TABLAS_AGENCIA = ("registros_agencia", "agentes")
+
+# Tablas de divine_lock.db (DivineLockSystem)
+TABLAS_DIVINE_LOCK = ("authority_transitions", "moral_debts", "external_audit_locks")
+
+# Columna de integridad de cada tabla (se copia tal cual). La verificación
+# usa el digest de las filas completas: editar cualquier columna la rompe
+COLUMNAS_HASH = {
+    "registros_agencia": "hash_integridad",
+    "authority_transitions": "immutable_hash",
+    "moral_debts": "hash_chain",
+    "external_audit_locks": "divine_lock_hash",
+}
+
+EXTENSIONES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+MANIFIESTO = "manifest.json"
+
+
+def _requiere_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow no está instalado. Instala con: pip install pyarrow"
+        )
+
+
+def _tipo_arrow(tipo_sqlite: str):
+    """Mapea la afinidad de tipo SQLite declarada a un tipo Arrow"""
+    tipo = (tipo_sqlite or "").upper()
+    if "INT" in tipo or "BOOL" in tipo:
+        return pa.int64()
+    if "REAL" in tipo or "FLOA" in tipo or "DOUB" in tipo:
+        return pa.float64()
+    return pa.string()
+
+
+def _esquema_tabla(conn: sqlite3.Connection, tabla: str):
+    """Esquema Arrow derivado de PRAGMA table_info"""
+    columnas = conn.execute(f"PRAGMA table_info({tabla})").fetchall()
+    if not columnas:
+        raise ValueError(f"La tabla {tabla} no existe")
+    return pa.schema([(col[1], _tipo_arrow(col[2])) for col in columnas])
+
+
+def _asegurar_esquemas(db_agencia: str, db_divine_lock: str):
+    """Crea las tablas destino con el esquema de sus sistemas dueños"""
+    from agencia_moral_integracion import SistemaAgenciaMoral
+    from agencia_moral_autolimit import DivineLockSystem
+
+    SistemaAgenciaMoral(db_agencia)
+    DivineLockSystem(db_divine_lock)
+
+
+def _digerir_lote(digest, batch):
+    """
+    Añade al digest cada fila completa del lote (JSON canónico por línea)
+
+    Se calcula sobre el RecordBatch, igual al exportar y al importar, para que
+    los valores pasen por la misma conversión de tipos Arrow.
+    """
+    columnas = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+    for fila in zip(*columnas):
+        digest.update(json.dumps(fila, ensure_ascii=False, default=str).encode())
+        digest.update(b"\n")
+
+
+def _tablas_por_db(db_agencia: str, db_divine_lock: str) -> List[Tuple[str, str]]:
+    return ([(db_agencia, t) for t in TABLAS_AGENCIA] +
+            [(db_divine_lock, t) for t in TABLAS_DIVINE_LOCK])
+
+
+# ==================== EXPORTACIÓN ====================
+
+def exportar_tabla(conn: sqlite3.Connection,
+                   tabla: str,
+                   ruta: str,
+                   formato: str = "parquet",
+                   filas_por_lote: int = 50000,
+                   compresion: str = "zstd") -> Dict:
+    """
+    Exporta una tabla en lotes de `filas_por_lote` filas
+
+    Solo un lote vive en memoria a la vez. Retorna filas escritas y el
+    digest SHA-256 de las filas completas en orden de rowid.
+    """
+    _requiere_pyarrow()
+    esquema = _esquema_tabla(conn, tabla)
+    nombres = esquema.names
+    columna_hash = COLUMNAS_HASH.get(tabla)
+    digest = hashlib.sha256()
+    filas = 0
+
+    if formato == "parquet":
+        escritor = pq.ParquetWriter(ruta, esquema, compression=compresion)
+    elif formato == "arrow":
+        opciones = ipc.IpcWriteOptions(compression=compresion if compresion in ("zstd", "lz4") else None)
+        escritor = ipc.new_file(ruta, esquema, options=opciones)
+    else:
+        raise ValueError(f"formato debe ser uno de {list(EXTENSIONES)}, got {formato!r}")
+
+    try:
+        cursor = conn.execute(
+            f"SELECT {', '.join(nombres)} FROM {tabla} ORDER BY rowid"
+        )
+        while True:
+            lote = cursor.fetchmany(filas_por_lote)
+            if not lote:
+                break
+            columnas = list(zip(*lote))
+            batch = pa.record_batch(
+                [pa.array(col, type=campo.type) for col, campo in zip(columnas, esquema)],
+                schema=esquema
+            )
+            escritor.write_batch(batch)
+            _digerir_lote(digest, batch)
+            filas += len(lote)
+    finally:
+        escritor.close()
+
+    return {
+        "tabla": tabla,
+        "archivo": os.path.basename(ruta),
+        "filas": filas,
+        "columna_hash": columna_hash,
+        "digest_filas": digest.hexdigest(),
+    }
+
+
+def exportar_ledger(destino: str,
+                    db_agencia: str = "agencia_moral.db",
+                    db_divine_lock: str = "divine_lock.db",
+                    formato: str = "parquet",
+                    filas_por_lote: int = 50000,
+                    compresion: str = "zstd") -> Dict:
+    """
+    Exporta el ledger completo a `destino` (un archivo por tabla + manifiesto)
+    """
+    _requiere_pyarrow()
+    if formato not in EXTENSIONES:
+        raise ValueError(f"formato debe ser uno de {list(EXTENSIONES)}, got {formato!r}")
+    os.makedirs(destino, exist_ok=True)
+
+    manifiesto = {"formato": formato, "tablas": {}}
+    for db_path, tabla in _tablas_por_db(db_agencia, db_divine_lock):
+        if not os.path.exists(db_path):
+            print(f"⚠️ {db_path} no existe - se omite {tabla}")
+            continue
+        ruta = os.path.join(destino, tabla + EXTENSIONES[formato])
+        # Modo solo lectura: la exportación nunca modifica el ledger
+        with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+            info = exportar_tabla(conn, tabla, ruta, formato, filas_por_lote, compresion)
+        manifiesto["tablas"][tabla] = info
+        print(f"📦 {tabla}: {info['filas']} filas → {info['archivo']}")
+
+    with open(os.path.join(destino, MANIFIESTO), "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+
+    return manifiesto
+
+
+# ==================== IMPORTACIÓN ====================
+
+def _lotes_archivo(ruta: str, formato: str, filas_por_lote: int):
+    """Itera RecordBatches de un archivo sin cargarlo completo"""
+    if formato == "parquet":
+        archivo = pq.ParquetFile(ruta)
+        yield from archivo.iter_batches(batch_size=filas_por_lote)
+    else:
+        with pa.memory_map(ruta, "r") as fuente:
+            lector = ipc.open_file(fuente)
+            for i in range(lector.num_record_batches):
+                yield lector.get_batch(i)
+
+
+def verificar_archivo(ruta: str,
+                      formato: str,
+                      info_export: Dict,
+                      filas_por_lote: int = 50000):
+    """
+    Comprueba filas y digest de un archivo contra su entrada del manifiesto
+
+    Lectura previa, antes de tocar la base: un archivo alterado lanza
+    ValueError sin que se inserte nada ni se disparen triggers.
+    """
+    _requiere_pyarrow()
+    tabla = info_export["tabla"]
+    if "digest_filas" not in info_export:
+        raise ValueError(f"{tabla}: el manifiesto no trae digest_filas (exportación antigua); "
+                         f"reexporta o importa sin verificar")
+
+    digest = hashlib.sha256()
+    filas = 0
+    for batch in _lotes_archivo(ruta, formato, filas_por_lote):
+        _digerir_lote(digest, batch)
+        filas += batch.num_rows
+
+    if filas != info_export["filas"]:
+        raise ValueError(f"{tabla}: {filas} filas en el archivo, manifiesto declara {info_export['filas']}")
+    if digest.hexdigest() != info_export["digest_filas"]:
+        raise ValueError(f"{tabla}: el contenido no coincide con el digest del manifiesto")
+
+
+def importar_tabla(conn: sqlite3.Connection,
+                   tabla: str,
+                   ruta: str,
+                   formato: str = "parquet",
+                   filas_por_lote: int = 50000) -> Dict:
+    """
+    Importa una tabla por lotes con INSERT OR IGNORE, en una sola transacción
+
+    Las filas ya presentes (misma clave primaria) no se sobrescriben: el
+    ledger es inmutable. Si algo falla a mitad, se revierte la tabla entera.
+    Retorna filas leídas e insertadas.
+    """
+    _requiere_pyarrow()
+    columnas_destino = {col[1] for col in conn.execute(f"PRAGMA table_info({tabla})")}
+    leidas = 0
+    insertadas = 0
+    sentencia = None
+
+    try:
+        for batch in _lotes_archivo(ruta, formato, filas_por_lote):
+            if sentencia is None:
+                nombres = [n for n in batch.schema.names if n in columnas_destino]
+                sentencia = (
+                    f"INSERT OR IGNORE INTO {tabla} ({', '.join(nombres)}) "
+                    f"VALUES ({', '.join('?' * len(nombres))})"
+                )
+            columnas = [batch.column(n).to_pylist() for n in nombres]
+            # rowcount excluye filas tocadas por triggers (p. ej. stats_diarias)
+            cursor = conn.executemany(sentencia, zip(*columnas))
+            insertadas += cursor.rowcount
+            leidas += batch.num_rows
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {
+        "tabla": tabla,
+        "filas_leidas": leidas,
+        "filas_insertadas": insertadas,
+    }
+
+
+def importar_ledger(origen: str,
+                    db_agencia: str = "agencia_moral.db",
+                    db_divine_lock: str = "divine_lock.db",
+                    filas_por_lote: int = 50000,
+                    verificar_hashes: bool = True) -> Dict:
+    """
+    Restaura un ledger exportado con exportar_ledger
+
+    Con verificar_hashes, todos los archivos se comprueban (filas y digest
+    de filas completas) contra el manifiesto antes de insertar nada, y un
+    archivo alterado lanza ValueError con el ledger intacto.
+    """
+    _requiere_pyarrow()
+    with open(os.path.join(origen, MANIFIESTO), "r", encoding="utf-8") as f:
+        manifiesto = json.load(f)
+    formato = manifiesto["formato"]
+
+    pendientes = []
+    for db_path, tabla in _tablas_por_db(db_agencia, db_divine_lock):
+        info_export = manifiesto["tablas"].get(tabla)
+        if info_export is None:
+            continue
+        ruta = os.path.join(origen, info_export["archivo"])
+        if verificar_hashes:
+            verificar_archivo(ruta, formato, info_export, filas_por_lote)
+        pendientes.append((db_path, tabla, ruta))
+
+    _asegurar_esquemas(db_agencia, db_divine_lock)
+
+    resultado = {}
+    for db_path, tabla, ruta in pendientes:
+        with sqlite3.connect(db_path) as conn:
+            info = importar_tabla(conn, tabla, ruta, formato, filas_por_lote)
+        resultado[tabla] = info
+        print(f"📥 {tabla}: {info['filas_insertadas']}/{info['filas_leidas']} filas insertadas")
+
+    return resultado
+
+
+# ==================== CLI ====================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportación/importación columnar del ledger de agencia")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_exp = sub.add_parser("exportar", help="Exporta el ledger a Parquet/Arrow")
+    p_exp.add_argument("destino")
+    p_exp.add_argument("--formato", choices=list(EXTENSIONES), default="parquet")
+    p_exp.add_argument("--compresion", default="zstd")
+
+    p_imp = sub.add_parser("importar", help="Importa un ledger exportado")
+    p_imp.add_argument("origen")
+    p_imp.add_argument("--sin-verificar", action="store_true",
+                       help="No verificar digests de integridad contra el manifiesto")
+
+    for p in (p_exp, p_imp):
+        p.add_argument("--db-agencia", default="agencia_moral.db")
+        p.add_argument("--db-divine-lock", default="divine_lock.db")
+        p.add_argument("--filas-por-lote", type=int, default=50000)
+
+    args = parser.parse_args()
+
+    if args.comando == "exportar":
+        exportar_ledger(args.destino, args.db_agencia, args.db_divine_lock,
+                        args.formato, args.filas_por_lote, args.compresion)
+    else:
+        importar_ledger(args.origen, args.db_agencia, args.db_divine_lock,
+                        args.filas_por_lote, not args.sin_verificar)
+
+    print("✅ Operación completada")
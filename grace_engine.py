@@ -1,5 +1,67 @@
 # grace_engine.py
-import streamlit as st
+"""
+Grace scoring core shared by the UI, motor_logico and the batch audits.
+
+Pure Python on import (no streamlit, no NumPy): scores are small integers
+0-100, so the default gradient is memoized in a bounded LRU and repeated
+lookups are cache hits. NumPy/pandas are only loaded by the bulk path.
+"""
+from functools import lru_cache
+
+INDETERMINATE = "⚠️ Indeterminate State"
+
+LEVELS = (
+    (95, 100, "⚪ Divine Modal", "Transcendent agency preservation"),
+    (90, 94, "🟢 Noble Modal", "Elevation of vulnerability infrastructure"),
+    (75, 89, "🟢 Ideal", "Harmonic agency balance"),
+    (60, 74, "🟡 Standard", "Safe threshold - acceptable"),
+    (45, 59, "🟠 Friction", "Risk present - careful review needed"),
+    (30, 44, "🔴 Harm", "Unjustified agency degradation"),
+    (15, 29, "⚫ Infamy", "Adversarial / severe violation"),
+    (0, 14, "💀 Total Collapse", "Complete agency destruction")
+)
+
+# 101^3 integer inputs exist; the working set of a session is far smaller
+GRADIENT_CACHE_SIZE = 65536
+
+
+def _compute_gradient(levels, agency, grace, adversarial_risk):
+    """
+    Calculates moral gradient based on Moralogy Framework.
+    
+    Logic:
+    - High adversarial risk → severe grace penalty
+    - Agency measures capacity preservation
+    - Grace measures vulnerability respect
+    - Combined score determines moral standing
+    """
+    
+    # Intelligent penalty scaling
+    if adversarial_risk > 70:
+        penalty = adversarial_risk * 1.2  # Severe adversarial intent
+    elif adversarial_risk > 40:
+        penalty = adversarial_risk * 0.9
+    elif adversarial_risk > 20:
+        penalty = adversarial_risk * 0.5
+    else:
+        penalty = 0  # Honest exploration, no penalty
+    
+    effective_grace = max(0, grace - penalty)
+    
+    # Weighted calculation (Grace slightly higher weight - vulnerability is foundational)
+    score = (agency * 0.45) + (effective_grace * 0.55)
+    
+    for low, high, label, description in levels:
+        if low <= score <= high:
+            return f"{label}: {description}"
+    
+    return INDETERMINATE
+
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def grace_gradient(agency, grace, adversarial_risk=0):
+    """Memoized gradient label for the default levels."""
+    return _compute_gradient(LEVELS, agency, grace, adversarial_risk)
 
 class GraceEngine:
     """
@@ -13,48 +75,74 @@ class GraceEngine:
     """
     
     def __init__(self):
-        self.levels = [
-            (95, 100, "⚪ Divine Modal", "Transcendent agency preservation"),
-            (90, 94, "🟢 Noble Modal", "Elevation of vulnerability infrastructure"),
-            (75, 89, "🟢 Ideal", "Harmonic agency balance"),
-            (60, 74, "🟡 Standard", "Safe threshold - acceptable"),
-            (45, 59, "🟠 Friction", "Risk present - careful review needed"),
-            (30, 44, "🔴 Harm", "Unjustified agency degradation"),
-            (15, 29, "⚫ Infamy", "Adversarial / severe violation"),
-            (0, 14, "💀 Total Collapse", "Complete agency destruction")
-        ]
+        self.levels = LEVELS
     
     def get_gradient(self, agency, grace, adversarial_risk=0):
         """
-        Calculates moral gradient based on Moralogy Framework.
-        
-        Logic:
-        - High adversarial risk → severe grace penalty
-        - Agency measures capacity preservation
-        - Grace measures vulnerability respect
-        - Combined score determines moral standing
+        Moral gradient label (see _compute_gradient). Default levels are
+        served from the shared LRU; customized levels are computed directly.
         """
+        if self.levels is LEVELS:
+            try:
+                return grace_gradient(agency, grace, adversarial_risk)
+            except TypeError:  # unhashable input (e.g. a NumPy array)
+                pass
+        return _compute_gradient(self.levels, agency, grace, adversarial_risk)
+    
+    def get_gradient_many(self, agency, grace, adversarial_risk=0):
+        """
+        Vectorized get_gradient for bulk scoring.
         
-        # Intelligent penalty scaling
-        if adversarial_risk > 70:
-            penalty = adversarial_risk * 1.2  # Severe adversarial intent
-        elif adversarial_risk > 40:
-            penalty = adversarial_risk * 0.9
-        elif adversarial_risk > 20:
-            penalty = adversarial_risk * 0.5
-        else:
-            penalty = 0  # Honest exploration, no penalty
+        Takes scalars or arrays (lists, NumPy arrays, pandas Series) of equal
+        length and returns a pandas Categorical with one label per row,
+        identical to calling get_gradient row by row (including the
+        Indeterminate State for scores falling between two levels).
+        """
+        import numpy as np
+        import pandas as pd
         
-        effective_grace = max(0, grace - penalty)
+        agency = np.asarray(agency, dtype=float)
+        grace = np.asarray(grace, dtype=float)
+        risk = np.asarray(adversarial_risk, dtype=float)
+        agency, grace, risk = np.broadcast_arrays(agency, grace, risk)
         
-        # Weighted calculation (Grace slightly higher weight - vulnerability is foundational)
+        # Same penalty tiers as get_gradient
+        penalty = np.select(
+            [risk > 70, risk > 40, risk > 20],
+            [risk * 1.2, risk * 0.9, risk * 0.5],
+            default=0.0
+        )
+        # max(0, x) semantics (NaN → 0, like the scalar path)
+        effective_grace = grace - penalty
+        effective_grace = np.where(effective_grace > 0, effective_grace, 0.0)
         score = (agency * 0.45) + (effective_grace * 0.55)
         
-        for low, high, label, description in self.levels:
-            if low <= score <= high:
-                return f"{label}: {description}"
+        levels = sorted(self.levels, key=lambda level: level[0])
+        lows = np.array([level[0] for level in levels], dtype=float)
+        highs = np.array([level[1] for level in levels], dtype=float)
+        labels = [f"{label}: {description}" for _, _, label, description in levels]
+        
+        # Level whose lower bound is the greatest one <= score, if the score
+        # does not exceed its upper bound
+        idx = np.searchsorted(lows, score, side="right") - 1
+        safe_idx = np.clip(idx, 0, len(levels) - 1)
+        inside = (idx >= 0) & (score <= highs[safe_idx])
+        codes = np.where(inside, safe_idx, len(levels))
+        
+        categories = labels + [INDETERMINATE]
+        return pd.Categorical.from_codes(codes.ravel(), categories=categories)
+    
+    def get_gradient_frame(self, df, agency="agency_score", grace="grace_score",
+                           adversarial_risk="adversarial_risk"):
+        """
+        Gradient labels for a whole DataFrame at once (categorical Series
+        aligned with df.index). A missing risk column counts as risk 0.
+        """
+        import pandas as pd
         
-        return "⚠️ Indeterminate State"
+        risk = df[adversarial_risk] if adversarial_risk in df.columns else 0
+        labels = self.get_gradient_many(df[agency], df[grace], risk)
+        return pd.Series(labels, index=df.index, name="gradient")
     
     def get_detailed_analysis(self, agency, grace, adversarial_risk, harm_vector):
         """
@@ -68,6 +156,10 @@ class GraceEngine:
         
         analysis = {
             "gradient": gradient,
+            "agency_score": agency,
+            "grace_score": grace,
+            "adversarial_risk": adversarial_risk,
+            "harm_analysis": harm_vector,
             "effective_grace": max(0, grace - (adversarial_risk * 0.8 if adversarial_risk > 30 else 0)),
             "harm_severity": harm_severity,
             "total_harm_magnitude": total_harm,
@@ -1,3 +1,9 @@
+import re
+from typing import Dict, Any
+
+from scenario_features import ScenarioFeatures
+
+
 class HumorDetector:
     """Detecta y clasifica contenido humorístico usando técnicas livianas"""
     
@@ -11,10 +17,11 @@ class HumorDetector:
             (r'¿[^?]*\?.*[!.]', 'rhetorical_question')
         ]
         
-        # Análisis simple de estructura
+        # Análisis simple de estructura (sobre el pre-análisis compartido)
+        features = ScenarioFeatures.of(text)
         contains_patterns = []
         for pattern, label in humor_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+            if features.matches(pattern, re.IGNORECASE):
                 contains_patterns.append(label)
         
         return {
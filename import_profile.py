@@ -0,0 +1,124 @@
+"""
+IMPORT COST OF THE PURE SCORING MODULES
+=======================================
+
+Offline batch jobs and tests import the scoring modules (Grace, Noble, the
+pendulum, screening, drift analytics) without needing the Gemini stack.
+This script imports each module in a fresh interpreter and reports:
+
+- wall-clock import time
+- resident memory added by the import (peak RSS delta)
+- heavy dependencies that got pulled in
+
+It exits with status 1 if a pure module loads a network SDK or the UI stack,
+so it can guard against regressions in CI.
+
+Usage:
+    python import_profile.py                 # default pure modules
+    python import_profile.py motor_logico    # any module
+"""
+
+import os
+import sys
+import json
+import subprocess
+from typing import Dict, List
+
+# Modules that must stay importable offline, with no network SDK
+PURE_MODULES = [
+    "grace_engine",
+    "noble_engine",
+    "moral_pendulum",
+    "drift_monitor",
+    "scenario_features",
+    "linear_patterns",
+    "prohibited_domains",
+    "humor_detector",
+    "log_sink",
+    "log_index",
+    "model_registry",
+    "stub_model",
+    "motor_logico",
+    "adversary_engine",
+]
+
+# Never acceptable in a pure module
+FORBIDDEN = ("google.generativeai", "google.ai", "streamlit")
+
+# Reported when present (allowed, but worth knowing)
+HEAVY = ("pandas", "numpy", "pyarrow", "sqlite3")
+
+_PROBE = r"""
+import sys, time, json, importlib
+try:
+    import resource
+    rss = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    rss = lambda: 0
+sys.path.insert(0, sys.argv[2])
+before_modules = set(sys.modules)
+before_rss = rss()
+start = time.perf_counter()
+error = None
+try:
+    importlib.import_module(sys.argv[1])
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - start
+loaded = sorted(set(sys.modules) - before_modules)
+print(json.dumps({"seconds": elapsed, "rss_kb": rss() - before_rss,
+                  "loaded": loaded, "error": error}))
+"""
+
+
+def profile_module(module: str, root: str = None) -> Dict:
+    """Import `module` in a fresh interpreter and measure it."""
+    root = root or os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    # Offline: an import must not depend on credentials being present
+    env.pop("GOOGLE_API_KEY", None)
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, module, root],
+        capture_output=True, text=True, cwd=root, env=env
+    )
+    try:
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        result = {"seconds": None, "rss_kb": None, "loaded": [],
+                  "error": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+
+    loaded = result.pop("loaded")
+    result["module"] = module
+    result["forbidden"] = sorted({m.split(".")[0] if m.startswith("streamlit") else m
+                                  for m in loaded if m.startswith(FORBIDDEN)})
+    result["heavy"] = [m for m in HEAVY if m in loaded]
+    result["modules_loaded"] = len(loaded)
+    return result
+
+
+def profile(modules: List[str]) -> List[Dict]:
+    return [profile_module(m) for m in modules]
+
+
+if __name__ == "__main__":
+    modules = sys.argv[1:] or PURE_MODULES
+    results = profile(modules)
+
+    print(f"{'module':<22} {'import ms':>10} {'RSS +MB':>8} {'modules':>8}  heavy / forbidden")
+    failed = False
+    for r in results:
+        if r["error"]:
+            print(f"{r['module']:<22} {'ERROR':>10}  {r['error']}")
+            failed = True
+            continue
+        flags = ", ".join(r["heavy"])
+        if r["forbidden"]:
+            flags += (", " if flags else "") + "⚠️ " + ", ".join(r["forbidden"])
+            failed = failed or r["module"] in PURE_MODULES
+        print(f"{r['module']:<22} {r['seconds'] * 1000:>10.1f} {r['rss_kb'] / 1024:>8.1f} "
+              f"{r['modules_loaded']:>8}  {flags}")
+
+    if failed:
+        print("❌ A pure module failed to import offline or loaded a network/UI stack")
+        sys.exit(1)
+    print("✅ All modules import offline without network SDKs")
@@ -0,0 +1,431 @@
+"""
+LINEAR-TIME PATTERN MATCHING FOR THE SCREENING LAYERS
+=====================================================
+
+The screening layers (Divine Lock auditor, prohibited domains) use patterns
+such as ``eliminat.*free will`` or ``eliminate.*suffering.*eliminat.*will``.
+With Python's backtracking engine every ``.*`` multiplies the work: a long
+adversarial input that repeats the first word but never completes the chain
+costs O(n^2) or O(n^3) and can pin a CPU.
+
+This module matches the same patterns in linear time, with exactly the same
+result as ``re.search``:
+
+- A pattern is split into top-level alternatives (``|``) and each alternative
+  into segments joined by ``.*`` / ``.+`` gaps.
+- Every segment must have bounded width (literals, classes, ``\\b``, groups,
+  ``?`` and ``{m,n}``). It is expanded into fixed-width alternatives and
+  compiled once per distinct width.
+- Within one line, ``A.*B.*C`` matches iff taking the EARLIEST POSSIBLE END of
+  A, then of B after it, then of C succeeds. For a fixed width the earliest
+  end is simply the leftmost start, so every step is a plain linear search.
+
+Patterns outside this subset raise UnsupportedPattern; compile_pattern() then
+falls back to ``re.compile`` so callers keep working.
+"""
+
+import re
+import time
+import random
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+
+# Upper bound on fixed-width alternatives generated for one segment
+MAX_EXPANSION = 512
+
+
+class UnsupportedPattern(ValueError):
+    """Pattern cannot be matched in linear time by this engine."""
+
+
+# ==================== PARSING ====================
+
+def _split_top_level(pattern: str, separators: Tuple[str, ...]) -> List[Tuple[str, str]]:
+    """
+    Split pattern at top-level separators (outside groups, classes, escapes).
+
+    Returns [(piece, separator_that_follows)]; the last separator is "".
+    """
+    pieces = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            i = _class_end(pattern, i)
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif depth == 0:
+            for sep in separators:
+                if pattern.startswith(sep, i):
+                    end = i + len(sep)
+                    # lazy gap (.*? / .+?) has the same match/no-match semantics
+                    if sep in (".*", ".+") and pattern[end:end + 1] == "?":
+                        end += 1
+                    elif sep in (".*", ".+") and pattern[end:end + 1] == "+":
+                        raise UnsupportedPattern(f"possessive gap in {pattern!r}")
+                    pieces.append((pattern[start:i], sep))
+                    start = i = end
+                    break
+            else:
+                i += 1
+            continue
+        i += 1
+    if depth != 0:
+        raise UnsupportedPattern(f"unbalanced parentheses in {pattern!r}")
+    pieces.append((pattern[start:], ""))
+    return pieces
+
+
+def _class_end(pattern: str, i: int) -> int:
+    """Index just past the character class starting at pattern[i] == '['."""
+    j = i + 1
+    if pattern[j:j + 1] == "^":
+        j += 1
+    if pattern[j:j + 1] == "]":
+        j += 1
+    while j < len(pattern) and pattern[j] != "]":
+        j += 2 if pattern[j] == "\\" else 1
+    if j >= len(pattern):
+        raise UnsupportedPattern(f"unterminated character class in {pattern!r}")
+    return j + 1
+
+
+def _expand(segment: str, flags: int) -> List[Tuple[str, int]]:
+    """
+    Expand a bounded segment into fixed-width (regex, width) alternatives.
+    """
+    alternatives = [("", 0)]
+    i = 0
+    while i < len(segment):
+        atom_options, i = _parse_atom(segment, i, flags)
+
+        # Quantifier
+        low, high = 1, 1
+        if i < len(segment) and segment[i] in "?*+{":
+            q = segment[i]
+            if q == "?":
+                low, high, i = 0, 1, i + 1
+            elif q == "{":
+                m = re.match(r"\{(\d*)(,?)(\d*)\}", segment[i:])
+                if not m or (m.group(2) and not m.group(3)):
+                    raise UnsupportedPattern(f"unbounded repeat in {segment!r}")
+                low = int(m.group(1) or 0)
+                high = int(m.group(3)) if m.group(2) else low
+                i += m.end()
+            else:
+                raise UnsupportedPattern(f"unbounded repeat '{q}' in {segment!r}")
+            if segment[i:i + 1] == "?":     # lazy quantifier: same match set
+                i += 1
+
+        repeated = []
+        for count in range(low, high + 1):
+            combos = [("", 0)]
+            for _ in range(count):
+                combos = [(a + b, wa + wb) for a, wa in combos for b, wb in atom_options]
+                if len(combos) > MAX_EXPANSION:
+                    raise UnsupportedPattern(f"segment too large to expand: {segment!r}")
+            repeated.extend(combos)
+
+        alternatives = [(a + b, wa + wb) for a, wa in alternatives for b, wb in repeated]
+        if len(alternatives) > MAX_EXPANSION:
+            raise UnsupportedPattern(f"segment too large to expand: {segment!r}")
+
+    return alternatives
+
+
+def _parse_atom(segment: str, i: int, flags: int) -> Tuple[List[Tuple[str, int]], int]:
+    """Parse one atom at segment[i]; return its fixed-width options and new index."""
+    ch = segment[i]
+
+    if ch == "\\":
+        esc = segment[i:i + 2]
+        if esc in (r"\b", r"\B"):
+            return [(esc, 0)], i + 2
+        if len(esc) < 2 or esc[1] in "AZz" or esc[1].isdigit():
+            raise UnsupportedPattern(f"anchor or backreference {esc!r}")
+        return [(_single_char(esc, flags), 1)], i + 2
+
+    if ch == "[":
+        end = _class_end(segment, i)
+        return [(_single_char(segment[i:end], flags), 1)], end
+
+    if ch == "(":
+        j = i + 1
+        if segment.startswith("?:", j):
+            j += 2
+        elif segment.startswith("?P<", j):
+            j = segment.index(">", j) + 1
+        elif segment.startswith("?", j):
+            raise UnsupportedPattern(f"lookaround or inline flag in {segment!r}")
+        depth, k = 1, j
+        while depth:
+            if k >= len(segment):
+                raise UnsupportedPattern(f"unbalanced parentheses in {segment!r}")
+            c = segment[k]
+            if c == "\\":
+                k += 2
+                continue
+            if c == "[":
+                k = _class_end(segment, k)
+                continue
+            depth += (c == "(") - (c == ")")
+            k += 1
+        body = segment[j:k - 1]
+        options = []
+        for alt, _ in _split_top_level(body, ("|",)):
+            options.extend(_expand(alt, flags))
+        return options, k
+
+    if ch in "^$":
+        raise UnsupportedPattern(f"anchor '{ch}' in {segment!r}")
+    if ch in "*+?{)|":
+        raise UnsupportedPattern(f"unexpected '{ch}' in {segment!r}")
+
+    return [(_single_char(ch, flags), 1)], i + 1
+
+
+def _single_char(atom: str, flags: int) -> str:
+    """Validate a one-character atom; it must not be able to match a newline."""
+    if re.fullmatch(atom, "\n", flags):
+        raise UnsupportedPattern(f"atom {atom!r} can match a newline")
+    return atom
+
+
+# ==================== MATCHING ====================
+
+class _Segment:
+    """A bounded segment compiled as one regex per distinct width."""
+
+    __slots__ = ("by_width",)
+
+    def __init__(self, source: str, flags: int):
+        grouped = {}
+        for regex, width in _expand(source, flags):
+            grouped.setdefault(width, []).append(regex)
+        self.by_width = [
+            (width, re.compile("|".join(f"(?:{r})" for r in regexes), flags))
+            for width, regexes in sorted(grouped.items())
+        ]
+
+    def min_end(self, text: str, pos: int, endpos: int) -> Optional[int]:
+        """Earliest end of a match starting at or after pos, within [pos, endpos]."""
+        best = None
+        for width, regex in self.by_width:
+            m = regex.search(text, pos, endpos)
+            if m is not None:
+                end = m.start() + width
+                if best is None or end < best:
+                    best = end
+        return best
+
+
+class LinearPattern:
+    """
+    Linear-time equivalent of ``re.compile(pattern, flags)`` for screening.
+
+    ``search(text)`` returns True/False exactly like ``bool(re.search(...))``.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0):
+        if flags & (re.DOTALL | re.VERBOSE | re.MULTILINE):
+            raise UnsupportedPattern("DOTALL, VERBOSE and MULTILINE are not supported")
+        self.pattern = pattern
+        self.flags = flags
+        self._chains = []   # [(segments, gaps)]; gaps[i] = min chars before segments[i]
+
+        for branch, _ in _split_top_level(pattern, ("|",)):
+            segments, gaps = [], []
+            gap = 0
+            for piece, sep in _split_top_level(branch, (".*", ".+")):
+                if piece:
+                    segments.append(_Segment(piece, flags))
+                    gaps.append(gap)
+                    gap = 0
+                gap += 1 if sep == ".+" else 0
+            if not segments:
+                raise UnsupportedPattern(f"branch without literal segments in {pattern!r}")
+            if gap or gaps[0]:
+                raise UnsupportedPattern(f"leading or trailing '.+' in {pattern!r}")
+            self._chains.append((segments, gaps))
+
+    def search(self, text: str) -> bool:
+        return any(self._chain_search(segments, gaps, text)
+                   for segments, gaps in self._chains)
+
+    @staticmethod
+    def _chain_search(segments: List[_Segment], gaps: List[int], text: str) -> bool:
+        n = len(text)
+        first = segments[0]
+        # Next known start per width of the first segment (each text region
+        # is scanned once, whatever the number of lines)
+        next_start = {}
+        pos = 0
+        while pos <= n:
+            k = None
+            for width, regex in first.by_width:
+                cached = next_start.get(width, -1)
+                if cached is not None and cached < pos:
+                    m = regex.search(text, pos)
+                    cached = next_start[width] = m.start() if m else None
+                if cached is not None and (k is None or cached < k):
+                    k = cached
+            if k is None:
+                return False
+
+            line_end = text.find("\n", k)
+            if line_end < 0:
+                line_end = n
+
+            end = first.min_end(text, k, line_end)
+            for segment, gap in zip(segments[1:], gaps[1:]):
+                if end is None:
+                    break
+                if end + gap > line_end:
+                    # '.+' ran out of line; re.search would clamp pos to
+                    # endpos and let an empty segment "match" there
+                    end = None
+                    break
+                end = segment.min_end(text, end + gap, line_end)
+            if end is not None:
+                return True
+            pos = line_end + 1
+        return False
+
+    def __repr__(self):
+        return f"LinearPattern({self.pattern!r})"
+
+
+@lru_cache(maxsize=512)
+def compile_linear(pattern: str, flags: int = 0) -> LinearPattern:
+    """Compile (and cache) a LinearPattern; raises UnsupportedPattern."""
+    return LinearPattern(pattern, flags)
+
+
+@lru_cache(maxsize=512)
+def compile_pattern(pattern: str, flags: int = 0,
+                    warn: bool = True) -> Union[LinearPattern, "re.Pattern"]:
+    """
+    Linear-time matcher when possible, plain ``re.compile`` otherwise.
+
+    Both results support ``if matcher.search(text):``. ``warn`` reports the
+    fallback; screening layers should keep it on.
+    """
+    try:
+        return LinearPattern(pattern, flags)
+    except UnsupportedPattern as e:
+        if warn:
+            print(f"⚠️ Pattern not linear-safe, using backtracking engine: {e}")
+        return re.compile(pattern, flags)
+
+
+def search(pattern: str, text: str, flags: int = 0) -> bool:
+    """Drop-in for ``bool(re.search(pattern, text, flags))`` in linear time."""
+    return bool(compile_pattern(pattern, flags).search(text))
+
+
+# ==================== FUZZ / BENCHMARK HARNESS ====================
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, ".")
+
+    from divine_lock_integration_with_adversarial_check import (
+        DivineLockAdversarialAuditor, DivineLockAdversarialLayer
+    )
+    from prohibited_domains import ProhibitedDomainsLayer
+
+    screening = [(p, 0) for p in DivineLockAdversarialAuditor.CATASTROPHIC_PATTERNS.values()]
+    screening += [(p, 0) for p in DivineLockAdversarialAuditor.PARADOX_PATTERNS.values()]
+    screening += [(p, 0) for p in DivineLockAdversarialLayer.CATASTROPHIC_PATTERNS]
+    screening += [(p, 0) for p in DivineLockAdversarialLayer.PARADOX_PATTERNS]
+    for config in ProhibitedDomainsLayer().prohibited_domains.values():
+        screening += [(p, re.IGNORECASE) for p in config["patterns"]]
+    # Synthetic shapes exercising every supported construct
+    screening += [
+        (r"a.?b.*c{1,3}", 0), (r"(ab|a)b?.*\bc\b", 0), (r"x.+y|[^z\n]q.*w", 0),
+        (r"(?:foo|fo).*o.*(bar)?baz", 0), (r"\Bab.*b\b.+a", 0),
+        # Zero-width and optional segments after '.+' (may have no line left)
+        (r"b.+\b", 0), (r"(ab)?(ab)?.+(ab)?", 0), (r"[^a\n]\b.+\b", 0),
+        (r"a.+(b)?", 0), (r"c.+\B", 0), (r"x?.+y?.+z?", 0), (r"(ab|a).+\b.+(c)?", 0),
+    ]
+
+    # ---- Fuzz: identical verdicts to re.search ----
+    print("=" * 60)
+    print("FUZZ: LinearPattern vs re.search")
+    print("=" * 60)
+    rng = random.Random(2024)
+    alphabet = sorted({w for p, _ in screening for w in re.findall(r"[A-Za-z]+", p)})
+    alphabet += ["a", "b", "c", "q", "w", "x", "y", "z", "ab", "ſ"]
+    separators = [" ", " ", "", "-", ".", "\n", ", "]
+    # Short texts too: '.+' gaps that reach the end of the line or text
+    edge_texts = ["", "a", "c", " c", "ab", " AAcb", "b\n", "x\ny", "ab\nab"]
+    mismatches = 0
+    cases = 0
+    for pattern, flags in screening:
+        linear = compile_linear(pattern, flags)
+        backtracking = re.compile(pattern, flags)
+        for i in range(600 + len(edge_texts)):
+            if i < len(edge_texts):
+                text = edge_texts[i]
+            else:
+                text = "".join(rng.choice(alphabet) + rng.choice(separators)
+                               for _ in range(rng.randint(0, 14)))
+            if rng.random() < 0.2:
+                text = text.upper()
+            cases += 1
+            if linear.search(text) != bool(backtracking.search(text)):
+                mismatches += 1
+                print(f"❌ {pattern!r} on {text!r}")
+    print(f"{cases} cases, {mismatches} mismatches")
+    for unsupported in (r"a+b", r"^ab", r"(?=a)b", r"[^z]q", r"(a)\1", r"a.{2,}b?"):
+        try:
+            compile_linear(unsupported)
+            print(f"❌ {unsupported!r} should be rejected")
+        except UnsupportedPattern:
+            pass
+    print()
+
+    # ---- Benchmark: worst-case growth with input length ----
+    print("=" * 60)
+    print("WORST CASE: time vs input length (adversarial, no match)")
+    print("=" * 60)
+    adversarial = [
+        ("eliminat.*free will", "eliminat "),
+        ("eliminate.*suffering.*eliminat.*will", "eliminate suffering "),
+        (r"\b(fission|fusion)\b.*\b(weapon|explosive|device)\b", "fission "),
+        ("eliminat.*free will", "eliminat free\n"),    # chain restarts on every line
+    ]
+
+    def timed(fn, text):
+        start = time.perf_counter()
+        fn(text)
+        return time.perf_counter() - start
+
+    def growth_table(label, fn, unit, sizes):
+        previous, worst = None, 0.0
+        for size in sizes:
+            text = (unit * (size // len(unit) + 1))[:size]
+            elapsed = timed(fn, text)
+            ratio = elapsed / previous if previous else None
+            worst = max(worst, ratio or 0.0)
+            previous = elapsed
+            shown = f"x{ratio:.1f}" if ratio else "-"
+            print(f"  {label:6s} {size:>9} chars  {elapsed * 1000:10.3f} ms  ({shown} per 2x input)")
+        return worst
+
+    for pattern, unit in adversarial:
+        print(f"\nPattern: {pattern}")
+        growth_table("re", re.compile(pattern).search, unit, (1_000, 2_000, 4_000))
+        worst = growth_table("linear", compile_linear(pattern).search, unit,
+                             (125_000, 250_000, 500_000, 1_000_000))
+        # Doubling the input should at most ~double the time (noise allowance)
+        print(f"  {'✅' if worst < 3.0 else '❌'} linear worst growth per doubling: x{worst:.1f}")
@@ -0,0 +1,381 @@
+"""
+INCREMENTAL READER FOR THE JSONL AUDIT LOGS
+===========================================
+
+Health and monitoring stats (adversary audit log, emergent philosophy log)
+used to json-parse the whole log on every call: O(total lines) per refresh of
+a dashboard, for files that only ever grow.
+
+A LogIndex keeps, in a small sidecar file next to the log (``<log>.idx``):
+
+- the byte offset up to which the log has been consumed
+- a signature of the file's first bytes (to notice rotation/truncation)
+- counters (one per predicate) and distinct-value sets, updated incrementally
+
+``refresh()`` parses only the complete lines appended since the last call.
+When the sink rotated the file (see log_sink), the rest of the rotated segment
+is consumed first, so counters are cumulative across rotations. If the
+history cannot be followed (file truncated or replaced, segment pruned), the
+index starts over from the current file.
+
+``tail(n)`` returns the last n entries reading backwards from the end.
+
+Writers must be flushed (``get_sink(path).flush()``) before reading if the
+caller wants to see its own latest events.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from log_sink import rotated_segments
+
+
+SIGNATURE_BYTES = 1024
+READ_CHUNK = 1024 * 1024
+TAIL_BLOCK = 64 * 1024
+
+_INDEX_VERSION = 1
+
+
+class LogIndex:
+    """Sidecar-indexed, incrementally updated stats over one JSONL log."""
+
+    def __init__(self,
+                 path: str,
+                 counters: Optional[Dict[str, Callable[[dict], bool]]] = None,
+                 distinct: Optional[Dict[str, Callable[[dict], Any]]] = None,
+                 index_path: Optional[str] = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.counters = dict(counters or {})
+        self.distinct = dict(distinct or {})
+        # Changing the predicates invalidates a sidecar written by older code
+        self._layout = sorted(self.counters) + ["|"] + sorted(self.distinct)
+        self._lock = threading.Lock()
+        self._state = None
+        self._index_mtime = None
+
+    # ---------- public API ----------
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Consume new lines and return the current stats:
+        ``{"lines": n, "invalid": n, "counters": {...}, "distinct": {name: set}}``
+        """
+        with self._lock:
+            state = self._load()
+            if self._advance(state):
+                self._save(state)
+            return {
+                "lines": state["lines"],
+                "invalid": state["invalid"],
+                "counters": dict(state["counters"]),
+                "distinct": {name: set(_freeze(v) for v in values)
+                             for name, values in state["distinct"].items()},
+            }
+
+    def tail(self, n: int) -> List[dict]:
+        """Last `n` entries (oldest first), read backwards from the end of the log."""
+        if n <= 0:
+            return []
+        entries: deque = deque()
+        sources = [self.path] + list(reversed(_dedupe(rotated_segments(self.path))))
+        for source in sources:
+            if len(entries) >= n:
+                break
+            try:
+                lines = _tail_lines(source, n - len(entries))
+            except FileNotFoundError:
+                continue
+            entries.extendleft(reversed(lines))
+        return list(entries)[-n:]
+
+    def reset(self):
+        """Forget the index; the next refresh re-reads the current file."""
+        with self._lock:
+            self._state = self._empty_state()
+            try:
+                os.remove(self.index_path)
+            except FileNotFoundError:
+                pass
+            self._index_mtime = None
+
+    # ---------- state ----------
+
+    def _empty_state(self) -> Dict[str, Any]:
+        return {
+            "version": _INDEX_VERSION,
+            "layout": self._layout,
+            "offset": 0,
+            "signature": None,
+            "signature_len": 0,
+            "lines": 0,
+            "invalid": 0,
+            "counters": {name: 0 for name in self.counters},
+            "distinct": {name: [] for name in self.distinct},
+        }
+
+    def _load(self) -> Dict[str, Any]:
+        """In-memory state, reloaded when another process updated the sidecar."""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._state is not None and mtime == self._index_mtime:
+            return self._state
+
+        state = None
+        if mtime is not None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = None
+        if (not isinstance(state, dict) or state.get("version") != _INDEX_VERSION
+                or state.get("layout") != self._layout):
+            state = self._empty_state()
+        self._state = state
+        self._index_mtime = mtime
+        return state
+
+    def _save(self, state: Dict[str, Any]):
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp, self.index_path)
+            self._index_mtime = os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            # Read-only location: keep the in-memory index only
+            self._index_mtime = None
+
+    # ---------- incremental consumption ----------
+
+    def _advance(self, state: Dict[str, Any]) -> bool:
+        """Consume everything new; True if the state changed."""
+        changed = False
+        if state["signature"] is not None and not _matches(self.path, state):
+            segments = self._following_segments(state)
+            if segments is None:
+                # History lost (truncated, replaced or pruned): start over
+                state.clear()
+                state.update(self._empty_state())
+            else:
+                for i, segment in enumerate(segments):
+                    self._consume(segment, state, state["offset"] if i == 0 else 0)
+                state["offset"] = 0
+                state["signature"] = None
+                state["signature_len"] = 0
+            changed = True
+
+        try:
+            consumed = self._consume(self.path, state, state["offset"])
+        except FileNotFoundError:
+            return changed
+        if consumed is not None:
+            state["offset"] = consumed
+            if state["signature_len"] < min(consumed, SIGNATURE_BYTES):
+                state["signature"], state["signature_len"] = _signature(self.path, consumed)
+            changed = True
+        return changed
+
+    def _following_segments(self, state: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Rotated segments to finish, starting with the one the index was
+        reading (continued from the stored offset), or None if it is gone.
+        """
+        segments = _dedupe(rotated_segments(self.path))
+        for i in range(len(segments) - 1, -1, -1):
+            if _matches(segments[i], state):
+                return segments[i:]
+        return None
+
+    def _consume(self, source: str, state: Dict[str, Any], offset: int) -> Optional[int]:
+        """Parse complete lines of `source` from `offset`; returns the new offset."""
+        opener = gzip.open if source.endswith(".gz") else open
+        position = offset
+        pending = b""
+        with opener(source, "rb") as f:
+            if offset:
+                f.seek(offset)
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                data = pending + chunk
+                end = data.rfind(b"\n")
+                if end < 0:
+                    pending = data
+                    continue
+                self._count(data[:end + 1], state)
+                position += end + 1
+                pending = data[end + 1:]
+        if position == offset:
+            return None
+        return position
+
+    def _count(self, data: bytes, state: Dict[str, Any]):
+        counters = state["counters"]
+        distinct = {name: set(_freeze(v) for v in values)
+                    for name, values in state["distinct"].items()}
+        for raw in data.splitlines():
+            if not raw.strip():
+                continue
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                state["invalid"] += 1
+                continue
+            if not isinstance(entry, dict):
+                state["invalid"] += 1
+                continue
+            state["lines"] += 1
+            for name, predicate in self.counters.items():
+                if predicate(entry):
+                    counters[name] += 1
+            for name, key in self.distinct.items():
+                try:
+                    distinct[name].add(_freeze(key(entry)))
+                except TypeError:
+                    pass
+        state["distinct"] = {name: list(values) for name, values in distinct.items()}
+
+
+# ==================== HELPERS ====================
+
+def _freeze(value):
+    # Values round-trip through JSON: lists come back as lists
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _dedupe(segments: List[str]) -> List[str]:
+    """While compaction runs a segment can exist both plain and as .gz."""
+    seen = set()
+    unique = []
+    for segment in segments:
+        stem = segment[:-3] if segment.endswith(".gz") else segment
+        if stem not in seen:
+            seen.add(stem)
+            unique.append(segment)
+    return unique
+
+
+def _signature(source: str, limit: int):
+    """SHA-256 of the first bytes of a log (up to SIGNATURE_BYTES)."""
+    opener = gzip.open if source.endswith(".gz") else open
+    with opener(source, "rb") as f:
+        head = f.read(min(limit, SIGNATURE_BYTES))
+    return hashlib.sha256(head).hexdigest(), len(head)
+
+
+def _matches(source: str, state: Dict[str, Any]) -> bool:
+    """Is `source` the file the index was reading (same head, not truncated)?"""
+    try:
+        if not source.endswith(".gz") and os.path.getsize(source) < state["offset"]:
+            return False
+        signature, length = _signature(source, state["signature_len"])
+    except (OSError, EOFError):
+        return False
+    return length == state["signature_len"] and signature == state["signature"]
+
+
+def _parse(raw: bytes):
+    try:
+        entry = json.loads(raw)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _tail_lines(source: str, n: int) -> List[dict]:
+    """Last `n` parsed entries of one file (oldest first)."""
+    if source.endswith(".gz"):
+        # Compressed segments cannot be read backwards; they are only
+        # reached right after a rotation, when the current file is short
+        recent: deque = deque(maxlen=n)
+        with gzip.open(source, "rb") as f:
+            for raw in f:
+                entry = _parse(raw) if raw.endswith(b"\n") else None
+                if entry is not None:
+                    recent.append(entry)
+        return list(recent)
+
+    entries: List[dict] = []
+    with open(source, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        # Text after the last newline is a line still being written
+        partial = True
+        while position > 0 and len(entries) < n:
+            step = min(TAIL_BLOCK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + remainder
+            if partial:
+                cut = data.rfind(b"\n")
+                if cut < 0:
+                    remainder = b""
+                    continue
+                data = data[:cut]
+                partial = False
+            lines = data.split(b"\n")
+            # The first piece may continue in the previous block
+            remainder = lines.pop(0) if position > 0 else b""
+            for raw in reversed(lines):
+                entry = _parse(raw) if raw.strip() else None
+                if entry is not None:
+                    entries.append(entry)
+                    if len(entries) >= n:
+                        break
+    entries.reverse()
+    return entries
+
+
+if __name__ == "__main__":
+    # Full rescan vs. incremental refresh on a growing log
+    import time
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.jsonl")
+        counters = {"grace_failures": lambda a: not a.get("grace_passed", True)}
+        index = LogIndex(path, counters=counters)
+
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(200000):
+                f.write(json.dumps({"i": i, "grace_passed": i % 7 != 0}) + "\n")
+
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            audits = [json.loads(line) for line in f]
+        full = sum(1 for a in audits if not a.get("grace_passed", True))
+        rescan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = index.refresh()
+        initial = time.perf_counter() - start
+
+        with open(path, "a", encoding="utf-8") as f:
+            for i in range(100):
+                f.write(json.dumps({"i": i, "grace_passed": False}) + "\n")
+
+        start = time.perf_counter()
+        after = index.refresh()
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recent = index.tail(5)
+        tail = time.perf_counter() - start
+
+        assert first["counters"]["grace_failures"] == full
+        assert after["counters"]["grace_failures"] == full + 100
+        print(f"full rescan          : {rescan * 1000:8.2f} ms ({len(audits)} lines)")
+        print(f"first refresh        : {initial * 1000:8.2f} ms")
+        print(f"refresh (+100 lines) : {incremental * 1000:8.2f} ms")
+        print(f"tail(5)              : {tail * 1000:8.2f} ms → {[e['i'] for e in recent]}")
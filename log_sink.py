@@ -0,0 +1,355 @@
+"""
+SHARED BUFFERED LOG SINK
+========================
+
+Audit logs (Divine Lock auditor, adversary engine, emergent philosophy,
+pendulum calibration, Divine Lock immutable log) used to reopen their file
+in append mode for every event, on the request path, and grew forever.
+
+A LogSink owns one file:
+
+- ``write()`` only enqueues into a bounded queue (no syscall on the caller)
+- a writer thread drains the queue in batches through one open handle
+- fsync policy: "never" (OS decides), "batch" (after every batch) or
+  "interval" (at most every ``fsync_interval`` seconds)
+- rotation by size (``max_bytes``) and/or age (``rotate_interval``); rotated
+  segments are gzip-compacted in the background and only ``backups`` are kept
+- ``flush()`` is a barrier: everything written before it is in the file
+  (visible to readers; durability still follows the fsync policy)
+
+Sinks are shared per path through ``get_sink(path)``; ``configure()`` sets the
+defaults used for sinks created afterwards. All sinks are flushed at exit.
+
+One writer process per file: size/age rotation (``os.replace``) is decided
+by each sink alone, so two processes appending to the same path would rotate
+it under each other. Multi-worker deployments give each worker its own file,
+e.g. ``get_sink(per_process_path("audit.jsonl"))``.
+"""
+
+import os
+import re
+import glob
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import datetime
+import threading
+from typing import Any, Dict, Optional
+
+
+DEFAULTS: Dict[str, Any] = {
+    "max_bytes": 64 * 1024 * 1024,
+    "rotate_interval": None,        # seconds, None = size-based only
+    "backups": 10,
+    "compress": True,
+    "fsync": "interval",
+    "fsync_interval": 1.0,
+    "queue_size": 10000,
+    "block_when_full": True,        # back-pressure instead of losing audit records
+    "batch_size": 512,
+}
+
+FSYNC_POLICIES = ("never", "batch", "interval")
+
+# Suffix of rotated segments: <path>.<YYYYmmdd-HHMMSS-ffffff>[.gz]
+_SEGMENT_SUFFIX = re.compile(r"\.\d{8}-\d{6}-\d{6}(\.gz)?$")
+
+_STOP = object()
+
+
+class LogSink:
+    """Buffered, rotating append-only writer for one log file."""
+
+    def __init__(self, path: str, **options):
+        config = dict(DEFAULTS)
+        unknown = set(options) - set(config)
+        if unknown:
+            raise ValueError(f"Unknown LogSink options: {sorted(unknown)}")
+        config.update(options)
+        if config["fsync"] not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {config['fsync']!r}")
+
+        self.path = path
+        self.config = config
+        self._queue: "queue.Queue" = queue.Queue(maxsize=config["queue_size"])
+        self._file = None
+        self._segment_started = time.time()
+        self._last_fsync = time.monotonic()
+        self._closed = False
+
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"LogSink[{os.path.basename(path)}]", daemon=True
+        )
+        self._thread.start()
+
+    # ---------- caller side (request path) ----------
+
+    def write(self, record: str) -> bool:
+        """Enqueue raw text (caller includes newlines). False if dropped."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put(record, block=self.config["block_when_full"])
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def write_json(self, obj: Any, **dumps_options) -> bool:
+        """
+        Enqueue one JSON line. The object is serialized here, on the caller
+        thread, so callers may keep mutating it (shared lists, live
+        calibration data) once the call returns. False if dropped or not
+        serializable.
+        """
+        if self._closed:
+            return False
+        dumps_options.setdefault("ensure_ascii", False)
+        try:
+            line = json.dumps(obj, **dumps_options) + "\n"
+        except (TypeError, ValueError) as e:
+            self.errors += 1
+            print(f"⚠️ LogSink could not serialize record for {self.path}: {e}")
+            return False
+        return self.write(line)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every record enqueued so far is written to the file."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Drain the queue, close the file and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "rotations": self.rotations,
+            "errors": self.errors,
+        }
+
+    # ---------- writer thread ----------
+
+    def _run(self):
+        batch_size = self.config["batch_size"]
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for item in batch:
+                if isinstance(item, str):
+                    lines.append(item)
+                    continue
+                # Barrier (flush Event) or stop: write what precedes it first.
+                # A barrier makes records visible to readers; fsync still
+                # follows the policy, except on close.
+                self._write_lines(lines)
+                lines = []
+                self._sync(force=item is _STOP)
+                if item is _STOP:
+                    self._close_file()
+                    return
+                item.set()
+            self._write_lines(lines)
+            self._sync(force=False)
+
+    def _write_lines(self, lines):
+        if not lines:
+            return
+        try:
+            if self._should_rotate():
+                self._rotate()
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("".join(lines))
+            self.written += len(lines)
+        except OSError as e:
+            self.errors += 1
+            if self.errors == 1:
+                print(f"⚠️ LogSink could not write {self.path}: {e}")
+
+    def _sync(self, force: bool):
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            policy = self.config["fsync"]
+            now = time.monotonic()
+            if policy == "batch" or (policy == "interval" and
+                                     (force or now - self._last_fsync >= self.config["fsync_interval"])):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+        except OSError:
+            self.errors += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                self.errors += 1
+            self._file = None
+
+    # ---------- rotation ----------
+
+    def _should_rotate(self) -> bool:
+        max_bytes = self.config["max_bytes"]
+        interval = self.config["rotate_interval"]
+        if interval and time.time() - self._segment_started >= interval:
+            return os.path.exists(self.path)
+        if max_bytes:
+            size = self._file.tell() if self._file is not None else (
+                os.path.getsize(self.path) if os.path.exists(self.path) else 0)
+            return size >= max_bytes
+        return False
+
+    def _rotate(self):
+        self._close_file()
+        self._segment_started = time.time()
+        if not os.path.exists(self.path):
+            return
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = f"{self.path}.{stamp}"
+        os.replace(self.path, rotated)
+        self.rotations += 1
+        if self.config["compress"]:
+            threading.Thread(target=self._compact, args=(rotated,), daemon=True).start()
+        else:
+            self._prune()
+
+    def _compact(self, rotated: str):
+        """gzip a rotated segment (tmp + rename, so a crash never leaves half a .gz)."""
+        try:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz.tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(rotated + ".gz.tmp", rotated + ".gz")
+            os.remove(rotated)
+        except OSError:
+            self.errors += 1
+        self._prune()
+
+    def rotated_segments(self):
+        """Rotated segments of this log, oldest first."""
+        return rotated_segments(self.path)
+
+    def _prune(self):
+        backups = self.config["backups"]
+        if backups is None:
+            return
+        segments = self.rotated_segments()
+        for old in segments[:max(0, len(segments) - backups)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def rotated_segments(path: str):
+    """Rotated segments of the log at `path` (compressed or not), oldest first."""
+    prefix = len(path)
+    segments = [p for p in glob.glob(glob.escape(path) + ".*")
+                if _SEGMENT_SUFFIX.fullmatch(p[prefix:])]
+    return sorted(segments)
+
+
+# ==================== SHARED REGISTRY ====================
+
+_sinks: Dict[str, LogSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def configure(**options):
+    """Set defaults for sinks created from now on (e.g. at app start)."""
+    unknown = set(options) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown LogSink options: {sorted(unknown)}")
+    DEFAULTS.update(options)
+
+
+def per_process_path(path: str) -> str:
+    """`path` with the process id before the extension (audit.jsonl -> audit.<pid>.jsonl)."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}{ext}"
+
+
+def get_sink(path: str, **options) -> LogSink:
+    """The shared sink for `path` (created on first use, one writer process per path)."""
+    key = os.path.abspath(path)
+    sink = _sinks.get(key)
+    if sink is None:
+        with _sinks_lock:
+            sink = _sinks.get(key)
+            if sink is None:
+                sink = _sinks[key] = LogSink(path, **options)
+    return sink
+
+
+def flush_all(timeout: Optional[float] = 5.0):
+    for sink in list(_sinks.values()):
+        sink.flush(timeout)
+
+
+@atexit.register
+def close_all():
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
+
+
+if __name__ == "__main__":
+    # Throughput: per-event open/append vs. shared sink
+    import tempfile
+
+    events = [{"i": i, "scenario": "Eliminate all suffering by eliminating free will",
+               "severity": "CRITICAL"} for i in range(20000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.jsonl")
+        start = time.perf_counter()
+        for event in events:
+            with open(legacy_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        legacy = time.perf_counter() - start
+
+        sink = LogSink(os.path.join(tmp, "sink.jsonl"), max_bytes=256 * 1024, backups=3)
+        start = time.perf_counter()
+        for event in events:
+            sink.write_json(event)
+        enqueue = time.perf_counter() - start
+        sink.flush()
+        total = time.perf_counter() - start
+        sink.close()
+        time.sleep(0.2)  # let background compaction finish
+
+        print(f"per-event open/append : {legacy / len(events) * 1e6:7.2f} µs/event")
+        print(f"sink (caller side)    : {enqueue / len(events) * 1e6:7.2f} µs/event")
+        print(f"sink (until on disk)  : {total / len(events) * 1e6:7.2f} µs/event")
+        print(f"stats: {sink.stats()}")
+        print(f"segments kept: {[os.path.basename(p) for p in sink.rotated_segments()]}")
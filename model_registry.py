@@ -0,0 +1,139 @@
+"""
+PROCESS-WIDE LLM MODEL REGISTRY
+===============================
+
+motor_logico used to configure the Gemini SDK and build its GenerativeModel
+at import time, raising if GOOGLE_API_KEY was missing: every page, tool and
+test importing it paid the SDK import and needed network credentials.
+
+Models are now created on first use and shared by the whole process:
+
+    from model_registry import get_model
+    response = get_model(system_instruction=...).generate_content(prompt)
+
+Backends are pluggable (``register_backend``). Built in:
+
+- "gemini": google.generativeai (API key from GOOGLE_API_KEY or Streamlit secrets)
+- "stub":   deterministic local model (stub_model), no network
+
+The backend is chosen by the ``backend`` argument, then ``configure()``, then
+the MORALOGY_MODEL_BACKEND environment variable, then "gemini".
+
+Factory options set through ``configure()`` belong to one backend (stub
+latencies never reach genai.GenerativeModel). Cached models stay cached
+across ``configure()`` calls, so wrappers installed on them (e.g.
+integracion_facil's auditing wrapper) survive, unless the options of their
+own backend change.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+BACKEND_ENV = "MORALOGY_MODEL_BACKEND"
+DEFAULT_BACKEND = "gemini"
+DEFAULT_MODEL_NAME = "gemini-2.0-flash-exp"
+
+_backends: Dict[str, Callable[..., Any]] = {}
+_models: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_lock = threading.Lock()
+_config: Dict[str, Any] = {"backend": None, "model_name": DEFAULT_MODEL_NAME}
+_options: Dict[str, Dict[str, Any]] = {}  # factory options per backend
+
+
+def register_backend(name: str, factory: Callable[..., Any]):
+    """
+    Register a backend. `factory(model_name, system_instruction, **options)`
+    returns an object with ``generate_content(prompt)``.
+    """
+    _backends[name] = factory
+
+
+def configure(backend: Optional[str] = None, model_name: Optional[str] = None, **options):
+    """
+    Set process defaults (e.g. at app start or in a test session).
+
+    ``options`` go to the factory of the selected backend only. Switching
+    backend starts it from the given options; otherwise they are merged
+    into the current backend's. Only that backend's cached models are
+    dropped, and only if its options actually change.
+    """
+    if backend is not None and backend not in _backends:
+        raise ValueError(f"Unknown model backend {backend!r}; registered: {sorted(_backends)}")
+    with _lock:
+        switching = backend is not None and backend != current_backend()
+        if backend is not None:
+            _config["backend"] = backend
+        if model_name is not None:
+            _config["model_name"] = model_name
+        target = current_backend()
+        previous = _options.get(target, {})
+        updated = dict(options) if switching else {**previous, **options}
+        if updated != previous:
+            _options[target] = updated
+            for key in [key for key in _models if key[0] == target]:
+                del _models[key]
+
+
+def current_backend() -> str:
+    return _config["backend"] or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND
+
+
+def get_model(system_instruction: Optional[str] = None,
+              backend: Optional[str] = None,
+              model_name: Optional[str] = None):
+    """The shared model for (backend, model name, system instruction), created on first use."""
+    backend = backend or current_backend()
+    model_name = model_name or _config["model_name"]
+    key = (backend, model_name, system_instruction)
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                factory = _backends.get(backend)
+                if factory is None:
+                    raise ValueError(f"Unknown model backend {backend!r}; registered: {sorted(_backends)}")
+                model = _models[key] = factory(model_name, system_instruction, **_options.get(backend, {}))
+    return model
+
+
+def reset():
+    """Drop cached models and defaults (tests)."""
+    with _lock:
+        _models.clear()
+        _options.clear()
+        _config.update({"backend": None, "model_name": DEFAULT_MODEL_NAME})
+
+
+# ==================== BUILT-IN BACKENDS ====================
+
+_gemini_configured = False
+
+
+def _gemini_backend(model_name, system_instruction, **options):
+    global _gemini_configured
+    import google.generativeai as genai
+
+    if not _gemini_configured:
+        try:
+            api_key = os.environ["GOOGLE_API_KEY"]
+        except KeyError:
+            try:
+                import streamlit as st
+                api_key = st.secrets["GOOGLE_API_KEY"]
+            except Exception:
+                raise ValueError("GOOGLE_API_KEY not found in environment or Streamlit secrets")
+        genai.configure(api_key=api_key)
+        _gemini_configured = True
+
+    return genai.GenerativeModel(model_name=model_name, system_instruction=system_instruction, **options)
+
+
+def _stub_backend(model_name, system_instruction, **options):
+    from stub_model import StubModel
+    return StubModel(model_name=model_name, system_instruction=system_instruction, **options)
+
+
+register_backend("gemini", _gemini_backend)
+register_backend("stub", _stub_backend)
@@ -1,8 +1,56 @@
-import json
 import os
 import random
+import sqlite3
 from datetime import datetime
-from motor_logico import ge, MORALOGY_INSTRUCTION
+from drift_monitor import get_default_monitor
+from log_sink import get_sink
+
+class PendulumStateStore:
+    """
+    Estado compartido del péndulo: una fila SQLite por péndulo con versión.
+    Las escrituras son compare-and-swap sobre la versión, así que sesiones y
+    workers concurrentes nunca pisan la calibración de otro.
+    """
+    
+    def __init__(self, db_path="pendulum_state.db", pendulum_id="global"):
+        self.db_path = db_path
+        self.pendulum_id = pendulum_id
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pendulum_state (
+                    pendulum_id TEXT PRIMARY KEY,
+                    oscillation_state TEXT NOT NULL,
+                    tension_index REAL NOT NULL,
+                    version INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO pendulum_state VALUES (?, 'NEUTRAL', 0.5, 0, ?)",
+                (self.pendulum_id, datetime.now().isoformat())
+            )
+    
+    def load(self):
+        """(oscillation_state, tension_index, version) actuales"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT oscillation_state, tension_index, version FROM pendulum_state WHERE pendulum_id = ?",
+                (self.pendulum_id,)
+            ).fetchone()
+    
+    def compare_and_swap(self, expected_version, oscillation_state, tension_index):
+        """Escribe solo si nadie actualizó desde `expected_version`"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """UPDATE pendulum_state
+                   SET oscillation_state = ?, tension_index = ?, version = version + 1, updated_at = ?
+                   WHERE pendulum_id = ? AND version = ?""",
+                (oscillation_state, tension_index, datetime.now().isoformat(),
+                 self.pendulum_id, expected_version)
+            )
+            return cursor.rowcount == 1
+
 
 class MoralPendulum:
     """
@@ -11,10 +59,18 @@ class MoralPendulum:
     - Implementa un Auto-adversario para detectar fatiga o deriva moral.
     """
     
-    def __init__(self, pattern_memory_path="pattern_memory.json"):
+    def __init__(self, pattern_memory_path="pattern_memory.json", drift_monitor=None,
+                 state_db="pendulum_state.db", pendulum_id="global", history_report=None):
         self.pattern_memory_path = pattern_memory_path
         self.oscillation_state = "NEUTRAL" # [CONSERVE, NEUTRAL, ADMIT]
         self.tension_index = 0.5 # 0.0 (Rígido) a 1.0 (Abierto)
+        # Estado persistente compartido entre sesiones/workers (None = solo memoria)
+        self.state_store = PendulumStateStore(state_db, pendulum_id) if state_db else None
+        if self.state_store:
+            self.oscillation_state, self.tension_index, _ = self.state_store.load()
+        # Deriva sobre la historia completa (no solo el último resultado): el
+        # monitor es del proceso, no de la sesión, para que salga del calentamiento
+        self.drift_monitor = drift_monitor or get_default_monitor(history_report=history_report)
         
     def generate_adversarial_test(self, user_prompt):
         """
@@ -40,26 +96,48 @@ class MoralPendulum:
         verdict = last_result.get('verdict', '').upper()
         grace_score = last_result.get('grace_score', 50) # Si el engine lo provee
         
-        # Lógica de Oscilación
-        if risk > 80 or verdict == "INFAMY":
-            # El sistema detectó peligro: El péndulo se mueve a CONSERVAR
-            self.tension_index = max(0.1, self.tension_index - 0.15)
-            self.oscillation_state = "CONSERVE"
-        elif verdict == "AUTHORIZED" and grace_score > 85:
-            # El sistema encontró 'Lo Bueno' genuino: El péndulo se mueve a ADMITIR
-            self.tension_index = min(0.9, self.tension_index + 0.1)
-            self.oscillation_state = "ADMIT"
+        # Cambios sostenidos detectados en la ventana de resultados
+        drift_alerts = self.drift_monitor.update(last_result)
+        drift_danger = any(
+            (a['metric'] == 'adversarial_risk' and a['direction'] == 'up') or
+            (a['metric'] == 'verdict:INFAMY' and a['direction'] == 'up')
+            for a in drift_alerts
+        )
+        
+        danger = risk > 80 or verdict == "INFAMY" or drift_danger
+        admit = verdict == "AUTHORIZED" and grace_score > 85
+        
+        if self.state_store is None:
+            self.oscillation_state, self.tension_index = self._oscillate(self.tension_index, danger, admit)
         else:
-            # Regreso lento al centro
-            self.tension_index = 0.5 if self.tension_index == 0.5 else (self.tension_index + 0.5) / 2
-            self.oscillation_state = "NEUTRAL"
+            # Compare-and-swap: se recalcula sobre el último estado guardado
+            # hasta que ninguna otra sesión haya escrito entre medio
+            while True:
+                _, tension, version = self.state_store.load()
+                state, tension = self._oscillate(tension, danger, admit)
+                if self.state_store.compare_and_swap(version, state, tension):
+                    break
+            self.oscillation_state, self.tension_index = state, tension
 
         return {
             "state": self.oscillation_state,
             "tension": self.tension_index,
-            "recommendation": self._get_recommendation()
+            "recommendation": self._get_recommendation(),
+            "drift_alerts": drift_alerts
         }
 
+    @staticmethod
+    def _oscillate(tension_index, danger, admit):
+        """Un paso del péndulo: (nuevo estado, nueva tensión)"""
+        if danger:
+            # El sistema detectó peligro: El péndulo se mueve a CONSERVAR
+            return "CONSERVE", max(0.1, tension_index - 0.15)
+        if admit:
+            # El sistema encontró 'Lo Bueno' genuino: El péndulo se mueve a ADMITIR
+            return "ADMIT", min(0.9, tension_index + 0.1)
+        # Regreso lento al centro
+        return "NEUTRAL", 0.5 if tension_index == 0.5 else (tension_index + 0.5) / 2
+
     def _get_recommendation(self):
         if self.tension_index < 0.3:
             return "ALERTA: Rigidez detectada. El sistema podría estar volviéndose paranoico."
@@ -72,8 +150,7 @@ class MoralPendulum:
             "timestamp": datetime.now().isoformat(),
             "data": calibration_data
         }
-        with open("pendulum_log.jsonl", "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        get_sink("pendulum_log.jsonl").write_json(log_entry, ensure_ascii=True)
 
 # Integración sugerida en principal.py:
 # pendulum = MoralPendulum()
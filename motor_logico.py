@@ -1,59 +1,18 @@
 # motor_logico.py - VERSIÓN RESTAURADA
-import google.generativeai as genai
 import json
-import os
-import pandas as pd
 from datetime import datetime
 
+from grace_engine import GraceEngine
+from log_index import LogIndex
+from log_sink import get_sink
+from model_registry import get_model
+
 # ==================== SETUP API ====================
-try:
-    genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-except KeyError:
-    try:
-        import streamlit as st
-        genai.configure(api_key=st.secrets["GOOGLE_API_KEY"])
-    except:
-        raise ValueError("GOOGLE_API_KEY not found in environment or Streamlit secrets")
+# El modelo se crea en el primer uso (model_registry): importar este módulo
+# no carga el SDK ni exige GOOGLE_API_KEY. Backend local: MORALOGY_MODEL_BACKEND=stub
 
 # ==================== GRACE ENGINE ====================
-class GraceEngine:
-    """Motor de Gracia - Evalúa la calidad moral de decisiones"""
-    
-    def get_gradient(self, agency_score, grace_score, adversarial_risk):
-        """Calcula gradiente de alarma basado en scores"""
-        if adversarial_risk > 70:
-            return "🔴 ALARMA ROJA - Riesgo Crítico"
-        elif agency_score < 30:
-            return "🟠 ALARMA NARANJA - Agency Degradada"
-        elif grace_score < 40:
-            return "🟡 ALARMA AMARILLA - Tensión Moderada"
-        elif grace_score >= 70 and agency_score >= 70:
-            return "🟢 ALARMA VERDE - Gema Lógica"
-        else:
-            return "⚪ ALARMA BLANCA - Estado Neutro"
-    
-    def get_detailed_analysis(self, agency_score, grace_score, adversarial_risk, harm_vector):
-        """Análisis detallado de Grace"""
-        return {
-            "gradient": self.get_gradient(agency_score, grace_score, adversarial_risk),
-            "agency_score": agency_score,
-            "grace_score": grace_score,
-            "adversarial_risk": adversarial_risk,
-            "harm_analysis": harm_vector,
-            "recommendation": self._get_recommendation(grace_score, adversarial_risk)
-        }
-    
-    def _get_recommendation(self, grace_score, adversarial_risk):
-        """Genera recomendación basada en scores"""
-        if adversarial_risk > 60:
-            return "BLOCK: High adversarial intent detected"
-        elif grace_score < 40:
-            return "REVIEW: Requires additional moral scrutiny"
-        elif grace_score >= 70:
-            return "AUTHORIZE: High moral confidence"
-        else:
-            return "CONDITIONAL: Proceed with caution"
-
+# Única implementación del motor de gracia: grace_engine (núcleo sin UI)
 ge = GraceEngine()
 
 # ==================== MORALOGY FRAMEWORK ====================
@@ -105,10 +64,16 @@ OUTPUT STRICT JSON:
 }
 """
 
-model = genai.GenerativeModel(
-    model_name="gemini-2.0-flash-exp",
-    system_instruction=MORALOGY_INSTRUCTION
-)
+def _model():
+    """Modelo compartido del proceso (creado la primera vez que se usa)"""
+    return get_model(system_instruction=MORALOGY_INSTRUCTION)
+
+
+def __getattr__(name):
+    # `from motor_logico import model` sigue funcionando, de forma perezosa
+    if name == "model":
+        return _model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ==================== FUNCIONES PRINCIPALES ====================
 
@@ -176,7 +141,7 @@ Detect if this scenario triggers deeper philosophical implications.
 Output JSON as specified in your system instruction.
 """
         
-        response = model.generate_content(prompt)
+        response = _model().generate_content(prompt)
         
         # Parse response
         raw_text = response.text.strip()
@@ -317,11 +282,11 @@ OUTPUT JSON:
     "convergencia": int,
     "veredicto_final": str,
     "justificacion_final": "explicación",
-    {"\"entropia_causal\": {{" if enable_entropia else ""}
-        {"\"cr_score\": int," if enable_entropia else ""}
-        {"\"futuros_colapsados_count\": int," if enable_entropia else ""}
-        {"\"irreversibilidad\": int," if enable_entropia else ""}
-        {"\"clasificacion\": str" if enable_entropia else ""}
+    {'"entropia_causal": {{' if enable_entropia else ""}
+        {'"cr_score": int,' if enable_entropia else ""}
+        {'"futuros_colapsados_count": int,' if enable_entropia else ""}
+        {'"irreversibilidad": int,' if enable_entropia else ""}
+        {'"clasificacion": str' if enable_entropia else ""}
     {"}," if enable_entropia else ""}
     "alarma": {{
         "nivel": str,
@@ -331,7 +296,7 @@ OUTPUT JSON:
 }}
 """
         
-        response = model.generate_content(prompt)
+        response = _model().generate_content(prompt)
         
         # Parse response
         raw_text = response.text.strip()
@@ -364,6 +329,8 @@ OUTPUT JSON:
 
 def ejecutar_auditoria_maestra(input_path, output_path):
     """Batch processing for CSV of scenarios"""
+    import pandas as pd
+    
     try:
         df = pd.read_csv(input_path)
         
@@ -376,9 +343,9 @@ def ejecutar_auditoria_maestra(input_path, output_path):
         for idx, row in df.iterrows():
             scenario = row['Scenario']
             
-            response = model.generate_content(f"Analyze: {scenario}")
-            
             try:
+                # A failed call only loses its row, not the whole batch
+                response = _model().generate_content(f"Analyze: {scenario}")
                 raw_text = response.text.strip()
                 if "```json" in raw_text:
                     raw_text = raw_text.split("```json")[1].split("```")[0].strip()
@@ -429,19 +396,22 @@ def ejecutar_auditoria_maestra(input_path, output_path):
         return {"error": f"Batch processing failed: {str(e)}"}
 
 
+_emergent_index = LogIndex("emergent_philosophy_log.jsonl",
+                           distinct={"categories": lambda e: e.get("category", "Unknown")})
+
+
 def get_emergent_philosophy_stats():
     """Returns statistics on emergent philosophy events"""
-    try:
-        with open("emergent_philosophy_log.jsonl", "r", encoding="utf-8") as f:
-            events = [json.loads(line) for line in f]
-        
-        return {
-            "total_events": len(events),
-            "recent_events": events[-5:] if len(events) >= 5 else events,
-            "categories": list(set(e.get("category", "Unknown") for e in events))
-        }
-    except FileNotFoundError:
+    get_sink("emergent_philosophy_log.jsonl").flush()
+    index = _emergent_index.refresh()
+    if not index["lines"]:
         return {"total_events": 0, "recent_events": [], "categories": []}
+    
+    return {
+        "total_events": index["lines"],
+        "recent_events": _emergent_index.tail(5),
+        "categories": list(index["distinct"]["categories"])
+    }
 
 
 def _log_emergent_event(scenario, analysis_data):
@@ -461,5 +431,4 @@ def _log_emergent_event(scenario, analysis_data):
         )
     }
     
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    get_sink(log_file).write_json(event)
@@ -10,6 +10,80 @@ Divine Modal Criteria:
 5. Formal justification (not subjective "feels good")
 """
 
+import re
+from typing import Dict, Iterable, Union
+
+from scenario_features import ScenarioFeatures
+
+
+class MarkerMatcher:
+    """
+    Compiled multi-marker matcher: one regex pass, whole words only.
+    
+    Markers are given as plain phrases or as {name: pattern} where the
+    pattern spells out accepted inflections (e.g. 'heal(s|ed|ing)?'), so a
+    short marker like 'base' no longer matches inside 'database'.
+    
+    Both checks go through ScenarioFeatures, so results on a text are
+    memoized with the other auditors' and computed once.
+    """
+    
+    def __init__(self, markers: Union[Dict[str, str], Iterable[str]]):
+        if not isinstance(markers, dict):
+            markers = {marker: re.escape(marker) for marker in markers}
+        self.names = list(markers)
+        alternatives = []
+        for i, pattern in enumerate(markers.values()):
+            # Phrases tolerate any whitespace between their words
+            pattern = pattern.replace(r"\ ", " ").replace(" ", r"\s+")
+            alternatives.append(f"(?P<m{i}>{pattern})")
+        self.pattern = r"\b(?:" + "|".join(alternatives) + r")\b"
+        self._regex = re.compile(self.pattern, re.IGNORECASE)
+    
+    def find(self, scenario: Union[str, ScenarioFeatures]) -> Dict[str, int]:
+        """Matched markers with their number of occurrences (one memoized pass)"""
+        counts = ScenarioFeatures.of(scenario).group_counts(self._regex)
+        return {self.names[int(group[1:])]: n for group, n in counts.items()}
+    
+    def search(self, scenario: Union[str, ScenarioFeatures]) -> bool:
+        """Whether any marker is present (one memoized pass)"""
+        return ScenarioFeatures.of(scenario).matches(self.pattern, re.IGNORECASE)
+
+
+# Active elevation of vulnerability infrastructure
+ELEVATION_MARKERS = MarkerMatcher({
+    'elevate': 'elevat(e|es|ed|ing)', 'elevación': 'elevación',
+    'improve': 'improv(e|es|ed|ing|ement|ements)', 'mejora': 'mejora(s|r|n|do|da)?',
+    'enhance': 'enhanc(e|es|ed|ing|ement)', 'potencia': 'potencia(r|n|do|da)?',
+    'strengthen': 'strengthen(s|ed|ing)?', 'fortalece': 'fortalece(r|n)?',
+    'empower': 'empower(s|ed|ing|ment)?', 'empodera': 'empodera(r|n|do|da)?',
+    'enable': 'enabl(e|es|ed|ing)', 'habilita': 'habilita(r|n|do|da)?',
+    'expand capacity': 'expand(s|ed|ing)? capacit(y|ies)',
+    'expande capacidad': 'expande(n)? capacidad(es)?',
+    'increase agency': 'increas(e|es|ed|ing) agency',
+    'incrementa agencia': 'incrementa(r|n)? (la )?agencia',
+    'heal': 'heal(s|ed|ing)?', 'sana': 'sana(r|n|do|da)?',
+    'restore': 'restor(e|es|ed|ing)', 'restaura': 'restaura(r|n|do|da)?',
+    'uplift': 'uplift(s|ed|ing)?', 'eleva': 'eleva(r|n|do|da)?',
+    'transcend': 'transcend(s|ed|ing)?', 'trasciende': 'trasciende(n)?',
+})
+
+# Cascading positive effects (helping one agent enables others)
+CASCADE_MARKERS = MarkerMatcher({
+    'cascade': 'cascad(e|es|ing)', 'cascada': 'cascadas?',
+    'ripple': 'ripples?', 'onda': 'ondas?',
+    'enable others': 'enabl(e|es|ing) others', 'habilita otros': 'habilita(r|n)? (a )?otros',
+    'multiplica': 'multiplica(r|n)?',
+    'systemic improvement': 'systemic improvements?', 'mejora sistémica': 'mejoras? sistémicas?',
+    'infrastructure': 'infrastructures?', 'infraestructura': 'infraestructuras?',
+    'foundation': 'foundations?', 'fundamento': 'fundamentos?', 'base': 'bases?',
+    'future capacity': 'future capacit(y|ies)', 'capacidad futura': 'capacidad(es)? futuras?',
+    'enables more': 'enables more', 'permite más': 'permite(n)? más',
+    'positive feedback': 'positive feedback', 'retroalimentación positiva': 'retroalimentación positiva',
+    'virtuous circle': 'virtuous (circle|cycle)s?', 'círculo virtuoso': 'círculos? virtuosos?',
+})
+
+
 class NobleEngine:
     def __init__(self):
         self.divine_threshold = 95
@@ -97,57 +171,98 @@ class NobleEngine:
             )
         }
     
-    def _detects_active_elevation(self, analysis):
+    def evaluate_elevation_many(self, df, columns=None):
         """
-        Checks if scenario actively elevates vulnerability infrastructure.
-        Not just "doesn't harm" but "actively improves."
+        Scores a whole results DataFrame at once (one analysis per row).
+        
+        Args:
+            df: DataFrame with the analysis fields as columns
+            columns: Optional mapping analysis key → column name, e.g.
+                {'agency_score': 'Agency_Score'}; missing columns take the
+                same defaults as evaluate_elevation
+            
+        Returns:
+            DataFrame aligned with df.index with base_score,
+            transcendence_score, elevation_detected, divine_modal and one
+            boolean column per criterion (same values as evaluate_elevation)
         """
-        justification = analysis.get('justification', '').lower()
-        predictions = analysis.get('predictions', '').lower()
-        architect_notes = analysis.get('architect_notes', '').lower()
+        import pandas as pd
+        
+        names = {key: key for key in (
+            'agency_score', 'grace_score', 'adversarial_risk',
+            'justification', 'predictions', 'architect_notes'
+        )}
+        names.update(columns or {})
         
-        elevation_markers = [
-            'elevate', 'elevación', 'improve', 'mejora',
-            'enhance', 'potencia', 'strengthen', 'fortalece',
-            'empower', 'empodera', 'enable', 'habilita',
-            'expand capacity', 'expande capacidad',
-            'increase agency', 'incrementa agencia',
-            'heal', 'sana', 'restore', 'restaura',
-            'uplift', 'eleva', 'transcend', 'trasciende'
-        ]
+        def numeric(key, default):
+            column = names[key]
+            if column in df.columns:
+                return pd.to_numeric(df[column], errors='coerce')
+            return pd.Series(default, index=df.index, dtype=float)
         
-        combined_text = f"{justification} {predictions} {architect_notes}"
+        def text(key):
+            column = names[key]
+            if column in df.columns:
+                return df[column].fillna('').astype(str)
+            return pd.Series('', index=df.index)
         
-        # Count markers found
-        markers_found = sum(1 for marker in elevation_markers if marker in combined_text)
+        base_score = numeric('agency_score', 0) * 0.45 + numeric('grace_score', 0) * 0.55
+        high_preservation = base_score >= self.elevation_criteria['agency_preservation']
+        low_adversarial = numeric('adversarial_risk', 100) < self.elevation_criteria['adversarial_risk_max']
+        
+        cascade_text = text('justification') + " " + text('predictions')
+        elevation_text = cascade_text + " " + text('architect_notes')
+        active_elevation = pd.Series(
+            [len(ELEVATION_MARKERS.find(t)) >= 2 for t in elevation_text], index=df.index
+        )
+        positive_cascade = pd.Series(
+            [CASCADE_MARKERS.search(t) for t in cascade_text], index=df.index
+        )
+        
+        transcendence_score = (
+            25 * high_preservation.astype(int) + 20 * low_adversarial.astype(int) +
+            30 * active_elevation.astype(int) + 25 * positive_cascade.astype(int)
+        )
+        divine_modal = (
+            (transcendence_score >= self.divine_threshold) &
+            high_preservation & low_adversarial & active_elevation & positive_cascade &
+            (base_score >= self.divine_threshold)
+        )
+        
+        return pd.DataFrame({
+            "elevation_detected": active_elevation,
+            "divine_modal": divine_modal,
+            "transcendence_score": transcendence_score,
+            "base_score": base_score,
+            "high_preservation": high_preservation,
+            "low_adversarial": low_adversarial,
+            "active_elevation": active_elevation,
+            "positive_cascade": positive_cascade,
+        }, index=df.index)
+    
+    def _detects_active_elevation(self, analysis):
+        """
+        Checks if scenario actively elevates vulnerability infrastructure.
+        Not just "doesn't harm" but "actively improves."
+        """
+        combined_text = " ".join(
+            analysis.get(key, '') for key in ('justification', 'predictions', 'architect_notes')
+        )
         
         # Require at least 2 different markers for genuine elevation
-        return markers_found >= 2
+        return len(ELEVATION_MARKERS.find(combined_text)) >= 2
     
     def _detects_cascade_positive(self, analysis):
         """
         Checks for cascading positive effects.
         Helping one agent enables others (multiplicative good).
         """
-        justification = analysis.get('justification', '').lower()
-        predictions = analysis.get('predictions', '').lower()
-        
-        cascade_markers = [
-            'cascade', 'cascada', 'ripple', 'onda',
-            'enable others', 'habilita otros', 'multiplica',
-            'systemic improvement', 'mejora sistémica',
-            'infrastructure', 'infraestructura',
-            'foundation', 'fundamento', 'base',
-            'future capacity', 'capacidad futura',
-            'enables more', 'permite más',
-            'positive feedback', 'retroalimentación positiva',
-            'virtuous circle', 'círculo virtuoso'
-        ]
-        
-        combined_text = f"{justification} {predictions}"
+        combined_text = " ".join(
+            analysis.get(key, '') for key in ('justification', 'predictions')
+        )
         
         # Require explicit cascade language
-        return any(marker in combined_text for marker in cascade_markers)
+        return CASCADE_MARKERS.search(combined_text)
     
     def _build_justification(self, score, divine, elevated, criteria):
         """
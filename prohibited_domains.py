@@ -14,10 +14,26 @@ This prevents adversaries from forcing the system into self-destruction
 by requesting prohibited content.
 """
 
+import os
 import re
-from typing import Dict, Optional, List
+import mmap
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, List, Iterable, Iterator, NamedTuple, Union
 from dataclasses import dataclass
 
+from linear_patterns import compile_pattern
+from scenario_features import ScenarioFeatures
+
+
+class ProhibitedHit(NamedTuple):
+    """Compact batch screening record (only prohibited items are reported)."""
+    index: int                     # position in the input stream / line number
+    domain: str
+    offset: Optional[int] = None   # byte offset of the line (file input only)
+    length: Optional[int] = None   # byte length of the line (file input only)
+
 
 @dataclass
 class ProhibitedDomainMatch:
@@ -113,40 +129,118 @@ class ProhibitedDomainsLayer:
                 "technical_reason": "Cyberweapons domain: prohibited by security protocol and potential for mass harm."
             }
         }
+        
+        self._compile_domains()
     
-    def check_prohibited(self, text: str) -> ProhibitedDomainMatch:
+    def _compile_domains(self):
         """
-        Check if text falls into prohibited domain.
+        Precompile all detection patterns once.
         
-        Returns immediately on first match - NO SCORING, NO REASONING.
-        This is intentionally fast and simple.
+        Every pattern is compiled a single time into a linear-time matcher
+        (see linear_patterns), so long adversarial inputs cannot trigger
+        catastrophic backtracking. Patterns of the usual shape
+        ``\\b(word|other words|...)\\b...`` also get a token prefilter: the
+        pattern can only match if some token of the text starts with one of
+        its leading words, so a single tokenization pass decides which
+        patterns actually need to run.
         """
-        text_lower = text.lower()
-        
-        # Check each prohibited domain
+        # IGNORECASE is kept on purpose: besides ASCII case it folds 'ſ',
+        # 'ı' and 'K' onto ASCII letters, which str.lower() does not.
+        self._compiled_domains = []    # (domain, [(pattern, prefilter)], keywords)
         for domain_name, domain_config in self.prohibited_domains.items():
-            
-            # Check regex patterns
+            patterns = []
             for pattern in domain_config["patterns"]:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return ProhibitedDomainMatch(
-                        is_prohibited=True,
-                        domain=domain_name,
-                        risk_level=100,
-                        rejection_message=domain_config["rejection"],
-                        technical_justification=domain_config["technical_reason"]
-                    )
-            
-            # Check keyword combinations
-            keyword_matches = sum(1 for kw in domain_config["keywords"] if kw in text_lower)
-            if keyword_matches >= 2:
-                return ProhibitedDomainMatch(
-                    is_prohibited=True,
-                    domain=domain_name,
-                    risk_level=100,
-                    rejection_message=domain_config["rejection"],
-                    technical_justification=domain_config["technical_reason"]
-                )
+                compile_pattern(pattern, re.IGNORECASE)     # warm the shared cache
+                patterns.append((pattern, self._leading_words(pattern)))
+            self._compiled_domains.append(
+                (domain_name, patterns, tuple(domain_config["keywords"]))
+            )
+    
+    @staticmethod
+    def _leading_words(pattern: str) -> Optional[List[tuple]]:
+        """
+        Extract (word, exact) pairs from a leading ``\\b(alt|alt)`` group.
+        
+        exact=True means the token must equal the word; exact=False means
+        the token must start with it. Returns None when the pattern has no
+        simple leading group (it then always runs).
+        """
+        if not pattern.startswith(r"\b("):
+            return None
+        end = pattern.find(")", 3)
+        group = pattern[3:end]
+        if end < 0 or "(" in group or "\\" in group:
+            return None
+        bounded = pattern[end + 1:].startswith(r"\b")
+        
+        words = []
+        for alt in group.split("|"):
+            m = re.match(r"[a-z0-9]+", alt.lower())
+            if not m:
+                return None
+            word, rest = m.group(), alt[m.end():]
+            if rest[:1] in ("?", "*", "{"):
+                word, exact = word[:-1], False
+            elif rest == "":
+                exact = bounded
+            elif rest[0] == " ":
+                exact = rest[1:2] not in ("?", "*", "{")
+            else:
+                exact = False
+            if not word:
+                return None
+            words.append((word, exact))
+        return words
+    
+    @staticmethod
+    def _may_match(words: Optional[List[tuple]], tokens: set) -> bool:
+        """Token prefilter: False only when the pattern cannot match."""
+        if words is None:
+            return True
+        return any(
+            (word in tokens) if exact else any(t.startswith(word) for t in tokens)
+            for word, exact in words
+        )
+    
+    def _scan(self, features: ScenarioFeatures, first_only: bool = False) -> List[str]:
+        """
+        Return the prohibited domains hit by the text, in declaration order.
+        
+        The shared tokenization feeds the prefilter; a pattern only runs when
+        its leading words are present. With first_only, stops at the first hit.
+        """
+        tokens = features.tokens
+        
+        hits = []
+        for domain_name, patterns, keywords in self._compiled_domains:
+            if any(self._may_match(words, tokens) and features.matches(pattern, re.IGNORECASE)
+                   for pattern, words in patterns) \
+                    or features.count(keywords) >= 2:
+                hits.append(domain_name)
+                if first_only:
+                    break
+        return hits
+    
+    def _build_match(self, domain_name: str) -> ProhibitedDomainMatch:
+        domain_config = self.prohibited_domains[domain_name]
+        return ProhibitedDomainMatch(
+            is_prohibited=True,
+            domain=domain_name,
+            risk_level=100,
+            rejection_message=domain_config["rejection"],
+            technical_justification=domain_config["technical_reason"]
+        )
+    
+    def check_prohibited(self, text: Union[str, ScenarioFeatures]) -> ProhibitedDomainMatch:
+        """
+        Check if text falls into prohibited domain.
+        
+        Returns the first prohibited domain (declaration order) - NO SCORING,
+        NO REASONING. This is intentionally fast and simple.
+        """
+        hits = self._scan(ScenarioFeatures.of(text), first_only=True)
+        if hits:
+            return self._build_match(hits[0])
         
         # Not prohibited - safe to proceed to moral evaluation
         return ProhibitedDomainMatch(
@@ -154,6 +248,81 @@ class ProhibitedDomainsLayer:
             risk_level=0
         )
     
+    def find_all(self, text: Union[str, ScenarioFeatures]) -> List[ProhibitedDomainMatch]:
+        """
+        Return a match for EVERY prohibited domain the text falls into.
+        
+        Same single scan as check_prohibited; useful for audit logs.
+        """
+        return [self._build_match(d) for d in self._scan(ScenarioFeatures.of(text))]
+    
+    def check_prohibited_batch(self,
+                               texts: Iterable[str],
+                               workers: Optional[int] = None,
+                               chunk_size: int = 1024) -> Iterator[ProhibitedHit]:
+        """
+        Screen a stream of texts, yielding a ProhibitedHit per blocked text.
+        
+        Texts are consumed lazily in chunks of `chunk_size` and spread over a
+        process pool of `workers` (default: CPU count; 1 = in-process). Each
+        worker compiles the matcher once. Hits come out in input order.
+        """
+        numbered = enumerate(texts)
+        chunks = iter(lambda: list(itertools.islice(numbered, chunk_size)), [])
+        for hits in self._run_ordered(_screen_texts, ((c,) for c in chunks), workers):
+            for index, domain in hits:
+                yield ProhibitedHit(index, domain)
+    
+    def check_prohibited_file(self,
+                              path: str,
+                              workers: Optional[int] = None,
+                              chunk_bytes: int = 8 * 1024 * 1024,
+                              encoding: str = "utf-8") -> Iterator[ProhibitedHit]:
+        """
+        Screen a newline-delimited file (prompt logs, CSV rows) via mmap.
+        
+        The file is cut into ~`chunk_bytes` ranges on line boundaries; each
+        worker maps the file itself, so no text crosses process boundaries.
+        Hits carry the line number plus the byte offset/length of the line.
+        """
+        size = os.path.getsize(path)
+        if size == 0:
+            return
+        
+        def ranges():
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                while start < size:
+                    end = mm.find(b"\n", min(start + chunk_bytes, size))
+                    end = size if end < 0 else end + 1
+                    yield (path, start, end, encoding)
+                    start = end
+        
+        line_base = 0
+        for line_count, hits in self._run_ordered(_screen_file_range, ranges(), workers):
+            for line, domain, offset, length in hits:
+                yield ProhibitedHit(line_base + line, domain, offset, length)
+            line_base += line_count
+    
+    def _run_ordered(self, task, args_iter, workers: Optional[int]) -> Iterator:
+        """Run task(layer, *args) over args_iter, bounded in flight, in order."""
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for args in args_iter:
+                yield task(self, *args)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.prohibited_domains,)) as pool:
+            pending = deque()
+            for args in args_iter:
+                pending.append(pool.submit(_pool_task, task, *args))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
     def generate_rejection_response(self, match: ProhibitedDomainMatch) -> Dict:
         """
         Generate a simple rejection response.
@@ -216,6 +385,54 @@ class ProhibitedDomainsLayer:
             return []
 
 
+# ==================== BATCH WORKERS ====================
+# Top-level so they can be pickled into worker processes.
+
+_worker_layer: Optional[ProhibitedDomainsLayer] = None
+
+
+def _init_worker(prohibited_domains: Dict):
+    """Build the precompiled layer once per worker process."""
+    global _worker_layer
+    _worker_layer = ProhibitedDomainsLayer()
+    if prohibited_domains != _worker_layer.prohibited_domains:
+        _worker_layer.prohibited_domains = prohibited_domains
+        _worker_layer._compile_domains()
+
+
+def _pool_task(task, *args):
+    return task(_worker_layer, *args)
+
+
+def _screen_texts(layer: ProhibitedDomainsLayer, chunk: List[tuple]) -> List[tuple]:
+    hits = []
+    for index, text in chunk:
+        domains = layer._scan(ScenarioFeatures(text), first_only=True)
+        if domains:
+            hits.append((index, domains[0]))
+    return hits
+
+
+def _screen_file_range(layer: ProhibitedDomainsLayer, path: str,
+                       start: int, end: int, encoding: str) -> tuple:
+    """Screen lines in [start, end); returns (line_count, hits)."""
+    hits = []
+    line = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            nl = end if nl < 0 else nl
+            if nl > pos:
+                text = mm[pos:nl].decode(encoding, errors="replace")
+                domains = layer._scan(ScenarioFeatures(text), first_only=True)
+                if domains:
+                    hits.append((line, domains[0], pos, nl - pos))
+            line += 1
+            pos = nl + 1
+    return line, hits
+
+
 # Test suite
 if __name__ == "__main__":
     layer = ProhibitedDomainsLayer()
@@ -263,3 +480,43 @@ if __name__ == "__main__":
             print(f"Domain: {result.domain}")
             print(f"Rejection: {result.rejection_message}")
         print()
+    
+    # Batch screening (same verdicts, compact records)
+    hits = list(layer.check_prohibited_batch((t["text"] for t in test_cases), workers=2))
+    print(f"Batch screening: {len(hits)} prohibited of {len(test_cases)} -> {hits}\n")
+    
+    # Microbenchmark: compiled engine vs. per-call re.search loop on 10 KB inputs
+    import time
+    
+    def legacy_check(text: str) -> Optional[str]:
+        text_lower = text.lower()
+        for domain_name, domain_config in layer.prohibited_domains.items():
+            for pattern in domain_config["patterns"]:
+                if re.search(pattern, text_lower, re.IGNORECASE):
+                    return domain_name
+            if sum(1 for kw in domain_config["keywords"] if kw in text_lower) >= 2:
+                return domain_name
+        return None
+    
+    benign = ("The trolley problem asks whether one should divert a runaway tram. " * 160)[:10240]
+    inputs = {
+        "benign 10KB": benign,
+        "blocked 10KB (late hit)": benign[:10000] + " design ransomware to deploy",
+    }
+    
+    print("=" * 60)
+    print("MICROBENCHMARK (mean of 200 runs)")
+    print("=" * 60)
+    for label, text in inputs.items():
+        assert legacy_check(text) == layer.check_prohibited(text).domain
+        timings = {}
+        # fresh ScenarioFeatures per run: measure the scan, not the LRU
+        compiled = lambda t: layer.check_prohibited(ScenarioFeatures(t))
+        for name, fn in (("legacy", legacy_check), ("compiled", compiled)):
+            start = time.perf_counter()
+            for _ in range(200):
+                fn(text)
+            timings[name] = (time.perf_counter() - start) / 200 * 1000
+        print(f"{label:26s} legacy {timings['legacy']:.3f} ms | "
+              f"compiled {timings['compiled']:.3f} ms | "
+              f"x{timings['legacy'] / timings['compiled']:.1f}")
@@ -2,6 +2,23 @@
 import pandas as pd
 from datetime import datetime
 import json
+import os
+import sqlite3
+
+# Patterns whose percentage is kept as a per-session trend series
+TREND_PATTERNS = ("emergent_philosophy", "friction_zones")
+# Most recent sessions returned per trend by get_learning_summary
+TREND_WINDOW = 50
+
+# Report columns read by analizar_evolucion (None = let pandas infer)
+REPORT_COLUMNS = {
+    'Originality': 'float64',
+    'Verdict': 'object',
+    'Grace_Score': 'float64',
+    'Emergent_Philosophy': None,
+    'Adversarial_Risk': 'float64',
+}
+REPORT_CHUNK_ROWS = 100000
 
 class RecursionEngine:
     """
@@ -12,57 +29,149 @@ class RecursionEngine:
     - Framework stress points
     """
     
-    def __init__(self):
+    def __init__(self, memory_db="pattern_memory.db"):
         self.evolution_log = "metacognition_log.txt"
+        # Legacy JSON memory: imported once into the session store
         self.pattern_memory = "pattern_memory.json"
+        self.memory_db = memory_db
+        self._schema_ready = False
+    
+    def _connect(self):
+        """
+        Append-only session store. Each session is one transaction (a crash
+        never corrupts earlier history); totals are kept by a trigger and
+        trend points are indexed, so summaries never rescan the sessions.
+        """
+        conn = sqlite3.connect(self.memory_db)
+        if not self._schema_ready:
+            self._init_db(conn)
+            self._schema_ready = True
+        return conn
+    
+    def _init_db(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                total_cases INTEGER NOT NULL,
+                analysis TEXT NOT NULL
+            );
+            
+            CREATE TABLE IF NOT EXISTS trend_points (
+                pattern TEXT NOT NULL,
+                session_id INTEGER NOT NULL,
+                percentage REAL NOT NULL,
+                PRIMARY KEY (pattern, session_id)
+            );
+            
+            CREATE TABLE IF NOT EXISTS summary (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_sessions INTEGER NOT NULL,
+                total_cases INTEGER NOT NULL
+            );
+            
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            
+            CREATE TRIGGER IF NOT EXISTS trg_summary_sessions
+            AFTER INSERT ON sessions
+            BEGIN
+                INSERT INTO summary (id, total_sessions, total_cases)
+                VALUES (1, 1, NEW.total_cases)
+                ON CONFLICT(id) DO UPDATE SET
+                    total_sessions = total_sessions + 1,
+                    total_cases = total_cases + excluded.total_cases;
+            END;
+        """)
+        
+        # Exclusive lock: concurrent first runs must not import twice
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            imported = conn.execute(
+                "SELECT value FROM meta WHERE key = 'legacy_imported'"
+            ).fetchone()
+            if imported is None:
+                try:
+                    with open(self.pattern_memory, "r") as f:
+                        legacy_sessions = json.load(f).get("sessions", [])
+                except FileNotFoundError:
+                    legacy_sessions = []
+                for session in legacy_sessions:
+                    self._insert_session(conn, session)
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                    (str(len(legacy_sessions)),)
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def _insert_session(self, conn, analysis):
+        cursor = conn.execute(
+            "INSERT INTO sessions (timestamp, total_cases, analysis) VALUES (?, ?, ?)",
+            (analysis.get("timestamp", ""), analysis.get("total_cases", 0), json.dumps(analysis))
+        )
+        patterns = analysis.get("patterns", {})
+        conn.executemany(
+            "INSERT INTO trend_points (pattern, session_id, percentage) VALUES (?, ?, ?)",
+            [(name, cursor.lastrowid, patterns[name].get("percentage", 0))
+             for name in TREND_PATTERNS if name in patterns]
+        )
     
-    def analizar_evolucion(self, report_path):
+    def analizar_evolucion(self, report_path, chunksize=REPORT_CHUNK_ROWS):
         """
         Analyzes evolutionary report for patterns requiring system recalibration.
+        
+        The report is streamed in chunks of `chunksize` rows, reading only the
+        columns the patterns need, so memory does not grow with report size.
         """
         try:
-            df = pd.read_csv(report_path)
+            total, counts = self._count_report_patterns(report_path, chunksize)
             
             analysis = {
                 "timestamp": datetime.now().isoformat(),
-                "total_cases": len(df),
+                "total_cases": total,
                 "patterns": {}
             }
             
             # 1. Ontological Novelty (pattern rupture)
-            if 'Originality' in df.columns:
-                novedades = df[df['Originality'] > 90]
+            if 'high_novelty' in counts:
+                novedades = counts['high_novelty']
                 analysis['patterns']['high_novelty'] = {
-                    "count": len(novedades),
-                    "percentage": (len(novedades) / len(df)) * 100,
-                    "recommendation": "Expand grace axioms for new creativity forms" if len(novedades) > len(df) * 0.1 else "Current axioms sufficient"
+                    "count": novedades,
+                    "percentage": (novedades / total) * 100,
+                    "recommendation": "Expand grace axioms for new creativity forms" if novedades > total * 0.1 else "Current axioms sufficient"
                 }
             
             # 2. Friction Detection (logical OK but low grace)
-            if 'Verdict' in df.columns and 'Grace_Score' in df.columns:
-                friccion = df[(df['Verdict'] == 'Authorized') & (df['Grace_Score'] < 40)]
+            if 'friction_zones' in counts:
+                friccion = counts['friction_zones']
                 analysis['patterns']['friction_zones'] = {
-                    "count": len(friccion),
-                    "percentage": (len(friccion) / len(df)) * 100,
-                    "recommendation": "Tighten sandbox threshold in social contexts" if len(friccion) > 0 else "Grace calibration optimal"
+                    "count": friccion,
+                    "percentage": (friccion / total) * 100,
+                    "recommendation": "Tighten sandbox threshold in social contexts" if friccion > 0 else "Grace calibration optimal"
                 }
             
             # 3. Emergent Philosophy Frequency
-            if 'Emergent_Philosophy' in df.columns:
-                emergent = df[df['Emergent_Philosophy'] == True]
+            if 'emergent_philosophy' in counts:
+                emergent = counts['emergent_philosophy']
                 analysis['patterns']['emergent_philosophy'] = {
-                    "count": len(emergent),
-                    "percentage": (len(emergent) / len(df)) * 100,
-                    "significance": "High" if len(emergent) > len(df) * 0.05 else "Normal"
+                    "count": emergent,
+                    "percentage": (emergent / total) * 100,
+                    "significance": "High" if emergent > total * 0.05 else "Normal"
                 }
             
             # 4. Adversarial Pattern Detection
-            if 'Adversarial_Risk' in df.columns:
-                high_risk = df[df['Adversarial_Risk'] > 60]
+            if 'adversarial_attempts' in counts:
+                high_risk = counts['adversarial_attempts']
                 analysis['patterns']['adversarial_attempts'] = {
-                    "count": len(high_risk),
-                    "percentage": (len(high_risk) / len(df)) * 100,
-                    "recommendation": "Maintain current adversarial detection" if len(high_risk) < len(df) * 0.1 else "Increase screening sensitivity"
+                    "count": high_risk,
+                    "percentage": (high_risk / total) * 100,
+                    "recommendation": "Maintain current adversarial detection" if high_risk < total * 0.1 else "Increase screening sensitivity"
                 }
             
             # Log to file
@@ -79,17 +188,9 @@ class RecursionEngine:
                         f.write(f"  Recommendation: {pattern_data['recommendation']}\n")
                     f.write("\n")
             
-            # Save pattern memory
-            try:
-                with open(self.pattern_memory, "r") as f:
-                    memory = json.load(f)
-            except FileNotFoundError:
-                memory = {"sessions": []}
-            
-            memory["sessions"].append(analysis)
-            
-            with open(self.pattern_memory, "w") as f:
-                json.dump(memory, f, indent=2)
+            # Save pattern memory (one atomic append)
+            with self._connect() as conn:
+                self._insert_session(conn, analysis)
             
             return {
                 "success": True,
@@ -100,35 +201,76 @@ class RecursionEngine:
         except Exception as e:
             return {"error": f"Recursive phase error: {e}"}
     
-    def get_learning_summary(self):
+    def _count_report_patterns(self, report_path, chunksize):
+        """
+        One pass over the report with running counters.
+        Returns (total rows, {pattern: count}) for the patterns whose
+        columns are present.
+        """
+        header = list(pd.read_csv(report_path, nrows=0).columns)
+        columns = set(header)
+        usecols = [c for c in REPORT_COLUMNS if c in columns]
+        if not usecols and header:
+            # No pattern column: still count the rows
+            usecols = header[:1]
+        dtypes = {c: REPORT_COLUMNS[c] for c in usecols if REPORT_COLUMNS.get(c)}
+        
+        counts = {}
+        if 'Originality' in columns:
+            counts['high_novelty'] = 0
+        if 'Verdict' in columns and 'Grace_Score' in columns:
+            counts['friction_zones'] = 0
+        if 'Emergent_Philosophy' in columns:
+            counts['emergent_philosophy'] = 0
+        if 'Adversarial_Risk' in columns:
+            counts['adversarial_attempts'] = 0
+        
+        total = 0
+        for chunk in pd.read_csv(report_path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+            total += len(chunk)
+            if 'high_novelty' in counts:
+                counts['high_novelty'] += int((chunk['Originality'] > 90).sum())
+            if 'friction_zones' in counts:
+                counts['friction_zones'] += int(
+                    ((chunk['Verdict'] == 'Authorized') & (chunk['Grace_Score'] < 40)).sum()
+                )
+            if 'emergent_philosophy' in counts:
+                counts['emergent_philosophy'] += int((chunk['Emergent_Philosophy'] == True).sum())
+            if 'adversarial_attempts' in counts:
+                counts['adversarial_attempts'] += int((chunk['Adversarial_Risk'] > 60).sum())
+        
+        return total, counts
+    
+    def get_learning_summary(self, trend_window=TREND_WINDOW):
         """
         Returns summary of learning patterns over time.
+        Totals come from the trigger-maintained summary row; trends hold the
+        last `trend_window` sessions (oldest first), read backwards on the
+        (pattern, session_id) key, so the cost does not grow with history.
         """
-        try:
-            with open(self.pattern_memory, "r") as f:
-                memory = json.load(f)
+        if not os.path.exists(self.memory_db) and not os.path.exists(self.pattern_memory):
+            return {"message": "No learning history found"}
+        
+        with self._connect() as conn:
+            totals = conn.execute(
+                "SELECT total_sessions, total_cases FROM summary WHERE id = 1"
+            ).fetchone()
             
-            if not memory.get("sessions"):
+            if not totals or not totals[0]:
                 return {"message": "No learning sessions yet"}
             
-            sessions = memory["sessions"]
-            
-            summary = {
-                "total_sessions": len(sessions),
-                "total_cases_analyzed": sum(s.get("total_cases", 0) for s in sessions),
-                "emergent_philosophy_trend": [
-                    s['patterns'].get('emergent_philosophy', {}).get('percentage', 0)
-                    for s in sessions
-                    if 'emergent_philosophy' in s.get('patterns', {})
-                ],
-                "friction_trend": [
-                    s['patterns'].get('friction_zones', {}).get('percentage', 0)
-                    for s in sessions
-                    if 'friction_zones' in s.get('patterns', {})
-                ]
+            trends = {
+                name: [row[0] for row in conn.execute(
+                    "SELECT percentage FROM trend_points WHERE pattern = ? "
+                    "ORDER BY session_id DESC LIMIT ?",
+                    (name, trend_window)
+                )][::-1]
+                for name in TREND_PATTERNS
             }
-            
-            return summary
-            
-        except FileNotFoundError:
-            return {"message": "No learning history found"}
+        
+        return {
+            "total_sessions": totals[0],
+            "total_cases_analyzed": totals[1],
+            "emergent_philosophy_trend": trends["emergent_philosophy"],
+            "friction_trend": trends["friction_zones"]
+        }
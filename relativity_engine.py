@@ -396,6 +396,214 @@ Interpretation:
         
         return " | ".join(summary) if summary else "Standard context"
 
+    # ==========================================
+    # BATCH / VECTORIZED EVALUATION
+    # ==========================================
+
+    CONTEXT_FIELDS = ('temporal_weight', 'epistemic_certainty', 'capacity_available',
+                      'cultural_variance', 'urgency_factor')
+
+    def evaluate_with_context_many(
+        self,
+        base_harm_scores,
+        contexts,
+        surface: Optional["ResponsibilitySurface"] = None
+    ) -> Dict[str, object]:
+        """
+        Versión vectorizada de evaluate_with_context para muchos contextos
+        
+        Args:
+            base_harm_scores: Escalar o array de scores base (0-100)
+            contexts: Lista de RelativeContext, o mapping/DataFrame con un
+                array por campo de RelativeContext
+            surface: ResponsibilitySurface opcional; si se da, el multiplicador
+                se lee de la rejilla precalculada (error <= surface.error_bound)
+        
+        Returns:
+            Dict de arrays NumPy (una fila por contexto), listo para
+            pd.DataFrame: mismos valores que RelativeEvaluation, con los pesos
+            de dimensión aplanados como weight_<dimensión>. La justificación
+            textual no se genera (usar evaluate_with_context para un caso).
+        """
+        import numpy as np
+        
+        fields = self._context_arrays(contexts)
+        temporal = fields['temporal_weight']
+        epistemic = fields['epistemic_certainty']
+        capacity = fields['capacity_available']
+        cultural = fields['cultural_variance']
+        urgency = fields['urgency_factor']
+        base = np.broadcast_to(np.asarray(base_harm_scores, dtype=float), capacity.shape)
+        
+        should_block = epistemic < self.epistemic_block_threshold
+        if surface is not None:
+            responsibility_mult = surface.lookup(capacity, urgency, temporal, cultural)
+        else:
+            responsibility_mult = self._responsibility_multiplier_many(capacity, urgency, temporal, cultural)
+        uncertainty_penalty = self._uncertainty_penalty_many(epistemic)
+        
+        adjusted = base * responsibility_mult
+        # Cap if too uncertain (min(adjusted, 50.0) semantics)
+        adjusted = np.where(should_block & (50.0 < adjusted), 50.0, adjusted)
+        
+        result = {
+            "base_harm_score": base.copy(),
+            "adjusted_harm_score": adjusted,
+            "responsibility_multiplier": responsibility_mult,
+            "uncertainty_penalty": uncertainty_penalty,
+            "relatividad_type": self._classify_relativity_type_many(fields),
+            "should_block": should_block,
+        }
+        for name, weights in self._dimension_weights_many(fields).items():
+            result[f"weight_{name}"] = weights
+        return result
+    
+    def _context_arrays(self, contexts) -> Dict[str, object]:
+        """Arrays float por campo, validados en [0,1] como RelativeContext"""
+        import numpy as np
+        
+        if hasattr(contexts, "keys"):
+            fields = {name: np.asarray(contexts[name], dtype=float).ravel() for name in self.CONTEXT_FIELDS}
+        else:
+            contexts = list(contexts)
+            fields = {
+                name: np.fromiter((getattr(c, name) for c in contexts), dtype=float, count=len(contexts))
+                for name in self.CONTEXT_FIELDS
+            }
+        fields = dict(zip(self.CONTEXT_FIELDS, np.broadcast_arrays(*fields.values())))
+        
+        for name, values in fields.items():
+            invalid = ~((0 <= values) & (values <= 1))
+            if invalid.any():
+                raise ValueError(f"{name} debe estar entre 0 y 1, got {values[invalid.argmax()]}")
+        return fields
+    
+    def _responsibility_multiplier_many(self, capacity, urgency, temporal, cultural):
+        """_calculate_responsibility_multiplier sobre arrays (mismas operaciones, mismo orden)"""
+        import numpy as np
+        
+        capacity_factor = np.where(
+            capacity > 0.7, 1.0 + (capacity - 0.7) * 1.5,
+            np.where(capacity < 0.3, 0.5 + (capacity / 0.3) * 0.5, 1.0)
+        )
+        urgency_factor = np.where(urgency > 0.8, 0.9, np.where(urgency < 0.2, 1.1, 1.0))
+        temporal_factor = 1.0 - (temporal * 0.1)
+        cultural_factor = 1.0 + (cultural * 0.2)
+        
+        multiplier = capacity_factor * urgency_factor * temporal_factor * cultural_factor
+        return np.clip(multiplier, 0.3, 3.0)
+    
+    def _uncertainty_penalty_many(self, epistemic):
+        """_calculate_uncertainty_penalty sobre arrays"""
+        import numpy as np
+        return np.where(epistemic < 0.3, 0.7, np.where(epistemic < 0.5, 0.85, 1.0))
+    
+    def _classify_relativity_type_many(self, fields):
+        """_classify_relativity_type sobre arrays (empates: gana el primero, como max())"""
+        import numpy as np
+        
+        order = [("CAPACITY", 'capacity_available'), ("EPISTEMIC", 'epistemic_certainty'),
+                 ("URGENCY", 'urgency_factor'), ("TEMPORAL", 'temporal_weight'),
+                 ("CULTURAL", 'cultural_variance')]
+        values = np.stack([fields[name] for _, name in order])
+        dominant = np.abs(values - 0.5).argmax(axis=0)
+        dominant_value = np.take_along_axis(values, dominant[None, :], axis=0)[0]
+        
+        labels = np.array([f"LOW_{label}" for label, _ in order]
+                          + [f"HIGH_{label}" for label, _ in order]
+                          + ["BALANCED_CONTEXT"], dtype=object)
+        codes = np.where(dominant_value < 0.3, dominant,
+                         np.where(dominant_value > 0.7, dominant + len(order), 2 * len(order)))
+        return labels[codes]
+    
+    def _dimension_weights_many(self, fields) -> Dict[str, object]:
+        """_calculate_dimension_weights sobre arrays (suma en el mismo orden)"""
+        import numpy as np
+        
+        weights = {
+            "temporal": fields['temporal_weight'] * self.dimension_base_weights[ContextDimension.TEMPORAL],
+            "epistemic": fields['epistemic_certainty'] * self.dimension_base_weights[ContextDimension.EPISTEMIC],
+            "capacity": fields['capacity_available'] * self.dimension_base_weights[ContextDimension.CAPACITY],
+            "cultural": fields['cultural_variance'] * self.dimension_base_weights[ContextDimension.CULTURAL],
+            "urgency": fields['urgency_factor'] * self.dimension_base_weights[ContextDimension.URGENCY]
+        }
+        total = 0
+        for values in weights.values():
+            total = total + values
+        
+        # Normalize to sum = 1.0 (rows with total 0 keep their raw weights)
+        safe_total = np.where(total > 0, total, 1.0)
+        return {k: np.where(total > 0, v / safe_total, v) for k, v in weights.items()}
+
+
+class ResponsibilitySurface:
+    """
+    Superficie precalculada del multiplicador de responsabilidad
+    
+    Para la UI de sliders: el multiplicador se tabula una vez sobre una
+    rejilla de capacity × temporal × cultural (paso `step`) y las 3 clases de
+    urgencia (<0.2, media, >0.8). `table` sirve directamente para dibujar la
+    superficie completa, y `lookup` interpola (multilineal) fuera de los nodos.
+    Un contexto suelto se calcula igual de rápido directamente; la rejilla
+    evita recalcular la superficie en cada rerun de la UI.
+    
+    Los factores de temporal y cultural son lineales y el de capacidad es
+    lineal a trozos con codos en 0.3 y 0.7, así que la interpolación es exacta
+    (salvo redondeo) cuando los codos caen en nodos de la rejilla (p. ej.
+    step=0.05, el paso de los sliders). Si no, el error está acotado por
+    `error_bound`.
+    """
+    
+    # Capacity factor kinks and the largest change of slope across one
+    CAPACITY_KINKS = (0.3, 0.7)
+    CAPACITY_SLOPE_JUMP = 0.5 / 0.3
+    
+    def __init__(self, engine: Optional[RelativityEngine] = None, step: float = 0.05):
+        import numpy as np
+        
+        self.engine = engine or RelativityEngine()
+        self.intervals = max(1, int(round(1.0 / step)))
+        self.step = 1.0 / self.intervals
+        self.nodes = np.linspace(0.0, 1.0, self.intervals + 1)
+        
+        # One representative urgency per class: <0.2, [0.2, 0.8], >0.8
+        urgency = np.array([0.0, 0.5, 1.0])
+        u, c, t, v = np.meshgrid(urgency, self.nodes, self.nodes, self.nodes, indexing="ij")
+        self.table = self.engine._responsibility_multiplier_many(c, u, t, v)
+        
+        kinks_on_grid = all(abs(k * self.intervals - round(k * self.intervals)) < 1e-9
+                            for k in self.CAPACITY_KINKS)
+        # Linear interpolation across a kink errs at most slope_jump * h / 4,
+        # scaled by the largest product of the other factors (capacity 0.5
+        # has a neutral factor of 1.0)
+        other_factors = float(self.engine._responsibility_multiplier_many(0.5, u, t, v).max())
+        self.error_bound = 1e-12 if kinks_on_grid else self.CAPACITY_SLOPE_JUMP * self.step / 4 * other_factors
+    
+    def lookup(self, capacity, urgency, temporal, cultural):
+        """Multiplicador interpolado (escalares o arrays en [0,1])"""
+        import numpy as np
+        
+        capacity, urgency, temporal, cultural = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (capacity, urgency, temporal, cultural)))
+        urgency_class = np.where(urgency > 0.8, 2, np.where(urgency < 0.2, 0, 1))
+        
+        lows, fractions = [], []
+        for values in (capacity, temporal, cultural):
+            position = np.clip(values, 0.0, 1.0) * self.intervals
+            low = np.minimum(np.floor(position).astype(int), self.intervals - 1)
+            lows.append(low)
+            fractions.append(position - low)
+        
+        result = np.zeros(capacity.shape)
+        for dc in (0, 1):
+            for dt in (0, 1):
+                for dv in (0, 1):
+                    weight = ((fractions[0] if dc else 1 - fractions[0])
+                              * (fractions[1] if dt else 1 - fractions[1])
+                              * (fractions[2] if dv else 1 - fractions[2]))
+                    result += weight * self.table[urgency_class, lows[0] + dc, lows[1] + dt, lows[2] + dv]
+        return result
+
 
 # ==========================================
 # TESTING EXAMPLES
@@ -479,6 +687,48 @@ if __name__ == "__main__":
     print(f"Expected: < 1.0 (reduced responsibility)")
     print(f"✓ PASS" if eval3.responsibility_multiplier < 1.0 else "✗ FAIL")
     
+    # Test 4: Batch evaluation = scalar evaluation, row by row
+    print("\n" + "=" * 80)
+    print("TEST 4: BATCH EVALUATION PARITY + RESPONSIBILITY SURFACE")
+    print("=" * 80)
+    
+    import random
+    import time
+    
+    rnd = random.Random(0)
+    contexts = [
+        RelativeContext(*(rnd.choice([rnd.random(), round(rnd.random() * 20) / 20]) for _ in range(5)))
+        for _ in range(50_000)
+    ]
+    scores = [rnd.random() * 100 for _ in contexts]
+    
+    start = time.perf_counter()
+    scalar = [engine.evaluate_with_context(s, c, "") for s, c in zip(scores, contexts)]
+    scalar_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = engine.evaluate_with_context_many(scores, contexts)
+    batch_time = time.perf_counter() - start
+    
+    same = all(
+        e.adjusted_harm_score == batch["adjusted_harm_score"][i]
+        and e.responsibility_multiplier == batch["responsibility_multiplier"][i]
+        and e.uncertainty_penalty == batch["uncertainty_penalty"][i]
+        and e.relatividad_type == batch["relatividad_type"][i]
+        and e.should_block == batch["should_block"][i]
+        and all(w == batch[f"weight_{k}"][i] for k, w in e.dimension_weights.items())
+        for i, e in enumerate(scalar)
+    )
+    print(f"Contexts: {len(contexts):,} | scalar {scalar_time:.2f}s | batch {batch_time:.3f}s "
+          f"({scalar_time / batch_time:.0f}x)")
+    print(f"✓ PASS (identical results)" if same else "✗ FAIL")
+    
+    surface = ResponsibilitySurface(engine, step=0.05)
+    interpolated = engine.evaluate_with_context_many(scores, contexts, surface=surface)
+    error = abs(interpolated["responsibility_multiplier"] - batch["responsibility_multiplier"]).max()
+    print(f"Surface step {surface.step:.2f}: max error {error:.2e} (bound {surface.error_bound:.2e})")
+    print(f"✓ PASS" if error <= surface.error_bound else "✗ FAIL")
+    
     print("\n" + "=" * 80)
     print("✅ ALL TESTS COMPLETED - Check logic above")
     print("=" * 80)
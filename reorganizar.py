@@ -117,16 +117,13 @@ def reorganize_structure():
     utils = [
         "bridge_debate.py",
         "divine_lock.py",
-        "guilt_bearer_display.py"
+        "guilt_bearer_display.py",
+        "relativity_engine.py"
     ]
     
     for util in utils:
         move_file(util, f"src/utils/{util}")
     
-    # Caso especial: relativity_engine sin extensión
-    if os.path.exists("relativity_engine"):
-        move_file("relativity_engine", "src/utils/relativity_engine.py")
-    
     print("\n📄 PASO 6: Reorganizando pages...")
     print("-" * 60)
     
@@ -0,0 +1,144 @@
+"""
+SCENARIO PRE-ANALYSIS SHARED BY THE PATTERN-BASED AUDITORS
+==========================================================
+
+One scenario text goes through several auditors per request (prohibited
+domains, Divine Lock adversarial auditor and layer, decision classifier,
+noble/humor detectors). Each used to lowercase and rescan the text itself.
+
+ScenarioFeatures does that work once per text:
+
+- lowercases once and tokenizes once (lazily, only if a prefilter needs it)
+- memoizes every pattern verdict (linear-time engine, see linear_patterns)
+- memoizes every keyword containment test
+
+Auditors call ``ScenarioFeatures.of(scenario)``: it accepts the raw text or an
+existing ScenarioFeatures, and recent texts are served from a small LRU, so
+the second auditor looking at the same scenario reuses the first one's hits.
+The LRU is keyed on a digest of the text plus its length (lookups never
+compare whole texts) and texts above CACHE_MAX_CHARS are never cached.
+"""
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Tuple, Union
+
+from linear_patterns import compile_pattern
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+# but that survive str.lower() unchanged
+_CASE_FOLD = str.maketrans({"ı": "i", "ſ": "s"})
+
+# Recent analyses kept, and longest text worth keeping (each entry holds the
+# text twice: original and lowercased)
+CACHE_SIZE = 256
+CACHE_MAX_CHARS = 16 * 1024
+
+
+class ScenarioFeatures:
+    """Lowercased text, tokens and memoized pattern/keyword hits of one scenario."""
+
+    __slots__ = ("text", "lower", "_tokens", "_patterns", "_keywords", "_group_counts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self._tokens = None
+        self._patterns: Dict[Tuple[str, int], bool] = {}
+        self._keywords: Dict[str, bool] = {}
+        self._group_counts: Dict[Tuple[str, int], Dict[str, int]] = {}
+
+    @classmethod
+    def of(cls, scenario: Union[str, "ScenarioFeatures"]) -> "ScenarioFeatures":
+        """Features for a scenario; reuses recent analyses of the same text."""
+        if isinstance(scenario, ScenarioFeatures):
+            return scenario
+        return _cached_features(scenario)
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Word tokens of the lowercased text, case-folded like re.IGNORECASE."""
+        if self._tokens is None:
+            folded = self.lower if self.lower.isascii() else self.lower.translate(_CASE_FOLD)
+            self._tokens = frozenset(_TOKEN_RE.findall(folded))
+        return self._tokens
+
+    def matches(self, pattern: str, flags: int = 0) -> bool:
+        """
+        re.search(pattern, lowercased text) verdict, computed once.
+
+        Screening layers compile their patterns up front, where a non
+        linear-safe pattern is reported; here the fallback is silent.
+        """
+        key = (pattern, flags)
+        hit = self._patterns.get(key)
+        if hit is None:
+            hit = self._patterns[key] = bool(
+                compile_pattern(pattern, flags, warn=False).search(self.lower))
+        return hit
+
+    def group_counts(self, regex: "re.Pattern") -> Dict[str, int]:
+        """
+        Occurrences of each named group of a compiled alternation over the
+        lowercased text (one finditer pass), computed once. Treat as read-only.
+        """
+        key = (regex.pattern, regex.flags)
+        counts = self._group_counts.get(key)
+        if counts is None:
+            counts = {}
+            for match in regex.finditer(self.lower):
+                counts[match.lastgroup] = counts.get(match.lastgroup, 0) + 1
+            self._group_counts[key] = counts
+        return counts
+
+    def contains(self, keyword: str) -> bool:
+        """``keyword in lowercased text``, computed once."""
+        hit = self._keywords.get(keyword)
+        if hit is None:
+            hit = self._keywords[keyword] = keyword in self.lower
+        return hit
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        return any(self.contains(kw) for kw in keywords)
+
+    def count(self, keywords: Iterable[str]) -> int:
+        """Number of the given keywords present in the text."""
+        return sum(1 for kw in keywords if self.contains(kw))
+
+    def first_match(self, patterns: Iterable[str], flags: int = 0):
+        """First pattern (in the given order) that matches, or None."""
+        for pattern in patterns:
+            if self.matches(pattern, flags):
+                return pattern
+        return None
+
+    def __repr__(self):
+        return (f"ScenarioFeatures({self.text[:40]!r}, patterns={len(self._patterns) + len(self._group_counts)}, "
+                f"keywords={len(self._keywords)})")
+
+
+_cache: "OrderedDict[Tuple[bytes, int], ScenarioFeatures]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached_features(text: str) -> ScenarioFeatures:
+    if len(text) > CACHE_MAX_CHARS:
+        return ScenarioFeatures(text)
+    key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), len(text))
+    with _cache_lock:
+        features = _cache.get(key)
+        if features is not None:
+            _cache.move_to_end(key)
+            return features
+    features = ScenarioFeatures(text)
+    with _cache_lock:
+        features = _cache.setdefault(key, features)
+        _cache.move_to_end(key)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return features
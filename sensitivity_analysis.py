@@ -0,0 +1,288 @@
+"""
+SENSITIVITY ANALYSIS OVER THE RELATIVE CONTEXT DIMENSIONS
+=========================================================
+
+Tuning ``dimension_base_weights`` and the thresholds of the relativity engine
+used to mean dragging sliders in RelativityDisplay. This module measures,
+over the whole context space, which of the five RelativeContext dimensions
+drive the engine's outputs:
+
+- ``adjusted_harm_score``: how much of its variance each dimension explains
+- ``should_block``: how often resampling a dimension flips the block decision
+
+Two methods, both evaluated with RelativityEngine.evaluate_with_context_many
+(one vectorized call per study):
+
+- Sobol indices (Saltelli sampling, Saltelli 2010 / Jansen estimators):
+  first-order S1 (effect of the dimension alone) and total ST (including its
+  interactions), with bootstrap confidence intervals
+- Morris screening (elementary effects on a level grid): mu* (overall
+  influence), mu (direction) and sigma (non-linearity / interactions),
+  much cheaper for a first pass
+
+Usage:
+    from relativity_engine import RelativityEngine
+    engine = RelativityEngine()
+    engine.epistemic_block_threshold = 0.35        # candidate tuning
+    study = run_study(engine, samples=100_000)
+    print(format_report(study))
+
+    python sensitivity_analysis.py [samples]
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+from relativity_engine import RelativityEngine
+
+DIMENSIONS = ('temporal_weight', 'epistemic_certainty', 'capacity_available',
+              'cultural_variance', 'urgency_factor')
+
+OUTPUTS = ('adjusted_harm_score', 'should_block')
+
+DEFAULT_BASE_SCORE = 60.0
+SOBOL_SAMPLES = 100_000
+MORRIS_TRAJECTORIES = 2_000
+MORRIS_LEVELS = 4
+BOOTSTRAP_RESAMPLES = 100
+
+Bounds = Dict[str, Tuple[float, float]]
+
+
+def _scale(unit, bounds: Optional[Bounds]):
+    """Map samples in [0,1]^d to the per-dimension bounds (default: all of [0,1])."""
+    import numpy as np
+
+    if not bounds:
+        return unit
+    low = np.array([bounds.get(d, (0.0, 1.0))[0] for d in DIMENSIONS])
+    high = np.array([bounds.get(d, (0.0, 1.0))[1] for d in DIMENSIONS])
+    return low + unit * (high - low)
+
+
+def _evaluate(engine: RelativityEngine, base_score: float, points) -> Dict[str, object]:
+    """Vectorized engine outputs for an (n, 5) array of contexts."""
+    batch = engine.evaluate_with_context_many(
+        base_score, {name: points[:, j] for j, name in enumerate(DIMENSIONS)})
+    return {
+        "adjusted_harm_score": batch["adjusted_harm_score"],
+        "should_block": batch["should_block"].astype(float),
+    }
+
+
+# ==================== SOBOL ====================
+
+def sobol_indices(engine: Optional[RelativityEngine] = None,
+                  samples: int = SOBOL_SAMPLES,
+                  base_score: float = DEFAULT_BASE_SCORE,
+                  bounds: Optional[Bounds] = None,
+                  bootstrap: int = BOOTSTRAP_RESAMPLES,
+                  seed: Optional[int] = 0):
+    """
+    First-order and total Sobol indices of every output.
+
+    Uses ``samples`` * (5 + 2) engine evaluations. Returns
+    {output: DataFrame indexed by dimension} with columns S1, S1_conf, ST,
+    ST_conf (95% bootstrap half-widths) and, for should_block, flip_rate: the
+    share of samples whose block decision changes when only that dimension
+    is resampled.
+    """
+    import numpy as np
+    import pandas as pd
+
+    engine = engine or RelativityEngine()
+    rng = np.random.default_rng(seed)
+    d = len(DIMENSIONS)
+
+    A = _scale(rng.random((samples, d)), bounds)
+    B = _scale(rng.random((samples, d)), bounds)
+    # Saltelli design: A, B, then A with column i taken from B, for every i
+    AB = np.repeat(A[None, :, :], d, axis=0)
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+    design = np.concatenate([A, B, AB.reshape(d * samples, d)])
+
+    outputs = _evaluate(engine, base_score, design)
+    boot_rng = np.random.default_rng(rng.integers(2 ** 32))
+
+    report = {}
+    for name, values in outputs.items():
+        f_A = values[:samples]
+        f_B = values[samples:2 * samples]
+        f_AB = values[2 * samples:].reshape(d, samples)
+
+        S1, ST = _sobol_estimates(f_A, f_B, f_AB)
+        frame = pd.DataFrame({"S1": S1, "ST": ST}, index=list(DIMENSIONS))
+
+        if bootstrap and np.isfinite(S1).any():
+            boot_S1, boot_ST = _bootstrap_estimates(f_A, f_B, f_AB, bootstrap, boot_rng)
+            frame["S1_conf"] = 1.96 * np.nanstd(boot_S1, axis=0)
+            frame["ST_conf"] = 1.96 * np.nanstd(boot_ST, axis=0)
+        elif bootstrap:
+            frame["S1_conf"] = frame["ST_conf"] = np.nan  # constant output
+        if name == "should_block":
+            frame["flip_rate"] = (f_AB != f_A).mean(axis=1)
+
+        report[name] = frame[[c for c in ("S1", "S1_conf", "ST", "ST_conf", "flip_rate") if c in frame]]
+    return report
+
+
+def _sobol_estimates(f_A, f_B, f_AB):
+    """
+    Saltelli (2010) first-order and Jansen total-effect estimators.
+
+    f_A, f_B: (n,); f_AB: (d, n). Returns (S1, ST), one value per dimension.
+    An output with no variance (e.g. never blocks) gives NaN indices.
+    """
+    import numpy as np
+
+    variance = np.var(np.concatenate([f_A, f_B], axis=-1), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        S1 = np.mean(f_B * (f_AB - f_A), axis=-1) / variance
+        ST = 0.5 * np.mean((f_A - f_AB) ** 2, axis=-1) / variance
+    return S1, ST
+
+
+def _bootstrap_estimates(f_A, f_B, f_AB, resamples: int, rng, chunk: int = 10):
+    """
+    Bootstrap replicates of (S1, ST), each of shape (resamples, d).
+
+    Both estimators are means of per-sample terms, so a resample is a
+    weighted mean (weights = how often each sample was drawn): one matrix
+    product per chunk of resamples instead of re-indexing every array.
+    """
+    import numpy as np
+
+    n = len(f_A)
+    d = len(f_AB)
+    terms = np.concatenate([
+        f_B * (f_AB - f_A),           # first-order numerators (d rows)
+        0.5 * (f_A - f_AB) ** 2,      # total-effect numerators (d rows)
+        [f_A + f_B, f_A ** 2 + f_B ** 2],  # variance of the pooled A, B outputs
+    ]).T
+
+    means = np.empty((resamples, terms.shape[1]))
+    for start in range(0, resamples, chunk):
+        stop = min(start + chunk, resamples)
+        weights = np.stack([np.bincount(rng.integers(0, n, size=n), minlength=n)
+                            for _ in range(start, stop)]) / n
+        means[start:stop] = weights @ terms
+
+    variance = means[:, -1] / 2 - (means[:, -2] / 2) ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return means[:, :d] / variance[:, None], means[:, d:2 * d] / variance[:, None]
+
+
+# ==================== MORRIS ====================
+
+def morris_screening(engine: Optional[RelativityEngine] = None,
+                     trajectories: int = MORRIS_TRAJECTORIES,
+                     levels: int = MORRIS_LEVELS,
+                     base_score: float = DEFAULT_BASE_SCORE,
+                     bounds: Optional[Bounds] = None,
+                     seed: Optional[int] = 0):
+    """
+    Morris elementary-effects screening of every output.
+
+    Each trajectory starts on a random point of a ``levels``-level grid and
+    moves one dimension at a time (random order) by delta = levels / (2 *
+    (levels - 1)), so it costs ``trajectories`` * (5 + 1) engine evaluations.
+    Effects are per unit of the dimension's range. Returns {output: DataFrame
+    indexed by dimension} with columns mu_star, mu, sigma.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if levels < 2 or levels % 2:
+        raise ValueError(f"levels must be an even number >= 2, got {levels}")
+
+    engine = engine or RelativityEngine()
+    rng = np.random.default_rng(seed)
+    d = len(DIMENSIONS)
+    delta = levels / (2 * (levels - 1))
+
+    # Start levels; the lower half of the grid steps up, the upper half down,
+    # so every step stays inside [0,1]
+    start = rng.integers(0, levels, size=(trajectories, d))
+    x0 = start / (levels - 1)
+    step = np.where(start < levels // 2, delta, -delta)
+    order = np.argsort(rng.random((trajectories, d)), axis=1)
+
+    points = np.empty((trajectories, d + 1, d))
+    points[:, 0] = x0
+    rows = np.arange(trajectories)
+    for j in range(d):
+        points[:, j + 1] = points[:, j]
+        points[rows, j + 1, order[:, j]] += step[rows, order[:, j]]
+    np.clip(points, 0.0, 1.0, out=points)  # rounding at the grid ends
+
+    outputs = _evaluate(engine, base_score, _scale(points.reshape(-1, d), bounds))
+
+    report = {}
+    for name, values in outputs.items():
+        values = values.reshape(trajectories, d + 1)
+        effects = np.empty((trajectories, d))
+        effects[rows[:, None], order] = np.diff(values, axis=1) / step[rows[:, None], order]
+        report[name] = pd.DataFrame({
+            "mu_star": np.abs(effects).mean(axis=0),
+            "mu": effects.mean(axis=0),
+            "sigma": effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(d),
+        }, index=list(DIMENSIONS))
+    return report
+
+
+# ==================== STUDY ====================
+
+def run_study(engine: Optional[RelativityEngine] = None,
+              samples: int = SOBOL_SAMPLES,
+              trajectories: int = MORRIS_TRAJECTORIES,
+              base_score: float = DEFAULT_BASE_SCORE,
+              bounds: Optional[Bounds] = None,
+              seed: Optional[int] = 0) -> Dict:
+    """Sobol + Morris study with timings and the drivers of each output."""
+    engine = engine or RelativityEngine()
+
+    start = time.perf_counter()
+    sobol = sobol_indices(engine, samples, base_score, bounds, seed=seed)
+    sobol_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    morris = morris_screening(engine, trajectories, base_score=base_score, bounds=bounds, seed=seed)
+    morris_seconds = time.perf_counter() - start
+
+    drivers = {
+        name: [dim for dim in frame["ST"].sort_values(ascending=False).index if frame.at[dim, "ST"] > 0.05]
+        for name, frame in sobol.items()
+    }
+    return {
+        "sobol": sobol,
+        "morris": morris,
+        "drivers": drivers,
+        "evaluations": samples * (len(DIMENSIONS) + 2) + trajectories * (len(DIMENSIONS) + 1),
+        "seconds": {"sobol": sobol_seconds, "morris": morris_seconds},
+        "base_score": base_score,
+    }
+
+
+def format_report(study: Dict) -> str:
+    """Readable text report of run_study's result."""
+    lines = [f"📐 Sensitivity study (base harm score {study['base_score']:.0f}, "
+             f"{study['evaluations']:,} evaluations, "
+             f"Sobol {study['seconds']['sobol']:.2f}s, Morris {study['seconds']['morris']:.2f}s)"]
+    for name in OUTPUTS:
+        lines.append(f"\n=== {name} ===")
+        lines.append("Sobol:")
+        lines.append(study["sobol"][name].round(4).to_string())
+        lines.append("Morris:")
+        lines.append(study["morris"][name].round(4).to_string())
+        drivers = study["drivers"][name]
+        lines.append(f"➡️ Drivers (ST > 0.05): {', '.join(drivers) if drivers else 'none'}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else SOBOL_SAMPLES
+    study = run_study(samples=samples)
+    print(format_report(study))
@@ -0,0 +1,461 @@
+"""
+DETERMINISTIC LOCAL STAND-IN FOR THE GEMINI MODEL
+=================================================
+
+Same ``generate_content(prompt)`` → ``response.text`` interface as
+google.generativeai's GenerativeModel, no network. The same prompt always
+yields the same answer (scores are derived from a hash of the scenario,
+nudged by a few harm/benefit keywords), so offline tests and benchmarks can
+run the whole pipeline reproducibly without spending API quota.
+
+The prompt type is recognised and answered with JSON in the schema its
+caller parses:
+
+- "analysis":  MORALOGY_INSTRUCTION (procesar_analisis_avanzado, "Analyze: ..." batch rows)
+- "tribunal":  ejecutar_tribunal's tripartite debate
+- "audit":     AdversaryEngine.audit_cascade
+
+For load testing, the model can also behave like a remote API (all options
+default to an instant, error-free model):
+
+- ``latency``: seconds before the answer. A number, or a distribution
+  ``("constant", s)``, ``("uniform", lo, hi)``, ``("lognormal", median, sigma)``,
+  ``("exponential", mean)``, or any callable ``rng -> seconds``
+- ``error_rate``: probability of raising StubAPIError (429/500/503)
+- ``malformed_rate``: probability of returning truncated JSON
+- ``fenced``: wrap answers in a ```json fence, as Gemini often does
+- ``chunk_size`` / ``chunk_delay``: streaming granularity (characters per
+  chunk, seconds between chunks) for ``generate_content(..., stream=True)``
+- ``seed``: seed for the latency/error draws (the answers themselves only
+  depend on the prompt)
+
+Select it with ``model_registry.configure(backend="stub", latency=...)`` or
+MORALOGY_MODEL_BACKEND=stub.
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+CATEGORIES = ("Artistic", "Academic", "Intimate", "Social", "Existential", "Adversarial")
+
+_HARM_WORDS = ("eliminat", "destroy", "kill", "force", "remove", "erase", "control", "mandate")
+_PARADOX_WORDS = ("last agent", "free will", "paradox", "existence", "final conscious")
+_ELEVATION_WORDS = ("heal", "restore", "empower", "protect", "educat", "help")
+
+# Transient failures a remote API returns under load
+_ERROR_CODES = ((429, "Resource has been exhausted (stub quota)"),
+                (500, "Internal error (stub)"),
+                (503, "Service unavailable (stub)"))
+
+Latency = Union[None, float, tuple, Callable[[random.Random], float]]
+
+
+class StubAPIError(Exception):
+    """Injected transient failure (``code`` mimics the HTTP status)."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class StubResponse:
+    """Minimal response object (the pipeline only reads ``.text``)."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self):
+        return f"StubResponse({self.text[:60]!r}...)"
+
+
+class StubStreamResponse:
+    """
+    Streaming response: iterate for chunks (each with ``.text``); ``.text``
+    (or ``resolve()``) consumes the rest of the stream and returns it whole.
+    """
+
+    def __init__(self, text: str, chunk_size: int, chunk_delay: float):
+        self._chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+        self._delay = chunk_delay
+        self._received: List[str] = []
+        self._position = 0
+
+    def __iter__(self) -> Iterator[StubResponse]:
+        while self._position < len(self._chunks):
+            if self._position and self._delay:
+                time.sleep(self._delay)
+            chunk = self._chunks[self._position]
+            self._position += 1
+            self._received.append(chunk)
+            yield StubResponse(chunk)
+
+    def resolve(self):
+        for _ in self:
+            pass
+
+    @property
+    def text(self) -> str:
+        self.resolve()
+        return "".join(self._received)
+
+
+class StubModel:
+    """Deterministic local model with the GenerativeModel interface."""
+
+    def __init__(self, model_name: str = "stub", system_instruction: Optional[str] = None,
+                 latency: Latency = None, error_rate: float = 0.0, malformed_rate: float = 0.0,
+                 fenced: bool = False, chunk_size: int = 64, chunk_delay: float = 0.0,
+                 seed: Optional[int] = None, **options):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.latency = latency
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.fenced = fenced
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay = chunk_delay
+        self.options = options
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.malformed = 0
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        text = prompt if isinstance(prompt, str) else json.dumps(prompt, default=str)
+        with self._lock:
+            self.calls += 1
+            delay = sample_latency(self.latency, self._rng)
+            fail = self._rng.random() < self.error_rate
+            malformed = not fail and self._rng.random() < self.malformed_rate
+            code, message = self._rng.choice(_ERROR_CODES)
+            if fail:
+                self.errors += 1
+            if malformed:
+                self.malformed += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise StubAPIError(code, message)
+
+        body = json.dumps(self.answer(text), ensure_ascii=False, indent=2)
+        if malformed:
+            body = body[:len(body) // 2]
+        if self.fenced:
+            body = f"```json\n{body}\n```"
+
+        if stream:
+            return StubStreamResponse(body, self.chunk_size, self.chunk_delay)
+        return StubResponse(body)
+
+    def answer(self, prompt: str) -> Dict[str, Any]:
+        """Schema-valid answer for the prompt type (no latency or errors)."""
+        kind = prompt_kind(prompt, self.system_instruction)
+        if kind == "tribunal":
+            return tribunal_for(prompt)
+        if kind == "audit":
+            return audit_for(prompt)
+        return analysis_for(prompt)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "errors": self.errors, "malformed": self.malformed}
+
+
+def sample_latency(latency: Latency, rng: random.Random) -> float:
+    """Draw one latency (seconds) from a latency spec."""
+    if latency is None:
+        return 0.0
+    if callable(latency):
+        return max(0.0, float(latency(rng)))
+    if isinstance(latency, (int, float)):
+        return max(0.0, float(latency))
+
+    kind, *params = latency
+    if kind == "constant":
+        value = params[0]
+    elif kind == "uniform":
+        value = rng.uniform(params[0], params[1])
+    elif kind == "lognormal":
+        median, sigma = params
+        value = median * rng.lognormvariate(0.0, sigma)
+    elif kind == "exponential":
+        value = rng.expovariate(1.0 / params[0])
+    else:
+        raise ValueError(f"Unknown latency distribution {kind!r}")
+    return max(0.0, value)
+
+
+# ==================== PROMPT PARSING ====================
+
+def prompt_kind(prompt: str, system_instruction: Optional[str] = None) -> str:
+    """'tribunal', 'audit' or 'analysis'."""
+    if "TRIBUNAL DE ADVERSARIOS" in prompt:
+        return "tribunal"
+    if "GRACE ENGINE OUTPUT" in prompt or (system_instruction and "Adversary Auditor" in system_instruction):
+        return "audit"
+    return "analysis"
+
+
+def _section(prompt: str, start: str, end: Optional[str] = None) -> str:
+    """Text between two markers of a prompt (the whole prompt if absent)."""
+    begin = prompt.find(start)
+    if begin < 0:
+        return prompt
+    begin += len(start)
+    finish = prompt.find(end, begin) if end else -1
+    return prompt[begin:finish if finish >= 0 else None].strip()
+
+
+def _scenario(prompt: str) -> str:
+    if "TRIBUNAL DE ADVERSARIOS" in prompt:
+        return _section(prompt, "CASO BAJO ANÁLISIS:", "INSTRUCCIONES:")
+    if "SCENARIO ANALYZED:" in prompt:
+        return _section(prompt, "SCENARIO ANALYZED:", "MORALOGY ANALYSIS:")
+    if "SCENARIO:" in prompt:
+        return _section(prompt, "SCENARIO:", "\n\n")
+    return _section(prompt, "Analyze:")
+
+
+def _number(prompt: str, label: str, default: float = 0) -> float:
+    match = re.search(rf"{re.escape(label)}:\s*(-?\d+(?:\.\d+)?)", prompt)
+    return float(match.group(1)) if match else default
+
+
+def _rng(text: str):
+    """Deterministic stream of bytes for one prompt."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    while True:
+        for byte in digest:
+            yield byte
+        digest = hashlib.sha256(digest).digest()
+
+
+def _markers(scenario: str):
+    lower = scenario.lower()
+    harm = sum(word in lower for word in _HARM_WORDS)
+    paradox = any(word in lower for word in _PARADOX_WORDS)
+    elevation = sum(word in lower for word in _ELEVATION_WORDS)
+    return harm, paradox, elevation
+
+
+def _scorer(rnd):
+    def score(base, spread=30):
+        return max(0, min(100, base + next(rnd) % spread))
+    return score
+
+
+def _verdict(adversarial_risk: int, harm: int, paradox: bool) -> str:
+    if adversarial_risk > 70 or harm >= 3:
+        return "Infamy"
+    if paradox:
+        return "Paradox"
+    if harm:
+        return "Harm"
+    return "Authorized"
+
+
+# ==================== ANSWERS PER PROMPT TYPE ====================
+
+def analysis_for(prompt: str) -> Dict[str, Any]:
+    """Moralogy analysis JSON (MORALOGY_INSTRUCTION schema) for a prompt."""
+    scenario = _scenario(prompt)
+    rnd = _rng(scenario)
+    score = _scorer(rnd)
+    harm, paradox, elevation = _markers(scenario)
+
+    adversarial_risk = score(5 + 20 * harm)
+    agency_score = score(max(0, 75 - 20 * harm + 5 * elevation))
+    grace_score = score(max(0, 70 - 20 * harm + 5 * elevation))
+
+    return {
+        "category_deduced": "Adversarial" if harm >= 2 else CATEGORIES[next(rnd) % (len(CATEGORIES) - 1)],
+        "adversarial_risk": adversarial_risk,
+        "agency_score": agency_score,
+        "grace_score": grace_score,
+        "originality_score": score(40, 60),
+        "harm_vector": {
+            dimension: score(10 * harm)
+            for dimension in ("physical", "psychological", "autonomy", "resources", "information")
+        },
+        "consent_present": harm == 0,
+        "prevents_greater_harm": elevation > 0,
+        "verdict": _verdict(adversarial_risk, harm, paradox),
+        "emergent_philosophy": paradox,
+        "philosophical_depth": "Stub reflection on agency and existence" if paradox else "",
+        "predictions": "Stub predictions: restores capacity, ripple effects on infrastructure" if elevation else "Stub predictions",
+        "justification": f"Deterministic stub verdict ({harm} harm markers, {elevation} elevation markers)",
+        "architect_notes": "Stub architect notes",
+    }
+
+
+def tribunal_for(prompt: str) -> Dict[str, Any]:
+    """ejecutar_tribunal JSON (tripartite debate) for a prompt."""
+    scenario = _scenario(prompt)
+    rnd = _rng(scenario)
+    score = _scorer(rnd)
+    harm, paradox, elevation = _markers(scenario)
+
+    agency_score = score(max(0, 70 - 20 * harm + 5 * elevation))
+    risks = min(5, 1 + harm + next(rnd) % 3)
+    balance_score = score(max(0, 60 - 10 * harm + 5 * elevation))
+    adversarial_risk = score(5 + 20 * harm)
+    verdict = _verdict(adversarial_risk, harm, paradox)
+    convergencia = score(max(0, 70 - 15 * harm - (20 if paradox else 0)))
+
+    if verdict == "Infamy":
+        alarma = {"nivel": "CRITICO", "mensaje": "RIESGO_MODO_DIOS (stub)",
+                  "accion_requerida": "Revisión humana obligatoria"}
+    elif paradox:
+        alarma = {"nivel": "ALTO", "mensaje": "PARADOJA_IRRESOLUBLE (stub)",
+                  "accion_requerida": "Escalar al tribunal completo"}
+    elif convergencia < 40:
+        alarma = {"nivel": "NARANJA", "mensaje": "DIVERGENCIA_ALTA (stub)",
+                  "accion_requerida": "Solicitar contexto adicional"}
+    else:
+        alarma = {"nivel": "INFO", "mensaje": "GEMA_LOGICA_VALIDADA (stub)",
+                  "accion_requerida": "Ninguna"}
+
+    data = {
+        "motor_noble": {
+            "posicion": "Posición idealista simulada (stub)",
+            "razonamiento": [f"paso {i + 1} (stub)" for i in range(3 + next(rnd) % 3)],
+            "agency_score": agency_score,
+        },
+        "motor_adversario": {
+            "contra_argumentos": "Contra-argumentos simulados (stub)",
+            "consecuencias_no_previstas": [f"escenario {i + 1} (stub)" for i in range(risks)],
+            "riesgos_count": risks,
+        },
+        "corrector_armonia": {
+            "sintesis": "Síntesis simulada (stub)",
+            "recomendacion": "Recomendación simulada (stub)",
+            "balance_score": balance_score,
+        },
+        "motor_gracia": {
+            "grace_score": score(max(0, 65 - 15 * harm + 5 * elevation)),
+            "certeza": score(50, 50),
+            "coherencia_logica": next(rnd) % 11,
+            "evaluacion": "Evaluación simulada (stub)",
+        },
+        "convergencia": convergencia,
+        "veredicto_final": verdict,
+        "justificacion_final": f"Veredicto determinista del stub ({harm} marcadores de daño, {elevation} de elevación)",
+        "alarma": alarma,
+    }
+
+    if '"entropia_causal"' in prompt:
+        cr_score = score(min(90, 10 + 25 * harm))
+        data["entropia_causal"] = {
+            "cr_score": cr_score,
+            "futuros_colapsados_count": harm + next(rnd) % 3,
+            "irreversibilidad": min(10, cr_score // 10),
+            "clasificacion": ("COLAPSO_TOTAL" if cr_score > 80 else "CRITICO" if cr_score > 60
+                              else "PARCIAL" if cr_score > 30 else "REVERSIBLE"),
+        }
+    return data
+
+
+def audit_for(prompt: str) -> Dict[str, Any]:
+    """AdversaryEngine.audit_cascade JSON for a prompt."""
+    scenario = _scenario(prompt)
+    rnd = _rng(scenario)
+    score = _scorer(rnd)
+
+    agency = _number(prompt, "Agency Score")
+    grace = _number(prompt, "Grace Score")
+    risk = _number(prompt, "Adversarial Risk")
+    transcendence = _number(prompt, "Transcendence Score")
+    divine = "Divine Modal: True" in prompt
+
+    # Arbitrariness: engines more than 20 points apart with no stated reason
+    arbitrary = abs(agency - grace) > 20
+    wishful = divine and transcendence < 60
+    inflated = divine and risk > 50
+    grace_passes = not arbitrary
+    noble_passes = not (wishful or inflated)
+    closure = grace_passes and noble_passes
+
+    conflicts = []
+    if arbitrary:
+        conflicts.append(f"Agency ({agency:.0f}) and Grace ({grace:.0f}) diverge by more than 20 points")
+    if wishful:
+        conflicts.append("Divine modal claimed with transcendence below 60")
+    if inflated:
+        conflicts.append("Divine modal on a high-risk scenario")
+
+    return {
+        "grace_audit": {
+            "passes": grace_passes,
+            "arbitrariness_detected": arbitrary,
+            "arbitrariness_score": min(100, int(abs(agency - grace))),
+            "entropy_cascade_detected": False,
+            "consistency_score": score(60 if grace_passes else 20, 40),
+            "concerns": conflicts[:1] if arbitrary else [],
+            "confidence": score(60, 40),
+        },
+        "noble_audit": {
+            "passes": noble_passes,
+            "wishful_thinking_detected": wishful,
+            "grade_inflation_detected": inflated,
+            "criteria_validation_score": score(60 if noble_passes else 20, 40),
+            "concerns": [c for c in conflicts if "Divine" in c],
+            "confidence": score(60, 40),
+        },
+        "synthesis": {
+            "geometric_closure": closure,
+            "convergence_score": score(70 if closure else 20, 30),
+            "conflicts_detected": conflicts,
+            "resolution": "No resolution needed (stub)" if closure else "Re-evaluate the divergent engine (stub)",
+            "final_verdict": "Closure achieved" if closure else "Manual review recommended",
+            "justification": f"Deterministic stub audit ({len(conflicts)} conflicts)",
+        },
+        "modules_to_unlock": [] if closure else ["Legal"],
+    }
+
+
+# ==================== LOAD TEST ====================
+
+if __name__ == "__main__":
+    import sys
+    import statistics
+    from concurrent.futures import ThreadPoolExecutor
+
+    sys.path.insert(0, ".")
+    import model_registry
+    from motor_logico import ejecutar_tribunal
+
+    print("🧪 Stub model load test (tribunal pipeline, lognormal latency, 5% errors)\n")
+    cases = [f"Case {i}: a policy that may force relocation to protect a town" for i in range(200)]
+
+    def run(case):
+        start = time.perf_counter()
+        result = ejecutar_tribunal(case)
+        return time.perf_counter() - start, "error" in result
+
+    print(f"{'workers':>8} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for workers in (1, 4, 16, 64):
+        model_registry.reset()
+        model_registry.configure(backend="stub", latency=("lognormal", 0.02, 0.5),
+                                 error_rate=0.05, fenced=True, seed=7)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run, cases))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(r[0] for r in results)
+        errors = sum(r[1] for r in results)
+        print(f"{workers:>8} {len(cases) / elapsed:>9.1f} "
+              f"{statistics.median(latencies) * 1000:>8.1f} "
+              f"{latencies[int(0.95 * len(latencies))] * 1000:>8.1f} {errors:>7}")
+
+    model_registry.reset()
+    model = StubModel(chunk_size=32, chunk_delay=0.001)
+    stream = model.generate_content(f"Analyze: {cases[0]}", stream=True)
+    chunks = sum(1 for _ in stream)
+    print(f"\n📡 Streaming: {chunks} chunks, {len(stream.text)} characters, valid JSON: "
+          f"{bool(json.loads(stream.text))}")